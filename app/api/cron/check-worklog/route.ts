@@ -1,5 +1,6 @@
 import { NextResponse } from 'next/server'
 import { createClient } from '@supabase/supabase-js'
+import { format } from 'date-fns'
 
 // Initialize Supabase Admin Client (Service Role)
 // We need service role to bypass RLS and insert worklogs as 'System'
@@ -9,236 +10,184 @@ const supabaseAdmin = createClient(
 )
 
 import { shiftService } from '@/lib/shift-rotation'
+import { CronRun, kstClock, runCronJob, shiftDate } from '@/lib/cron-scheduler'
+
+const JOB = 'check-worklog'
+// How many overdue days a pass catches up on after missed runs
+const MAX_CATCH_UP_DAYS = 7
+
+// Close every unsigned worklog of one date and shift type past its deadline.
+// Operation/leader signatures are filled with 'System Auto-Close' unless operation
+// pre-signed, and a system issue is appended; returns the closed worklog ids.
+async function autoCloseWorklogs(date: string, type: '주간' | '야간', shiftEnd: string): Promise<string[]> {
+    const { data, error } = await supabaseAdmin.rpc('auto_close_worklogs', {
+        p_date: date,
+        p_type: type,
+        p_summary: `근무 종료 시간(${shiftEnd}) 10분 초과로 인한 시스템 자동 종료`,
+        p_presigned_summary: `근무 종료 시간(${shiftEnd}) 경과로 인한 시스템 자동 마감 (사전 결재 완료)`
+    })
+
+    if (error) {
+        console.error(`[Auto-Close] Failed to close ${date} ${type} worklogs:`, error)
+        throw error
+    }
+    return (data || []).map((row: { id: string }) => row.id)
+}
 
-// ... (keep imports)
+// Close every date of one shift type whose deadline passed since the pass last succeeded.
+// `latestDue` is the newest date past its deadline; the watermark `auto_close:<type>`
+// records the last date closed, so repeated invocations don't rescan it.
+async function autoClosePass(run: CronRun, type: '주간' | '야간', shiftEnd: string, latestDue: string): Promise<string[]> {
+    const key = `auto_close:${type}`
+    const watermark = run.watermark(key)
+    const earliest = shiftDate(latestDue, -(MAX_CATCH_UP_DAYS - 1))
+    let date = watermark ? shiftDate(watermark, 1) : latestDue
+    if (date < earliest) date = earliest
+
+    const closed: string[] = []
+    for (; date <= latestDue; date = shiftDate(date, 1)) {
+        closed.push(...await autoCloseWorklogs(date, type, shiftEnd))
+        await run.advance(key, date)
+    }
+    return closed
+}
 
-export async function GET(request: Request) {
-    try {
-        // 1. Determine Current Time (KST)
-        const now = new Date()
-        const kstOffset = 9 * 60 * 60 * 1000
-        const kstDate = new Date(now.getTime() + kstOffset)
-
-        const hours = kstDate.getUTCHours() // Use UTC methods on the shifted date if server is UTC? 
-        // Actually, if we shifted the time, we should use getUTCHours to get the "shifted" hour if we treat it as UTC.
-        // But the original code used getUTCHours.
-        // Let's stick to the original KST logic for the Auto-Close part, 
-        // but for Auto-Create, we will use shiftService.
-
-        const minutes = kstDate.getUTCMinutes()
-
-        // ==========================================
-        // AUTO-CLOSE LOGIC (10 mins after shift end)
-        // ==========================================
-        let autoCloseResult = { count: 0, logs: [] as string[] }
-
-        // Day Shift Deadline: 19:10 (Day shift ends 19:00)
-        if (hours >= 19 && minutes >= 10) {
-            const todayStr = kstDate.toISOString().split('T')[0]
-
-            // Find stale Day logs (Today, '주간', Not Signed)
-            const { data: staleDayLogs } = await supabaseAdmin
-                .from('worklogs')
-                .select('id, signatures, systemIssues')
-                .eq('date', todayStr)
-                .eq('type', '주간')
-                .neq('status', '서명완료')
-                .neq('status', '근무종료') // Don't touch if already closed by Director
-
-            if (staleDayLogs && staleDayLogs.length > 0) {
-                for (const log of staleDayLogs) {
-                    // Check if Operation is pre-signed
-                    const isPreSigned = log.signatures?.operation && log.signatures.operation.length > 0
-
-                    let newSignatures = log.signatures || {}
-                    if (!isPreSigned) {
-                        newSignatures = {
-                            ...newSignatures,
-                            operation: 'System Auto-Close',
-                            leader: 'System Auto-Close'
-                        }
-                    }
-
-                    const newIssues = [
-                        ...(log.systemIssues || []),
-                        {
-                            id: crypto.randomUUID(), summary: isPreSigned
-                                ? '근무 종료 시간(19:00) 경과로 인한 시스템 자동 마감 (사전 결재 완료)'
-                                : '근무 종료 시간(19:00) 10분 초과로 인한 시스템 자동 종료'
-                        }
-                    ]
-
-                    await supabaseAdmin
-                        .from('worklogs')
-                        .update({
-                            status: '근무종료', // Use '근무종료' as final state for now, or '서명완료' if that's the convention
-                            signatures: newSignatures,
-                            systemIssues: newIssues,
-                            signature: '4/4' // Legacy support
-                        })
-                        .eq('id', log.id)
-
-                    autoCloseResult.count++
-                    autoCloseResult.logs.push(log.id)
-                }
-            }
+async function checkWorklogs(run: CronRun): Promise<{ status: number; body: Record<string, any> }> {
+    // 1. Determine Current Time (KST)
+    const { kst: kstDate, date: todayStr, minutes } = kstClock()
+
+    // ==========================================
+    // AUTO-CLOSE LOGIC (10 mins after shift end)
+    // ==========================================
+    // Each pass closes all of its stale logs in one statement per date (see auto_close_worklogs);
+    // the day and night passes run concurrently.
+    // Day Shift Deadline: 19:10 (Day shift ends 19:00)
+    const dayDue = minutes >= 19 * 60 + 10 ? todayStr : shiftDate(todayStr, -1)
+    // Night Shift Deadline: 08:10 (Night shift ends 08:00 and belongs to the previous day)
+    const nightDue = minutes >= 8 * 60 + 10 ? shiftDate(todayStr, -1) : shiftDate(todayStr, -2)
+
+    const closedIds = (await Promise.all([
+        autoClosePass(run, '주간', '19:00', dayDue),
+        autoClosePass(run, '야간', '08:00', nightDue)
+    ])).flat()
+    const autoCloseResult = { count: closedIds.length, logs: closedIds }
+
+    console.log(`[Auto-Close] Closed ${autoCloseResult.count} stale sessions.`)
+
+    // ==========================================
+    // AUTO-CREATE LOGIC
+    // ==========================================
+
+    // 2. Skip if this shift's worklog was already ensured by an earlier run.
+    // We pass kstDate because shiftService uses .getHours() (Local); on a UTC server
+    // kstDate.getHours() is the KST hour.
+    const { date: logicalDate, shiftType } = shiftService.getLogicalShiftInfo(kstDate)
+    const shiftKey = `${format(logicalDate, 'yyyy-MM-dd')}/${shiftType}`
+    const createdThrough = run.watermark('auto_create')
+    if (createdThrough && createdThrough >= shiftKey) {
+        return {
+            status: 200,
+            body: { message: `Worklog for ${shiftKey} already ensured`, autoClose: autoCloseResult }
         }
+    }
 
-        // Night Shift Deadline: 08:10 (Night shift ends 08:00)
-        if (hours >= 8 && minutes >= 10 && hours < 12) { // Check morning hours
-            // Night shift belongs to YESTERDAY
-            const yesterday = new Date(kstDate)
-            yesterday.setDate(yesterday.getDate() - 1)
-            const yesterdayStr = yesterday.toISOString().split('T')[0]
-
-            // Find stale Night logs (Yesterday, '야간', Not Signed)
-            const { data: staleNightLogs } = await supabaseAdmin
-                .from('worklogs')
-                .select('id, signatures, systemIssues')
-                .eq('date', yesterdayStr)
-                .eq('type', '야간')
-                .neq('status', '서명완료')
-                .neq('status', '근무종료') // Don't touch if already closed by Director
-
-            if (staleNightLogs && staleNightLogs.length > 0) {
-                for (const log of staleNightLogs) {
-                    // Check if Operation is pre-signed
-                    const isPreSigned = log.signatures?.operation && log.signatures.operation.length > 0
-
-                    let newSignatures = log.signatures || {}
-                    if (!isPreSigned) {
-                        newSignatures = {
-                            ...newSignatures,
-                            operation: 'System Auto-Close',
-                            leader: 'System Auto-Close'
-                        }
-                    }
-
-                    const newIssues = [
-                        ...(log.systemIssues || []),
-                        {
-                            id: crypto.randomUUID(), summary: isPreSigned
-                                ? '근무 종료 시간(08:00) 경과로 인한 시스템 자동 마감 (사전 결재 완료)'
-                                : '근무 종료 시간(08:00) 10분 초과로 인한 시스템 자동 종료'
-                        }
-                    ]
-
-                    await supabaseAdmin
-                        .from('worklogs')
-                        .update({
-                            status: '근무종료', // Use '근무종료' as final state
-                            signatures: newSignatures,
-                            systemIssues: newIssues,
-                            signature: '4/4' // Legacy support
-                        })
-                        .eq('id', log.id)
-
-                    autoCloseResult.count++
-                    autoCloseResult.logs.push(log.id)
-                }
-            }
+    // 3. Get Active Shift Config
+    const { data: configData, error: configError } = await supabaseAdmin
+        .from('shift_pattern_configs')
+        .select('*')
+        .lte('valid_from', kstDate.toISOString()) // Use kstDate for query
+        .or(`valid_to.is.null,valid_to.gte.${kstDate.toISOString()}`)
+        .order('valid_from', { ascending: false })
+        .limit(1)
+        .single()
+
+    if (configError || !configData) {
+        console.error('Shift config not found, skipping auto-create')
+        return {
+            status: 200,
+            body: { message: 'Shift config not found, skipped auto-create', autoClose: autoCloseResult }
         }
+    }
 
-        console.log(`[Auto-Close] Closed ${autoCloseResult.count} stale sessions.`)
-
-        // ==========================================
-        // AUTO-CREATE LOGIC
-        // ==========================================
-
-        // 2. Get Active Shift Config
-        const { data: configData, error: configError } = await supabaseAdmin
-            .from('shift_pattern_configs')
-            .select('*')
-            .lte('valid_from', kstDate.toISOString()) // Use kstDate for query
-            .or(`valid_to.is.null,valid_to.gte.${kstDate.toISOString()}`)
-            .order('valid_from', { ascending: false })
-            .limit(1)
-            .single()
-
-        if (configError || !configData) {
-            console.error('Shift config not found, skipping auto-create')
-            return NextResponse.json({
-                message: 'Shift config not found, skipped auto-create',
-                autoClose: autoCloseResult
-            })
-        }
+    // 4. Calculate Expected Worklog Info using Shared Logic
+    const expectedInfo = shiftService.getExpectedWorklogInfo(kstDate, configData)
 
-        // 3. Calculate Expected Worklog Info using Shared Logic
-        // We pass kstDate because shiftService expects a Date object where getHours() returns KST hour.
-        // However, shiftService uses .getHours() (Local). 
-        // If server is UTC, .getHours() on kstDate (which is shifted) might be tricky depending on how it was created.
-        // kstDate = new Date(now.getTime() + 9h). 
-        // If server is UTC, kstDate.getHours() will be (UTC+9). 
-        // So passing kstDate is correct.
-
-        const expectedInfo = shiftService.getExpectedWorklogInfo(kstDate, configData)
-
-        if (!expectedInfo) {
-            return NextResponse.json({
-                message: 'Could not determine expected worklog info',
-                autoClose: autoCloseResult
-            })
+    if (!expectedInfo) {
+        return {
+            status: 200,
+            body: { message: 'Could not determine expected worklog info', autoClose: autoCloseResult }
         }
+    }
 
-        const { date: targetDateStr, shift: targetShift, team: targetTeamName } = expectedInfo
-
-        console.log(`[Auto-Create] Checking ${targetDateStr} ${targetShift} shift for team ${targetTeamName}`)
+    const { date: targetDateStr, shift: targetShift, team: targetTeamName } = expectedInfo
 
-        // 3. Check if worklog exists
-        // First, get the group_id for the target team
-        const { data: groupData, error: groupError } = await supabaseAdmin
-            .from('groups')
-            .select('id')
-            .eq('name', targetTeamName)
-            .single()
+    console.log(`[Auto-Create] Checking ${targetDateStr} ${targetShift} shift for team ${targetTeamName}`)
 
-        if (groupError || !groupData) {
-            console.error(`[Auto-Create] Group not found for team ${targetTeamName}`)
-            return NextResponse.json({ error: 'Group not found' }, { status: 500 })
-        }
+    // 5. Check if worklog exists
+    // First, get the group_id for the target team
+    const { data: groupData, error: groupError } = await supabaseAdmin
+        .from('groups')
+        .select('id')
+        .eq('name', targetTeamName)
+        .single()
 
-        const { data: existingLogs } = await supabaseAdmin
-            .from('worklogs')
-            .select('id')
-            .eq('date', targetDateStr)
-            .eq('type', targetShift === 'day' ? '주간' : '야간')
-            .eq('group_id', groupData.id) // Check by group_id to match client behavior
-
-        if (existingLogs && existingLogs.length > 0) {
-            return NextResponse.json({
-                message: 'Worklog already exists',
-                id: existingLogs[0].id,
-                autoClose: autoCloseResult
-            })
-        }
+    if (groupError || !groupData) {
+        console.error(`[Auto-Create] Group not found for team ${targetTeamName}`)
+        return { status: 500, body: { error: 'Group not found' } }
+    }
 
-        // 4. Create Worklog if missing
-        const { data: newLog, error: createError } = await supabaseAdmin
-            .from('worklogs')
-            .insert({
-                date: targetDateStr,
-                type: targetShift === 'day' ? '주간' : '야간',
-                group_name: targetTeamName, // Use group_name instead of team
-                group_id: groupData.id,
-                status: '작성중',
-                workers: { director: [], assistant: [], video: [] },
-                is_auto_created: true,
-            })
-            .select()
-            .single()
-
-        if (createError) {
-            console.error('[Auto-Create] Failed to create worklog:', createError)
-            return NextResponse.json({ error: createError.message }, { status: 500 })
+    const { data: existingLogs } = await supabaseAdmin
+        .from('worklogs')
+        .select('id')
+        .eq('date', targetDateStr)
+        .eq('type', targetShift === 'day' ? '주간' : '야간')
+        .eq('group_id', groupData.id) // Check by group_id to match client behavior
+
+    if (existingLogs && existingLogs.length > 0) {
+        await run.advance('auto_create', shiftKey)
+        return {
+            status: 200,
+            body: { message: 'Worklog already exists', id: existingLogs[0].id, autoClose: autoCloseResult }
         }
+    }
 
-        return NextResponse.json({
-            success: true,
-            message: 'Auto-created worklog',
-            worklog: newLog,
-            autoClose: autoCloseResult
+    // 6. Create Worklog if missing
+    const { data: newLog, error: createError } = await supabaseAdmin
+        .from('worklogs')
+        .insert({
+            date: targetDateStr,
+            type: targetShift === 'day' ? '주간' : '야간',
+            group_name: targetTeamName, // Use group_name instead of team
+            group_id: groupData.id,
+            status: '작성중',
+            workers: { director: [], assistant: [], video: [] },
+            is_auto_created: true,
         })
+        .select()
+        .single()
 
+    if (createError) {
+        console.error('[Auto-Create] Failed to create worklog:', createError)
+        return { status: 500, body: { error: createError.message } }
+    }
+
+    await run.advance('auto_create', shiftKey)
+    return {
+        status: 200,
+        body: { success: true, message: 'Auto-created worklog', worklog: newLog, autoClose: autoCloseResult }
+    }
+}
+
+// Runs at most one check at a time (cron_runs ledger); overlapping invocations return
+// immediately, and each run only handles what became due since the last one.
+export async function GET(request: Request) {
+    try {
+        const outcome = await runCronJob(supabaseAdmin, JOB, checkWorklogs)
+        if (outcome.status === 'skipped') {
+            return NextResponse.json({ message: 'Another check-worklog run is in progress, skipped' })
+        }
+        const { status, body } = outcome.result
+        return NextResponse.json({ ...body, runId: outcome.runId }, { status })
     } catch (error: any) {
         console.error('[Auto-Create] Internal Error:', error)
         return NextResponse.json({ error: error.message }, { status: 500 })
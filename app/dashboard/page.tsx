@@ -1,13 +1,13 @@
 "use client"
 
-import { useState, useEffect } from "react"
+import { useState, useEffect, useMemo } from "react"
 import { MainLayout } from "@/components/layout/main-layout"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Button } from "@/components/ui/button"
 import { Badge } from "@/components/ui/badge"
 import { FileText, AlertCircle, CheckCircle2, Clock, Users, ArrowRight, Activity, Star, AlertTriangle, LogIn, RefreshCw, ClipboardList, Sunrise, Sunset, CloudSun } from "lucide-react"
 import { Progress } from "@/components/ui/progress"
-import { useWorklogStore } from "@/store/worklog"
+import { selectImportantWorklogs, useWorklogStore } from "@/store/worklog"
 import { usePostStore, Post } from "@/store/posts"
 import Link from "next/link"
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter, DialogDescription } from "@/components/ui/dialog"
@@ -24,8 +24,13 @@ export default function Dashboard() {
   const router = useRouter()
   const [mounted, setMounted] = useState(false)
   const worklogs = useWorklogStore((state) => state.worklogs)
-  const { fetchWorklogs } = useWorklogStore() // Added fetchWorklogs
-  const importantWorklogs = worklogs.filter(log => log.isImportant).slice(0, 5)
+  const fetchedImportantWorklogs = useWorklogStore((state) => state.importantWorklogs)
+  const { fetchWorklogs, fetchImportantWorklogs } = useWorklogStore() // Added fetchWorklogs
+  // Important logs may be older than the loaded list window, so they are fetched separately
+  const importantWorklogs = useMemo(
+    () => selectImportantWorklogs({ worklogs, importantWorklogs: fetchedImportantWorklogs }),
+    [worklogs, fetchedImportantWorklogs]
+  )
 
   const { posts, fetchPosts, resolvePost } = usePostStore()
   const [emergencyPosts, setEmergencyPosts] = useState<Post[]>([])
@@ -126,6 +131,7 @@ export default function Dashboard() {
     setMounted(true)
     fetchPosts({ priority: '긴급' })
     fetchWorklogs()
+    fetchImportantWorklogs()
 
     // Fetch Shift Info if session is active
     const loadShiftInfo = async () => {
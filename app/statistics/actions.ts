@@ -1,6 +1,7 @@
 
 'use server'
 
+import { createClient as createAdminClient } from '@supabase/supabase-js'
 import { createClient } from '@/lib/supabase-server'
 import { format, subDays, startOfMonth, endOfMonth, eachDayOfInterval } from 'date-fns'
 
@@ -16,60 +17,121 @@ export interface ChannelStats {
     fill: string
 }
 
-export async function getStatisticsData(days = 30) {
+// PostgREST caps a response at 1000 rows by default; 365 days x 5 channels needs two pages
+const PAGE_SIZE = 1000
+// Dirty dates up to this many are fetched with one `in` filter, more with a date range
+const MAX_IN_DATES = 60
+// Cached days are trusted this long, so edits made through another server instance
+// (which only invalidates its own cache) still show up.
+const DAY_CACHE_TTL_MS = 10 * 60 * 1000
+// invalidateStatistics is callable by any client; it accepts only this many yyyy-MM-dd keys
+const MAX_INVALIDATE_DATES = 31
+const DATE_KEY = /^\d{4}-\d{2}-\d{2}$/
+
+// Channel counts per day (yyyy-MM-dd), kept across requests in this server process.
+// Only days that are missing, expired, invalidated or today are read again.
+const dayCache = new Map<string, { channelCounts: { [channel: string]: number }; cachedAt: number }>()
+
+// The day cache is shared by every caller, so it is filled with the service role rather than
+// a session whose RLS could hide rows; callers are checked for a session instead (the
+// rollup's own policy lets every authenticated user read it).
+const supabaseAdmin = createAdminClient(
+    process.env.NEXT_PUBLIC_SUPABASE_URL!,
+    process.env.SUPABASE_SERVICE_ROLE_KEY!
+)
+
+type Rollup = { date: string; channel: string; modifications: number }
+
+// Per-day, per-channel counts kept by the worklog_channel_daily_stats trigger
+// (25_worklog_channel_daily_stats.sql), instead of every worklog's channel_logs.
+async function fetchRollups(dates: string[]): Promise<Rollup[] | null> {
+    const rollups: Rollup[] = []
+    for (let from = 0; ; from += PAGE_SIZE) {
+        let query = supabaseAdmin
+            .from('worklog_channel_daily_stats')
+            .select('date, channel, modifications')
+        query = dates.length <= MAX_IN_DATES
+            ? query.in('date', dates)
+            : query.gte('date', dates[0]).lte('date', dates[dates.length - 1])
+        const { data, error } = await query
+            .order('date', { ascending: true })
+            .order('channel', { ascending: true })
+            .range(from, from + PAGE_SIZE - 1)
+
+        if (error) {
+            console.error('Error fetching statistics:', error)
+            return null
+        }
+        rollups.push(...(data || []))
+        if (!data || data.length < PAGE_SIZE) break
+    }
+    return rollups
+}
+
+// Drop cached days so the next getStatisticsData reads them again; called after a
+// worklog's channel logs change.
+export async function invalidateStatistics(dates: string[]) {
     const supabase = await createClient()
-    const endDate = new Date()
-    const startDate = subDays(endDate, days)
+    const { data: { user } } = await supabase.auth.getUser()
+    if (!user || !Array.isArray(dates)) return
 
-    const { data: worklogs, error } = await supabase
-        .from('worklogs')
-        .select('date, channel_logs')
-        .gte('date', format(startDate, 'yyyy-MM-dd'))
-        .lte('date', format(endDate, 'yyyy-MM-dd'))
-        .order('date', { ascending: true })
+    dates
+        .slice(0, MAX_INVALIDATE_DATES)
+        .filter(date => typeof date === 'string' && DATE_KEY.test(date))
+        .forEach(date => dayCache.delete(date))
+}
 
-    if (error) {
-        console.error('Error fetching statistics:', error)
+export async function getStatisticsData(days = 30) {
+    const supabase = await createClient()
+    const { data: { user } } = await supabase.auth.getUser()
+    if (!user) {
         return { dailyStats: [], channelStats: [], totalModifications: 0 }
     }
 
-    // Initialize daily stats map
-    const dailyMap = new Map<string, DailyStats>()
+    const endDate = new Date()
+    const startDate = subDays(endDate, days)
     const dateRange = eachDayOfInterval({ start: startDate, end: endDate })
+    const dateKeys = dateRange.map(date => format(date, 'yyyy-MM-dd'))
+    const today = format(endDate, 'yyyy-MM-dd')
+    const now = Date.now()
 
-    dateRange.forEach(date => {
-        const dateStr = format(date, 'yyyy-MM-dd')
-        dailyMap.set(dateStr, {
-            date: format(date, 'MM/dd'),
-            totalModifications: 0,
-            channelCounts: {}
-        })
+    const dirty = dateKeys.filter(date => {
+        const cached = dayCache.get(date)
+        return date === today || !cached || now - cached.cachedAt > DAY_CACHE_TTL_MS
     })
 
+    if (dirty.length > 0) {
+        const rollups = await fetchRollups(dirty)
+        if (!rollups) {
+            return { dailyStats: [], channelStats: [], totalModifications: 0 }
+        }
+        const fresh = new Map<string, { [channel: string]: number }>(dirty.map(date => [date, {}]))
+        rollups.forEach(({ date, channel, modifications }) => {
+            const counts = fresh.get(date)
+            if (!counts || modifications <= 0) return
+            counts[channel] = (counts[channel] || 0) + modifications
+        })
+        fresh.forEach((channelCounts, date) => dayCache.set(date, { channelCounts, cachedAt: now }))
+    }
+
+    // Merge cached days into the response
+    const dailyMap = new Map<string, DailyStats>()
     const channelAggregates: { [channel: string]: number } = {}
     let totalModifications = 0
 
-    worklogs?.forEach(log => {
-        const dateStr = log.date
-        const stats = dailyMap.get(dateStr)
-        if (!stats) return
-
-        const channelLogs = log.channel_logs as any
-        if (!channelLogs) return
-
-        Object.entries(channelLogs).forEach(([channel, data]: [string, any]) => {
-            const timecodes = data.timecodes
-            if (timecodes) {
-                const count = Object.keys(timecodes).length
-                if (count > 0) {
-                    stats.totalModifications += count
-                    stats.channelCounts[channel] = (stats.channelCounts[channel] || 0) + count
-
-                    channelAggregates[channel] = (channelAggregates[channel] || 0) + count
-                    totalModifications += count
-                }
-            }
+    dateRange.forEach((date, i) => {
+        const channelCounts = { ...dayCache.get(dateKeys[i])!.channelCounts }
+        const dayTotal = Object.values(channelCounts).reduce((sum, count) => sum + count, 0)
+        dailyMap.set(dateKeys[i], {
+            date: format(date, 'MM/dd'),
+            totalModifications: dayTotal,
+            channelCounts
+        })
+
+        Object.entries(channelCounts).forEach(([channel, count]) => {
+            channelAggregates[channel] = (channelAggregates[channel] || 0) + count
         })
+        totalModifications += dayTotal
     })
 
     // Convert map to array
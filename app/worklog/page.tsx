@@ -58,6 +58,11 @@ function WorklogListView() {
   const updateWorklog = useWorklogStore((state) => state.updateWorklog)
   const deleteWorklog = useWorklogStore((state) => state.deleteWorklog)
   const fetchWorklogs = useWorklogStore((state) => state.fetchWorklogs)
+  const fetchMoreWorklogs = useWorklogStore((state) => state.fetchMoreWorklogs)
+  const syncWorklogs = useWorklogStore((state) => state.syncWorklogs)
+  const hasMoreWorklogs = useWorklogStore((state) => state.hasMoreWorklogs)
+  const loadingMoreWorklogs = useWorklogStore((state) => state.loadingMoreWorklogs)
+  const loadedThroughDate = useWorklogStore((state) => state.loadedThroughDate)
   const { addTab, closeAllTabs } = useWorklogTabStore()
   const [sortConfig, setSortConfig] = useState<SortConfig>(null)
 
@@ -111,6 +116,15 @@ function WorklogListView() {
   useEffect(() => {
     fetchWorklogs()
   }, [fetchWorklogs])
+
+  // Coming back to the tab picks up what other tabs and users changed meanwhile
+  useEffect(() => {
+    const handleVisible = () => {
+      if (document.visibilityState === 'visible') syncWorklogs()
+    }
+    document.addEventListener('visibilitychange', handleVisible)
+    return () => document.removeEventListener('visibilitychange', handleVisible)
+  }, [syncWorklogs])
   const [summaryDialog, setSummaryDialog] = useState<{
     open: boolean
     worklog: Worklog | null
@@ -314,6 +328,20 @@ function WorklogListView() {
   const { totalPages, getPageItems } = usePagination(sortedWorklogs, ITEMS_PER_PAGE)
   const currentItems = getPageItems(currentPage)
 
+  // Windowed loading: the store holds the newest pages only. Reaching the last page of the
+  // window pulls in the next older page, and a date filter older than the window loads
+  // down to that date.
+  useEffect(() => {
+    if (hasMoreWorklogs && currentPage >= totalPages) fetchMoreWorklogs()
+  }, [currentPage, totalPages, hasMoreWorklogs, fetchMoreWorklogs])
+
+  useEffect(() => {
+    if (!dateQuery || !hasMoreWorklogs || worklogs.length === 0) return
+    // Already loaded down to the date, even if it has no worklog of its own
+    if (loadedThroughDate && dateQuery >= loadedThroughDate) return
+    if (dateQuery < worklogs[worklogs.length - 1].date) fetchMoreWorklogs(dateQuery)
+  }, [dateQuery, hasMoreWorklogs, loadedThroughDate, worklogs, fetchMoreWorklogs])
+
   const statusSummary = useMemo(() => {
     const total = filteredWorklogs.length
     const active = filteredWorklogs.filter(log => log.status === '작성중').length
@@ -410,7 +438,7 @@ function WorklogListView() {
             {/* Right Side: Summary */}
             <div className="flex items-center gap-4 text-sm text-muted-foreground whitespace-nowrap">
               <div className="flex items-center gap-2">
-                <span>전체 <span className="font-bold text-foreground">{statusSummary.total}</span></span>
+                <span>전체 <span className="font-bold text-foreground">{statusSummary.total}{hasMoreWorklogs && '+'}</span></span>
                 <span className="text-gray-300">|</span>
                 <span>작성중 <span className="font-bold text-amber-600">{statusSummary.active}</span></span>
                 <span className="text-gray-300">|</span>
@@ -668,6 +696,19 @@ function WorklogListView() {
         onPageChange={setCurrentPage}
       />
 
+      {hasMoreWorklogs && (searchQuery || dateQuery) && (
+        <div className="flex justify-center">
+          <Button
+            variant="outline"
+            size="sm"
+            onClick={() => fetchMoreWorklogs()}
+            disabled={loadingMoreWorklogs}
+          >
+            {loadingMoreWorklogs ? "불러오는 중..." : "이전 업무일지 더 불러오기"}
+          </Button>
+        </div>
+      )}
+
       {/* AI Summary Dialog */}
       < Dialog open={summaryDialog.open} onOpenChange={(open) => setSummaryDialog({ open, worklog: null, loading: false })
       }>
@@ -30,7 +30,7 @@ export function DevLoginButtons({ onLogin, bypassShiftCheck, setBypassShiftCheck
                 const currentTeamName = shiftType === 'day' ? teams.A : teams.N
 
                 // 2. Calculate Next Team
-                const nextTeamName = shiftService.getNextTeam(currentTeamName, shiftType, config)
+                const nextTeamName = shiftService.getNextTeam(currentTeamName, shiftType, config, logicalDate)
 
                 const newButtons: { label: string, email: string, type: 'current' | 'next' }[] = []
 
@@ -182,7 +182,8 @@ export function LoginForm({ mode = 'default', onSuccess }: LoginFormProps) {
                             // If I am Team C (Random), I CANNOT login.
 
                             const currentWorkerTeam = currentSession.groupName
-                            const expectedNextTeam = shiftService.getNextTeam(currentWorkerTeam, currentShiftType, config)
+                            const { date: logicalDate } = shiftService.getLogicalShiftInfo(now)
+                            const expectedNextTeam = shiftService.getNextTeam(currentWorkerTeam, currentShiftType, config, logicalDate)
 
                             // Also check if the logging-in group IS the current worker (re-authentication)
                             const isCurrentWorker = groupData.name === currentWorkerTeam
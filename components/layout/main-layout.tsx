@@ -8,6 +8,15 @@ import { cn } from "@/lib/utils"
 import { useAuthStore } from "@/store/auth"
 import { useRouter } from "next/navigation"
 import { useEffect } from "react"
+import { useRealtimeSync } from "@/hooks/use-realtime-sync"
+import { onWriteDropped, type WriteKind } from "@/lib/write-queue"
+import { toast } from "sonner"
+
+const DROPPED_WRITE_LABELS: Record<WriteKind, string> = {
+  'worklogs.update': '업무일지',
+  'worklogs.patch': '업무일지',
+  'posts.update': '게시글',
+}
 
 function LayoutContent({ children }: { children: React.ReactNode }) {
   const { isCollapsed } = useSidebar()
@@ -25,6 +34,15 @@ function LayoutContent({ children }: { children: React.ReactNode }) {
     }
   }, [user, guestSession, hasHydrated, router])
 
+  useRealtimeSync(Boolean(user || guestSession))
+
+  // Edits queued while offline that the server rejected on replay
+  useEffect(() => onWriteDropped((write, error) => {
+    toast.error(`연결 대기 중 저장한 ${DROPPED_WRITE_LABELS[write.kind]} 변경 사항이 반영되지 않았습니다.`, {
+      description: error?.message,
+    })
+  }), [])
+
   return (
     <div className="min-h-screen bg-background">
       <Suspense fallback={<div className="fixed left-0 top-0 z-40 h-screen w-60 bg-sidebar border-r border-sidebar-border hidden lg:block" />}>
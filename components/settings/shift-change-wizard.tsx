@@ -20,6 +20,7 @@ import { ko } from "date-fns/locale"
 import { ArrowRight, Check, AlertTriangle } from "lucide-react"
 import { toast } from "sonner"
 import { supabase } from "@/lib/supabase"
+import { shiftService } from "@/lib/shift-rotation"
 import { auditLogger } from "@/lib/audit-logger"
 
 interface ShiftChangeWizardProps {
@@ -83,6 +84,7 @@ export function ShiftChangeWizard({ onSuccess }: ShiftChangeWizardProps) {
                 .single()
 
             if (configError) throw configError
+            shiftService.invalidateConfigs()
 
             // 2. Log Audit
             await auditLogger.log({
@@ -114,6 +114,7 @@ export function ShiftPatternSettings() {
             toast.error("설정 저장 실패: " + error.message)
         } else if (data) {
             toast.success("근무 패턴 설정이 저장되었습니다.")
+            shiftService.invalidateConfigs()
             // Update state directly with the saved data
             setConfig({
                 id: data.id,
@@ -139,11 +140,14 @@ export function ShiftPatternSettings() {
             }
         }
 
+        // Copy before editing: the loaded pattern is shared with shiftService's config cache
+        const slot = { ...newPattern[dayIndex][type] }
         if (field === 'is_swap') {
-            newPattern[dayIndex][type].is_swap = value === 'true'
+            slot.is_swap = value === 'true'
         } else {
-            newPattern[dayIndex][type].team = value
+            slot.team = value
         }
+        newPattern[dayIndex] = { ...newPattern[dayIndex], [type]: slot }
 
         setConfig({ ...config, pattern_json: newPattern })
     }
@@ -8,6 +8,7 @@ import { ScrollArea } from "@/components/ui/scroll-area"
 import { MoreHorizontal, MessageSquare, Plus } from "lucide-react"
 import { format, isAfter, isBefore, isSameDay, parseISO } from "date-fns"
 import { supabase } from "@/lib/supabase"
+import { shiftService } from "@/lib/shift-rotation"
 
 import {
     DropdownMenu,
@@ -337,6 +338,7 @@ export function ConfigHistoryList() {
                                                                                 alert('삭제된 항목이 없습니다. 권한이 없거나 이미 삭제되었을 수 있습니다.')
                                                                             } else {
                                                                                 alert('삭제되었습니다.')
+                                                                                shiftService.invalidateConfigs()
                                                                                 fetchConfigs()
                                                                             }
                                                                         }
@@ -10,6 +10,7 @@ import { Alert, AlertDescription, AlertTitle } from "@/components/ui/alert"
 import { Loader2, AlertTriangle, CheckCircle, ArrowRight } from "lucide-react"
 import { format } from "date-fns"
 import { supabase } from "@/lib/supabase"
+import { shiftService } from "@/lib/shift-rotation"
 import { auditLogger } from "@/lib/audit-logger"
 import { useAuthStore } from "@/store/auth"
 import { cn } from "@/lib/utils"
@@ -80,74 +81,15 @@ export function Step3Confirm({ data, onChange, onBack, onComplete }: Step3Confir
             }
 
             if (configError) throw configError
+            shiftService.invalidateConfigs()
 
             // 2. Update Worker Groups (Group Members)
-            // This is tricky because we need to map team names to group IDs.
-            // Assuming groups exist with names "1조", "2조", etc.
+            // The whole roster in one call and one transaction; team names are resolved to
+            // groups on the server (30_assign_group_members.sql)
+            const { data: members, error: membersError } = await supabase
+                .rpc('assign_group_members', { p_assignments: data.assignments })
 
-            // First, get all group IDs
-            const { data: groups } = await supabase.from('groups').select('id, name')
-            if (!groups) throw new Error("Failed to fetch groups")
-
-            const updates = []
-            for (const [teamName, userIds] of Object.entries(data.assignments)) {
-                if (teamName === 'Unassigned') {
-                    // Handle Unassigned: Remove from any group
-                    for (const userId of userIds) {
-                        updates.push(
-                            supabase
-                                .from('group_members')
-                                .delete()
-                                .eq('user_id', userId)
-                        )
-                    }
-                    continue
-                }
-
-                const group = groups.find(g => g.name === teamName)
-                if (!group) continue // Should create group if missing? For now assume exists.
-
-                // Use index as display_order
-                for (let i = 0; i < userIds.length; i++) {
-                    const userId = userIds[i]
-                    const displayOrder = i + 1
-
-                    // Update group_members
-                    // We need to upsert or update. 
-                    // Ideally, we should remove from old group and add to new, but simple update works if 1:1
-
-                    // Check if exists
-                    const { data: existing } = await supabase
-                        .from('group_members')
-                        .select('id')
-                        .eq('user_id', userId)
-                        .single()
-
-                    if (existing) {
-                        updates.push(
-                            supabase
-                                .from('group_members')
-                                .update({
-                                    group_id: group.id,
-                                    display_order: displayOrder
-                                })
-                                .eq('user_id', userId)
-                        )
-                    } else {
-                        updates.push(
-                            supabase
-                                .from('group_members')
-                                .insert({
-                                    group_id: group.id,
-                                    user_id: userId,
-                                    display_order: displayOrder
-                                })
-                        )
-                    }
-                }
-            }
-
-            await Promise.all(updates)
+            if (membersError) throw membersError
 
             // 3. Audit Log
             await auditLogger.log({
@@ -158,6 +100,7 @@ export function Step3Confirm({ data, onChange, onBack, onComplete }: Step3Confir
                     valid_from: format(data.validFrom, 'yyyy-MM-dd'),
                     cycle_length: data.cycleLength,
                     teams: Object.keys(data.assignments).filter(k => k !== 'Unassigned'),
+                    members,
                     memo: data.memo
                 }
             })
@@ -35,6 +35,8 @@ import { Tabs, TabsList, TabsTrigger } from "@/components/ui/tabs"
 import { Calendar } from "@/components/ui/calendar"
 import { Popover, PopoverContent, PopoverTrigger } from "@/components/ui/popover"
 import { shiftService } from "@/lib/shift-rotation"
+import { applyPatch, diffWorklog, type WorklogSnapshot } from "@/lib/worklog-patch"
+import { onPendingWritesChange, onWriteDropped, pendingWriteCount } from "@/lib/write-queue"
 import { format, subDays, isToday, isYesterday } from "date-fns"
 import { ko } from "date-fns/locale"
 
@@ -61,7 +63,7 @@ export function WorklogDetail({ worklogId: propWorklogId, tabDate, tabType, tabT
     const paramType = tabType || searchParams.get('type')
     const paramDate = tabDate || searchParams.get('date')
 
-    const { worklogs, addWorklog, updateWorklog, fetchWorklogById, fetchWorklogs, fetchWorklogPosts, fetchWorklogChannelData } = useWorklogStore()
+    const { worklogs, addWorklog, updateWorklog, patchWorklog, fetchWorklogById, fetchWorklogs, fetchWorklogPosts, fetchWorklogChannelData } = useWorklogStore()
     const { user, currentSession, nextSession, promoteNextSession } = useAuthStore()
 
     // Initialize state from props if available
@@ -148,11 +150,22 @@ export function WorklogDetail({ worklogId: propWorklogId, tabDate, tabType, tabT
     const [isSaving, setIsSaving] = useState(false)
     const [lastSaved, setLastSaved] = useState<Date | null>(null)
     const [isDirty, setIsDirty] = useState(false)
+    // Edits waiting in the offline write queue
+    const [pendingWrites, setPendingWrites] = useState(pendingWriteCount)
+    // Bumped to re-run autosave when a queued edit was dropped
+    const [resaveCount, setResaveCount] = useState(0)
+    // Another session changed this worklog while there were unsaved local edits
+    const [changedElsewhere, setChangedElsewhere] = useState(false)
+
+    useEffect(() => onPendingWritesChange(setPendingWrites), [])
     const [isLoaded, setIsLoaded] = useState(false)
 
     // Track fetch attempts to prevent infinite loops
     const fetchAttempted = useRef<Set<string>>(new Set())
 
+    // Last state the server acknowledged for this worklog; autosave sends only the difference
+    const ackedRef = useRef<{ id: string; type: string; snapshot: WorklogSnapshot } | null>(null)
+
     // Post Creation Confirmation State
     const [pendingPost, setPendingPost] = useState<{
         sourceField: string;
@@ -202,25 +215,108 @@ export function WorklogDetail({ worklogId: propWorklogId, tabDate, tabType, tabT
         if (!id || id === 'new') return
         if (!isLoaded) return
 
+        // Nothing to save, e.g. right after a remote change was applied
+        const type = shiftType === 'day' ? '주간' : '야간'
+        const current = ackedRef.current?.id === id ? ackedRef.current : null
+        if (current && current.type === type && diffWorklog(current.snapshot, { workers, channelLogs, systemIssues }).length === 0) {
+            setIsDirty(false)
+            return
+        }
+
         setIsDirty(true) // Mark as dirty when dependencies change
 
         const timer = setTimeout(async () => {
+            const snapshot: WorklogSnapshot = { workers, channelLogs, systemIssues }
+            const acked = ackedRef.current?.id === id ? ackedRef.current : null
+            const ops = acked ? diffWorklog(acked.snapshot, snapshot) : []
+
+            if (acked && acked.type === type && ops.length === 0) {
+                setIsDirty(false)
+                return
+            }
+
             setIsSaving(true)
-            // @ts-ignore
-            await updateWorklog(id, {
-                groupName: selectedTeam || '',
-                type: shiftType === 'day' ? '주간' : '야간',
-                workers: workers,
-                channelLogs: channelLogs,
-                systemIssues: systemIssues
-            })
+            let error: any = null
+            if (!acked) {
+                // Nothing acknowledged yet to diff against: write the whole document once
+                // @ts-ignore
+                ({ error } = await updateWorklog(id, {
+                    groupName: selectedTeam || '',
+                    type,
+                    workers: workers,
+                    channelLogs: channelLogs,
+                    systemIssues: systemIssues
+                }))
+            } else {
+                // @ts-ignore
+                if (acked.type !== type) ({ error } = await updateWorklog(id, { type }))
+                if (!error && ops.length > 0) ({ error } = await patchWorklog(id, ops))
+            }
             setIsSaving(false)
+            if (error) return // stays dirty; the next change retries against the same base
+
+            ackedRef.current = { id, type, snapshot }
             setLastSaved(new Date())
             setIsDirty(false)
         }, 3000)
 
         return () => clearTimeout(timer)
-    }, [id, selectedTeam, shiftType, workers, channelLogs, systemIssues, updateWorklog, isLoaded])
+    }, [id, selectedTeam, shiftType, workers, channelLogs, systemIssues, updateWorklog, patchWorklog, isLoaded, resaveCount])
+
+    // Edits from other sessions reach the store row through Realtime (hooks/use-realtime-sync.ts).
+    // Without unsaved local edits the editor takes them over. With them, it keeps the local
+    // edits and shows a notice; once they are saved, the store row holds both (patchWorklog
+    // applies them on top of it) and is taken over then.
+    useEffect(() => {
+        if (!id || id === 'new' || !isLoaded) return
+        const acked = ackedRef.current?.id === id ? ackedRef.current : null
+        const row = worklogs.find(w => String(w.id) === id)
+        if (!acked || !row) return
+
+        const remote: WorklogSnapshot = {
+            workers: row.workers,
+            channelLogs: row.channelLogs ?? acked.snapshot.channelLogs,
+            systemIssues: row.systemIssues ?? acked.snapshot.systemIssues
+        }
+        if (diffWorklog(acked.snapshot, remote).length === 0) return
+        const local: WorklogSnapshot = { workers, channelLogs, systemIssues }
+        // Our own edit, optimistically applied to the store or echoed back
+        if (diffWorklog(local, remote).length === 0) {
+            setChangedElsewhere(false)
+            return
+        }
+
+        if (diffWorklog(acked.snapshot, local).length > 0) {
+            setChangedElsewhere(true)
+            return
+        }
+        ackedRef.current = { ...acked, snapshot: remote }
+        setWorkers(row.workers)
+        setChannelLogs(remote.channelLogs)
+        setSystemIssues(remote.systemIssues)
+        setChangedElsewhere(false)
+    }, [id, isLoaded, worklogs, lastSaved])
+
+    useEffect(() => setChangedElsewhere(false), [id])
+
+    // A queued edit the server rejected on replay never landed, though it was shown as saved.
+    // Forget the acknowledged state and autosave again, writing the editor's content in full.
+    useEffect(() => onWriteDropped(write => {
+        if (!id || write.target !== id || !write.kind.startsWith('worklogs.')) return
+        if (ackedRef.current?.id === id) ackedRef.current = null
+        setResaveCount(count => count + 1)
+    }), [id])
+
+    // Once loaded, the editor shows exactly what the server has
+    useEffect(() => {
+        if (!id || id === 'new' || !isLoaded) return
+        if (ackedRef.current?.id === id) return
+        ackedRef.current = {
+            id,
+            type: shiftType === 'day' ? '주간' : '야간',
+            snapshot: { workers, channelLogs, systemIssues }
+        }
+    }, [id, isLoaded])
 
     // Warn before unload if dirty
     useEffect(() => {
@@ -248,6 +344,12 @@ export function WorklogDetail({ worklogId: propWorklogId, tabDate, tabType, tabT
                 fetchWorklogChannelData(id).then(({ channelLogs: loadedChannelLogs, systemIssues: loadedSystemIssues }) => {
                     setChannelLogs(loadedChannelLogs)
                     setSystemIssues(loadedSystemIssues)
+                    if (ackedRef.current?.id === id) {
+                        ackedRef.current = {
+                            ...ackedRef.current,
+                            snapshot: { ...ackedRef.current.snapshot, channelLogs: loadedChannelLogs, systemIssues: loadedSystemIssues }
+                        }
+                    }
                 })
             })
         } else {
@@ -1209,46 +1311,23 @@ export function WorklogDetail({ worklogId: propWorklogId, tabDate, tabType, tabT
 
         if (currentId && currentId !== 'new') {
             try {
-                // [SAFETY FIX] Fetch latest server data to prevent overwriting other channels
-                const { data: serverLog } = await supabase
-                    .from('worklogs')
-                    .select('channel_logs')
-                    .eq('id', currentId)
-                    .single()
-
-                const serverChannelLogs = serverLog?.channel_logs || {}
-
-                const targetChannelLog = serverChannelLogs[channelName] || { posts: [], timecodes: {} }
-                const targetTimecodes = { ...(targetChannelLog.timecodes || {}) }
-
-                // Apply atomic update to server state base
-                if (value === undefined) {
-                    delete targetTimecodes[key]
-                } else {
-                    targetTimecodes[key] = value
-                }
-
-                // Construct full update payload
-                const safeChannelLogs = {
-                    ...serverChannelLogs,
-                    [channelName]: {
-                        ...targetChannelLog,
-                        timecodes: targetTimecodes
+                // Only this timecode goes to the server, so edits to other channels made
+                // elsewhere in the meantime are left alone
+                const path = [channelName, 'timecodes', String(key)]
+                const op = value === undefined
+                    ? { op: 'remove' as const, path }
+                    : { op: 'set' as const, path, value }
+                const { error } = await patchWorklog(currentId, [{ ...op, path: ['channel_logs', ...path] }])
+                if (error) throw error
+
+                const acked = ackedRef.current
+                if (acked?.id === currentId) {
+                    ackedRef.current = {
+                        ...acked,
+                        snapshot: { ...acked.snapshot, channelLogs: applyPatch(acked.snapshot.channelLogs, [op]) }
                     }
                 }
 
-                // @ts-ignore
-                await updateWorklog(currentId, {
-                    groupName: selectedTeam || '',
-                    type: shiftType === 'day' ? '주간' : '야간',
-                    workers: workers,
-                    channelLogs: safeChannelLogs, // Use the safely merged logs
-                    systemIssues: systemIssues
-                })
-
-                // Sync local state with the confirmed safe state
-                setChannelLogs(safeChannelLogs)
-
                 toast.success("운행표 수정사항이 저장되었습니다.")
             } catch (error) {
                 console.error("Failed to save timecodes", error)
@@ -1634,11 +1713,16 @@ export function WorklogDetail({ worklogId: propWorklogId, tabDate, tabType, tabT
                     <div className="flex gap-2">
                         {/* Save Status Indicator */}
                         <div className="mr-2 text-sm text-gray-500 font-medium flex items-center gap-1">
+                            {changedElsewhere && (
+                                <span className="text-blue-600 mr-2">다른 곳에서 수정됨 (저장 후 반영)</span>
+                            )}
                             {isSaving ? (
                                 <>
                                     <RefreshCw className="h-3 w-3 animate-spin" />
                                     저장 중...
                                 </>
+                            ) : pendingWrites > 0 ? (
+                                <span className="text-amber-600">연결 대기 중 ({pendingWrites}건 저장 예정)</span>
                             ) : isDirty ? (
                                 <span className="text-amber-600">저장되지 않음</span>
                             ) : lastSaved ? (
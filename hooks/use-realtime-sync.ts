@@ -0,0 +1,21 @@
+import * as React from 'react'
+import { subscribeTable } from '@/lib/realtime'
+import { useWorklogStore } from '@/store/worklog'
+import { usePostStore } from '@/store/posts'
+import { useBroadcastStore, type BroadcastSchedule } from '@/store/broadcast'
+
+// Keeps the worklog, post and broadcast stores live: row changes made by other sessions are
+// applied in place, so nothing has to refetch a table to see them.
+export function useRealtimeSync(enabled: boolean) {
+  React.useEffect(() => {
+    if (!enabled) return
+    const unsubscribes = [
+      subscribeTable('worklogs', changes => useWorklogStore.getState().applyRemoteWorklogs(changes)),
+      subscribeTable('posts', changes => {
+        usePostStore.getState().applyRemotePosts(changes)
+      }),
+      subscribeTable<BroadcastSchedule>('broadcast_schedules', changes => useBroadcastStore.getState().applyRemoteSchedules(changes)),
+    ]
+    return () => unsubscribes.forEach(unsubscribe => unsubscribe())
+  }, [enabled])
+}
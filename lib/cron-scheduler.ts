@@ -0,0 +1,82 @@
+import type { SupabaseClient } from '@supabase/supabase-js'
+
+const KST_OFFSET_MS = 9 * 60 * 60 * 1000
+const DAY_MS = 24 * 60 * 60 * 1000
+
+// Current KST wall clock. `kst` is shifted by +9h, so read it with the getUTC* methods
+// (or getHours() on a UTC server, as shiftService does).
+export function kstClock(now: Date = new Date()): { kst: Date; date: string; minutes: number } {
+    const kst = new Date(now.getTime() + KST_OFFSET_MS)
+    return {
+        kst,
+        date: kst.toISOString().split('T')[0],
+        minutes: kst.getUTCHours() * 60 + kst.getUTCMinutes()
+    }
+}
+
+// 'yyyy-MM-dd' shifted by a number of days
+export function shiftDate(date: string, days: number): string {
+    return new Date(Date.parse(`${date}T00:00:00Z`) + days * DAY_MS).toISOString().split('T')[0]
+}
+
+export interface CronRun {
+    id: string
+    job: string
+    // Last value recorded for a key, or null before the first successful pass
+    watermark(key: string): string | null
+    // Record progress for a key. Values must sort as strings ('2025-01-31', '2025-01-31/night');
+    // a value at or behind the current watermark is ignored.
+    advance(key: string, value: string): Promise<void>
+}
+
+export type CronOutcome<T> =
+    | { status: 'skipped' }
+    | { status: 'succeeded'; runId: string; result: T }
+
+// Run `work` as one entry of the cron_runs ledger (see 24_cron_run_ledger.sql).
+// Only one run per job holds the lock; a concurrent invocation gets 'skipped' without
+// doing any work. The run is marked failed (and the error rethrown) if `work` throws.
+export async function runCronJob<T>(
+    client: SupabaseClient,
+    job: string,
+    work: (run: CronRun) => Promise<T>,
+    leaseMinutes = 5
+): Promise<CronOutcome<T>> {
+    const { data: runId, error: lockError } = await client.rpc('cron_begin_run', {
+        p_job: job,
+        p_lease: `${leaseMinutes} minutes`
+    })
+    if (lockError) throw lockError
+    if (!runId) return { status: 'skipped' }
+
+    try {
+        const { data: rows, error } = await client
+            .from('cron_watermarks')
+            .select('key, value')
+            .eq('job', job)
+        if (error) throw error
+
+        const watermarks = new Map<string, string>((rows || []).map(r => [r.key, r.value]))
+        const run: CronRun = {
+            id: runId,
+            job,
+            watermark: key => watermarks.get(key) ?? null,
+            advance: async (key, value) => {
+                const current = watermarks.get(key)
+                if (current !== undefined && current >= value) return
+                const { error } = await client
+                    .from('cron_watermarks')
+                    .upsert({ job, key, value, run_id: runId }, { onConflict: 'job,key' })
+                if (error) throw error
+                watermarks.set(key, value)
+            }
+        }
+
+        const result = await work(run)
+        await client.rpc('cron_finish_run', { p_run_id: runId, p_status: 'succeeded', p_result: result })
+        return { status: 'succeeded', runId, result }
+    } catch (error: any) {
+        await client.rpc('cron_finish_run', { p_run_id: runId, p_status: 'failed', p_error: error?.message || String(error) })
+        throw error
+    }
+}
@@ -0,0 +1,48 @@
+import type { RealtimePostgresChangesPayload } from '@supabase/supabase-js'
+import { supabase } from './supabase'
+
+// Row-level change events from Supabase Realtime, batched so a burst of edits (autosave,
+// a signature round, a cron pass) reaches the stores as one update and one re-render.
+
+export interface RowChange<T = any> {
+    type: 'INSERT' | 'UPDATE' | 'DELETE'
+    // The new row, or for DELETE the old one (only the primary key unless REPLICA IDENTITY FULL)
+    row: T
+}
+
+export const REALTIME_BATCH_MS = 250
+
+// Subscribe to every change on a public table. `onChanges` gets each batch with only the
+// latest event per row id, in arrival order. Returns the unsubscribe function.
+export function subscribeTable<T extends { id: string }>(
+    table: string,
+    onChanges: (changes: RowChange<T>[]) => void,
+    batchMs = REALTIME_BATCH_MS
+): () => void {
+    let buffer = new Map<string, RowChange<T>>()
+    let timer: ReturnType<typeof setTimeout> | null = null
+
+    const deliver = () => {
+        timer = null
+        const changes = Array.from(buffer.values())
+        buffer = new Map()
+        if (changes.length > 0) onChanges(changes)
+    }
+
+    const channel = supabase
+        .channel(`realtime:${table}`)
+        .on('postgres_changes', { event: '*', schema: 'public', table }, (payload: RealtimePostgresChangesPayload<T>) => {
+            const row = (payload.eventType === 'DELETE' ? payload.old : payload.new) as T
+            if (!row?.id) return
+            // Re-insert so the batch keeps the order of each row's last event
+            buffer.delete(row.id)
+            buffer.set(row.id, { type: payload.eventType, row })
+            timer ??= setTimeout(deliver, batchMs)
+        })
+        .subscribe()
+
+    return () => {
+        if (timer) clearTimeout(timer)
+        supabase.removeChannel(channel)
+    }
+}
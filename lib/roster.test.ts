@@ -0,0 +1,61 @@
+import { describe, it, expect } from "vitest"
+import { buildRosterIndex, moveAssignment, moveInIndex, rosterTeams, UNASSIGNED } from "./roster"
+
+const user = (id: string, name: string, role: string, team?: string, display_order?: number) => ({
+    id,
+    name,
+    role,
+    group_members: team ? [{ display_order, groups: { name: team } }] : [],
+})
+
+const users = [
+    user("u1", "가", "영상", "1조", 2),
+    user("u2", "나", "감독", "1조", 1),
+    user("u3", "다", "부감독", "2조"),
+    user("u4", "라", "영상"),
+    user("u5", "마", "영상", "9조", 1),
+]
+
+describe("rosterTeams", () => {
+    it("collects pattern teams and falls back to the default four", () => {
+        const slot = (a: string, n: string) => ({ A: { team: a }, N: { team: n } })
+        expect(rosterTeams([slot("2조", "1조"), slot("3조", "2조")])).toEqual(["1조", "2조", "3조"])
+        expect(rosterTeams(null)).toEqual(["1조", "2조", "3조", "4조"])
+    })
+})
+
+describe("buildRosterIndex", () => {
+    it("groups workers by team in display order and leaves unknown teams unassigned", () => {
+        const index = buildRosterIndex(["1조", "2조"], users)
+
+        expect(index.members).toEqual({ "1조": ["u2", "u1"], "2조": ["u3"], [UNASSIGNED]: ["u4", "u5"] })
+        expect(index.workers.u5.team).toBe(UNASSIGNED)
+    })
+})
+
+describe("moveInIndex", () => {
+    it("appends the worker to the target team and shares untouched teams", () => {
+        const index = buildRosterIndex(["1조", "2조", "3조"], users)
+        const next = moveInIndex(index, "u1", "2조")
+
+        expect(next.members["1조"]).toEqual(["u2"])
+        expect(next.members["2조"]).toEqual(["u3", "u1"])
+        expect(next.members["3조"]).toBe(index.members["3조"])
+        expect(next.workers.u1.team).toBe("2조")
+        expect(index.workers.u1.team).toBe("1조")
+        expect(moveAssignment(next, "u1")).toEqual({ "2조": ["u3", "u1"] })
+    })
+
+    it("returns the same index for a no-op or an unknown team", () => {
+        const index = buildRosterIndex(["1조"], users)
+
+        expect(moveInIndex(index, "u1", "1조")).toBe(index)
+        expect(moveInIndex(index, "u1", "7조")).toBe(index)
+    })
+
+    it("writes only the worker when unassigning", () => {
+        const next = moveInIndex(buildRosterIndex(["1조"], users), "u2", UNASSIGNED)
+
+        expect(moveAssignment(next, "u2")).toEqual({ [UNASSIGNED]: ["u2"] })
+    })
+})
@@ -0,0 +1,138 @@
+import { supabase } from './supabase'
+import { shiftService } from './shift-rotation'
+
+// Team -> members index behind the live roster view (components/settings/live-roster-view.tsx).
+// Loaded with the active config and one joined users query, built once, then updated in place
+// of a reload as workers are moved.
+
+export const UNASSIGNED = 'Unassigned'
+const DEFAULT_TEAMS = ['1조', '2조', '3조', '4조']
+const NO_ORDER = 999
+
+export interface RosterWorker {
+    id: string
+    name: string
+    role: string
+    team: string // a team of the index, or UNASSIGNED
+    display_order: number
+}
+
+export interface RosterIndex {
+    teams: string[] // sorted, without UNASSIGNED
+    workers: Record<string, RosterWorker>
+    members: Record<string, string[]> // team (and UNASSIGNED) -> worker ids in display order
+}
+
+const ROLE_PRIORITY: Record<string, number> = {
+    "감독": 1,
+    "부감독": 2,
+    "영상": 3,
+    "시스템관리": 4,
+    "관리": 5,
+    "기술스텝": 6,
+    "조원": 7
+}
+
+const getRolePriorityValue = (roleString: string) => {
+    if (!roleString) return 99
+    const priorities = roleString.split(',').map(r => ROLE_PRIORITY[r.trim()] || 99)
+    return Math.min(...priorities)
+}
+
+// Display Order -> Role Priority -> Name
+function compareWorkers(a: RosterWorker, b: RosterWorker): number {
+    if (a.display_order !== NO_ORDER || b.display_order !== NO_ORDER) {
+        return a.display_order - b.display_order
+    }
+    const priorityA = getRolePriorityValue(a.role)
+    const priorityB = getRolePriorityValue(b.role)
+    if (priorityA !== priorityB) return priorityA - priorityB
+    return a.name.localeCompare(b.name)
+}
+
+// Teams that appear in a shift pattern, falling back to the default four
+export function rosterTeams(pattern: { A: { team: string }, N: { team: string } }[] | null | undefined): string[] {
+    const teams = new Set<string>()
+    pattern?.forEach(p => {
+        if (p.A.team) teams.add(p.A.team)
+        if (p.N.team) teams.add(p.N.team)
+    })
+    if (teams.size === 0) DEFAULT_TEAMS.forEach(t => teams.add(t))
+    return Array.from(teams).sort()
+}
+
+// users rows with embedded group_members(display_order, groups(name)); a user in several
+// groups is placed in the first one that is a roster team
+export function buildRosterIndex(teams: string[], users: any[]): RosterIndex {
+    const workers = users.map((u): RosterWorker => {
+        const memberships: any[] = u.group_members || []
+        const membership = memberships.find(m => teams.includes(m.groups?.name))
+        return {
+            id: u.id,
+            name: u.name,
+            role: u.role,
+            team: membership ? membership.groups.name : UNASSIGNED,
+            display_order: membership?.display_order ?? NO_ORDER
+        }
+    })
+    workers.sort(compareWorkers)
+
+    const members: Record<string, string[]> = {}
+    teams.forEach(t => members[t] = [])
+    members[UNASSIGNED] = []
+    workers.forEach(w => members[w.team].push(w.id))
+
+    return {
+        teams,
+        workers: Object.fromEntries(workers.map(w => [w.id, w])),
+        members
+    }
+}
+
+// A new index with the worker appended to the target team. Only the two affected member lists
+// and the worker are copied; returns the same index if nothing changes.
+export function moveInIndex(index: RosterIndex, workerId: string, targetTeam: string): RosterIndex {
+    const worker = index.workers[workerId]
+    if (!worker || worker.team === targetTeam || !index.members[targetTeam]) return index
+    return {
+        ...index,
+        workers: { ...index.workers, [workerId]: { ...worker, team: targetTeam } },
+        members: {
+            ...index.members,
+            [worker.team]: index.members[worker.team].filter(id => id !== workerId),
+            [targetTeam]: [...index.members[targetTeam], workerId]
+        }
+    }
+}
+
+// The assign_group_members payload that stores a move made in `index`: the target team's
+// full order, or just the worker when they were unassigned
+export function moveAssignment(index: RosterIndex, workerId: string): Record<string, string[]> {
+    const team = index.workers[workerId].team
+    return { [team]: team === UNASSIGNED ? [workerId] : index.members[team] }
+}
+
+export const rosterService = {
+    async load(): Promise<RosterIndex> {
+        const [config, { data: users, error }] = await Promise.all([
+            shiftService.getConfig(),
+            supabase
+                .from('users')
+                .select(`
+                    id, name, role,
+                    group_members(display_order, groups(name))
+                `)
+                .eq('is_active', true)
+                .order('name')
+        ])
+        if (error) throw error
+        return buildRosterIndex(rosterTeams(config?.pattern_json), users || [])
+    },
+
+    // One write per move; team names are resolved to groups on the server (30_assign_group_members.sql)
+    async saveMove(index: RosterIndex, workerId: string) {
+        const { error } = await supabase
+            .rpc('assign_group_members', { p_assignments: moveAssignment(index, workerId) })
+        if (error) throw error
+    }
+}
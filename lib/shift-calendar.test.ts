@@ -0,0 +1,117 @@
+import { describe, it, expect } from "vitest"
+import { getShiftCalendar, toDayNumber } from "./shift-calendar"
+import type { ShiftPatternConfig } from "./shift-rotation"
+import { LEGACY_SHIFT_CONFIG, predictShift } from "./schedule"
+
+const slot = (day: number, a: string, n: string, swap = false) => ({
+    day,
+    A: { team: a, is_swap: swap },
+    N: { team: n, is_swap: false },
+})
+
+const makeConfig = (overrides: Partial<ShiftPatternConfig> = {}): ShiftPatternConfig => ({
+    id: "cfg",
+    valid_from: "2025-01-01",
+    valid_to: null,
+    cycle_length: 3,
+    pattern_json: [slot(0, "1조", "2조"), slot(1, "2조", "3조", true), slot(2, "3조", "1조")],
+    roles_json: ["감독", "부감독", "영상"],
+    ...overrides,
+})
+
+describe("ShiftCalendar", () => {
+    it("looks up dates before and after the anchor", () => {
+        const calendar = getShiftCalendar(makeConfig())
+
+        expect(calendar.dayAt("2025-01-01")?.A.team).toBe("1조")
+        expect(calendar.dayAt("2025-01-05")?.A.team).toBe("2조")
+        expect(calendar.dayAt("2024-12-31")?.A.team).toBe("3조")
+        expect(calendar.dayAt(new Date(2024, 11, 31, 10, 0))?.A.team).toBe("3조")
+    })
+
+    it("walks a range across the cycle boundary", () => {
+        const calendar = getShiftCalendar(makeConfig())
+        const entries = calendar.range(new Date(2025, 0, 2), new Date(2025, 0, 5, 23, 59))
+
+        expect(entries.map(e => e.date)).toEqual(["2025-01-02", "2025-01-03", "2025-01-04", "2025-01-05"])
+        expect(entries.map(e => e.day?.A.team)).toEqual(["2조", "3조", "1조", "2조"])
+        expect(entries[0].day?.A.is_swap).toBe(true)
+    })
+
+    it("leaves days missing from pattern_json empty", () => {
+        const calendar = getShiftCalendar(makeConfig({ pattern_json: [slot(0, "1조", "2조")] }))
+
+        expect(calendar.dayAt("2025-01-02")).toBeNull()
+    })
+
+    it("rebuilds when the pattern of the same config object changes", () => {
+        const config = makeConfig()
+        expect(getShiftCalendar(config)).toBe(getShiftCalendar(config))
+
+        config.pattern_json = [slot(0, "4조", "5조"), slot(1, "5조", "4조"), slot(2, "4조", "5조")]
+        expect(getShiftCalendar(config).dayAt("2025-01-01")?.A.team).toBe("4조")
+    })
+
+    it("projects every team over a range in one matrix", () => {
+        const matrix = getShiftCalendar(makeConfig()).project("2025-01-01", "2025-01-03")
+
+        expect(matrix.teams).toEqual(["1조", "2조", "3조"])
+        // Day 0: 1조 A, 2조 N; day 1: 2조 A (swap), 3조 N; day 2: 3조 A, 1조 N
+        expect(matrix.row("1조")).toEqual(["A", "Y", "N"])
+        expect(matrix.row("2조")).toEqual(["N", "A", "Y"])
+        expect(matrix.row("3조")).toEqual(["Y", "N", "A"])
+        expect(matrix.roles(1, 1)).toEqual({ director: 1, assistant: 0, video: 2 })
+    })
+
+    it("marks the day after a night shift as S", () => {
+        const matrix = getShiftCalendar(LEGACY_SHIFT_CONFIG).project("2025-11-06", "2025-11-11")
+
+        expect(matrix.row("1조")).toEqual(["A", "N", "S", "Y", "Y", "A"])
+        // S carries over from the day before the range
+        expect(matrix.row("3조")[0]).toBe("S")
+    })
+
+    it("counts calendar days regardless of time of day", () => {
+        expect(toDayNumber(new Date(2025, 0, 1, 23, 30)) - toDayNumber("2025-01-01")).toBe(0)
+        expect(toDayNumber("2025-03-31") - toDayNumber("2025-03-01")).toBe(30)
+    })
+})
+
+describe("predictShift", () => {
+    it("follows the legacy 5-day rotation", () => {
+        expect(predictShift("1조", "2025-11-06")).toBe("주간")
+        expect(predictShift("1조", "2025-11-07")).toBe("야간")
+        expect(predictShift("1조", "2025-11-08")).toBe("휴무")
+        expect(predictShift("1조", "2025-11-11")).toBe("주간")
+        expect(predictShift("6조", "2025-11-06")).toBe("주간")
+        expect(predictShift("2조", "2025-11-06")).toBe("야간")
+    })
+
+    it("uses a given config", () => {
+        expect(predictShift("3조", "2025-01-02", makeConfig())).toBe("야간")
+    })
+})
+
+describe("ShiftCalendar.relief", () => {
+    // 1조 works A twice per cycle, relieved by different teams
+    const calendar = getShiftCalendar(makeConfig({
+        cycle_length: 4,
+        pattern_json: [slot(0, "1조", "2조"), slot(1, "3조", "1조"), slot(2, "1조", "3조"), slot(3, "2조", "3조")],
+    }))
+
+    it("indexes every position of a team", () => {
+        expect(calendar.positions.get("1조")).toEqual({ A: [0, 2], N: [1] })
+    })
+
+    it("answers from the given date's slot", () => {
+        expect(calendar.relief("1조", "A", "2025-01-01")).toBe("2조")
+        expect(calendar.relief("1조", "A", "2025-01-03")).toBe("3조")
+        expect(calendar.relief("3조", "N", "2025-01-04")).toBe("1조")
+    })
+
+    it("falls back to the first position without a matching date", () => {
+        expect(calendar.relief("1조", "A")).toBe("2조")
+        expect(calendar.relief("1조", "N", "2025-01-01")).toBe("1조")
+        expect(calendar.relief("4조", "A")).toBeNull()
+    })
+})
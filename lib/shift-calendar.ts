@@ -0,0 +1,196 @@
+import type { ShiftPatternConfig } from './shift-rotation'
+
+// One day of the cycle: who works the day (A) and night (N) shift
+export interface CalendarDay {
+    A: { team: string; is_swap: boolean }
+    N: { team: string; is_swap: boolean }
+}
+
+export type ShiftCode = 'Y' | 'A' | 'N' | 'S'
+
+// Stored code -> shift code. 0 (Y) is what a fresh Uint8Array holds.
+export const SHIFT_CODES: readonly ShiftCode[] = ['Y', 'A', 'N', 'S']
+const CODE_A = 1
+const CODE_N = 2
+const CODE_S = 3
+
+export interface CalendarEntry {
+    date: string // yyyy-MM-dd
+    day: CalendarDay | null
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000
+
+// Calendar day number (days since 1970-01-01) of a local Date or a 'yyyy-MM-dd' string.
+// Only the calendar date counts, so 23:00 and 01:00 of the same day land on the same slot.
+export function toDayNumber(date: Date | string): number {
+    if (typeof date === 'string') {
+        const [y, m, d] = date.slice(0, 10).split('-').map(Number)
+        return Date.UTC(y, m - 1, d) / DAY_MS
+    }
+    return Date.UTC(date.getFullYear(), date.getMonth(), date.getDate()) / DAY_MS
+}
+
+export function fromDayNumber(dayNumber: number): string {
+    return new Date(dayNumber * DAY_MS).toISOString().slice(0, 10)
+}
+
+// A shift_pattern_configs row expanded once into a dense table indexed by cycle day,
+// so looking up any date is one subtraction and one modulo.
+export class ShiftCalendar {
+    readonly anchor: number
+    readonly cycleLength: number
+    readonly slots: (CalendarDay | null)[]
+    // Every team named in the pattern, in natural order (1조, 2조, ..., 10조)
+    readonly teams: string[]
+    // Reverse index: team -> cycle days it works A and N, ascending. A team may appear
+    // several times per cycle.
+    readonly positions: Map<string, { A: number[]; N: number[] }>
+
+    constructor(readonly config: ShiftPatternConfig) {
+        this.anchor = toDayNumber(config.valid_from)
+        this.cycleLength = config.cycle_length
+        this.slots = new Array(config.cycle_length).fill(null)
+        for (const p of config.pattern_json) {
+            // First entry for a day wins, like pattern_json.find(p => p.day === index)
+            if (p.day >= 0 && p.day < this.cycleLength && !this.slots[p.day]) {
+                this.slots[p.day] = { A: p.A, N: p.N }
+            }
+        }
+        this.positions = new Map()
+        this.slots.forEach((slot, day) => {
+            for (const shift of ['A', 'N'] as const) {
+                const team = slot?.[shift]?.team
+                if (!team) continue
+                if (!this.positions.has(team)) this.positions.set(team, { A: [], N: [] })
+                this.positions.get(team)![shift].push(day)
+            }
+        })
+        this.teams = Array.from(this.positions.keys()).sort((a, b) => a.localeCompare(b, undefined, { numeric: true }))
+    }
+
+    indexOf(date: Date | string): number {
+        const index = (toDayNumber(date) - this.anchor) % this.cycleLength
+        return index < 0 ? index + this.cycleLength : index
+    }
+
+    dayAt(date: Date | string): CalendarDay | null {
+        return this.slots[this.indexOf(date)] ?? null
+    }
+
+    // Every date from start to end (inclusive) with its pattern, walking the table
+    // instead of recomputing the offset for each day.
+    range(start: Date | string, end: Date | string): CalendarEntry[] {
+        const first = toDayNumber(start)
+        const last = toDayNumber(end)
+        const entries: CalendarEntry[] = []
+        let index = this.indexOf(start)
+        for (let n = first; n <= last; n++) {
+            entries.push({ date: fromDayNumber(n), day: this.slots[index] ?? null })
+            index = index + 1 === this.cycleLength ? 0 : index + 1
+        }
+        return entries
+    }
+
+    // Team that takes over from `team` after its `shift`: N of the same day after A, A of the
+    // next day after N. With a date the answer comes straight from that day's slot; without
+    // one, from the first cycle day the team works that shift.
+    relief(team: string, shift: 'A' | 'N', date?: Date | string): string | null {
+        let day: number | undefined
+        if (date !== undefined) {
+            const index = this.indexOf(date)
+            if (this.slots[index]?.[shift]?.team === team) day = index
+        }
+        day ??= this.positions.get(team)?.[shift][0]
+        if (day === undefined) return null
+
+        const next = shift === 'A' ? this.slots[day]?.N : this.slots[(day + 1) % this.cycleLength]?.A
+        return next?.team || null
+    }
+
+    // Shift code of every team on every day from start to end (inclusive), in one pass over
+    // the table. A team that worked N the day before and has no shift today is S (sleep).
+    project(start: Date | string, end: Date | string, teams: string[] = this.teams): RosterMatrix {
+        const first = toDayNumber(start)
+        const days = Math.max(0, toDayNumber(end) - first + 1)
+        const rows = new Map(teams.map((team, i) => [team, i]))
+        const codes = new Uint8Array(teams.length * days)
+        const swaps = new Uint8Array(teams.length * days)
+        const dates: string[] = new Array(days)
+
+        const mark = (team: string | undefined, d: number, code: number, swap = false) => {
+            const row = team === undefined ? undefined : rows.get(team)
+            if (row === undefined) return
+            codes[row * days + d] = code
+            swaps[row * days + d] = swap ? 1 : 0
+        }
+
+        let index = this.indexOf(start)
+        let previousNight = this.slots[index === 0 ? this.cycleLength - 1 : index - 1]?.N?.team
+        for (let d = 0; d < days; d++) {
+            dates[d] = fromDayNumber(first + d)
+            const slot = this.slots[index]
+            mark(previousNight, d, CODE_S)
+            // A and N come after S so a team back on duty the next day isn't shown asleep
+            mark(slot?.A?.team, d, CODE_A, slot?.A?.is_swap)
+            mark(slot?.N?.team, d, CODE_N, slot?.N?.is_swap)
+            previousNight = slot?.N?.team
+            index = index + 1 === this.cycleLength ? 0 : index + 1
+        }
+        return new RosterMatrix(dates, teams, codes, swaps)
+    }
+
+    isStale(config: ShiftPatternConfig): boolean {
+        return (
+            config.pattern_json !== this.config.pattern_json ||
+            config.cycle_length !== this.cycleLength ||
+            config.valid_from !== this.config.valid_from
+        )
+    }
+}
+
+// Team x day grid from ShiftCalendar.project, stored flat (row = team) to stay compact
+// for month and year views.
+export class RosterMatrix {
+    constructor(
+        readonly dates: string[],
+        readonly teams: string[],
+        readonly codes: Uint8Array,
+        readonly swaps: Uint8Array
+    ) {}
+
+    code(team: number, day: number): ShiftCode {
+        return SHIFT_CODES[this.codes[team * this.dates.length + day]]
+    }
+
+    isSwap(team: number, day: number): boolean {
+        return this.swaps[team * this.dates.length + day] === 1
+    }
+
+    // Index into the team's sorted member list for each role
+    // Default: Director=0, Assistant=1, Video=2
+    // Swap: Director=1, Assistant=0, Video=2
+    roles(team: number, day: number): { director: number; assistant: number; video: number } {
+        return this.isSwap(team, day)
+            ? { director: 1, assistant: 0, video: 2 }
+            : { director: 0, assistant: 1, video: 2 }
+    }
+
+    // Shift codes of one team across all dates
+    row(team: string): ShiftCode[] {
+        const t = this.teams.indexOf(team)
+        return t === -1 ? [] : this.dates.map((_, d) => this.code(t, d))
+    }
+}
+
+const calendars = new WeakMap<ShiftPatternConfig, ShiftCalendar>()
+
+// Calendar for a config, built on first use and kept for as long as the config object lives.
+export function getShiftCalendar(config: ShiftPatternConfig): ShiftCalendar {
+    let calendar = calendars.get(config)
+    if (!calendar || calendar.isStale(config)) {
+        calendar = new ShiftCalendar(config)
+        calendars.set(config, calendar)
+    }
+    return calendar
+}
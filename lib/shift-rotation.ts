@@ -1,5 +1,6 @@
 import { supabase } from './supabase'
-import { addDays, differenceInDays, parseISO, format, subDays } from 'date-fns'
+import { format, subDays } from 'date-fns'
+import { RosterMatrix, getShiftCalendar } from './shift-calendar'
 
 export interface ShiftPatternConfig {
     id: string
@@ -29,130 +30,115 @@ export interface ShiftInfo {
     isSwap: boolean
 }
 
+// Shift info of the given row of a roster matrix on one of its days
+function toShiftInfo(matrix: RosterMatrix, team: number, day: number): ShiftInfo {
+    return {
+        date: matrix.dates[day],
+        team: matrix.teams[team],
+        shiftType: matrix.code(team, day),
+        roles: matrix.roles(team, day),
+        isSwap: matrix.isSwap(team, day)
+    }
+}
+
+// All configs, newest valid_from first (ties: newest created_at first), loaded once and
+// shared by every getConfig call. Reloaded after CONFIG_INDEX_TTL_MS so configs saved
+// from another tab or device still show up.
+const CONFIG_INDEX_TTL_MS = 5 * 60 * 1000
+
+let configIndex: { loadedAt: number; configs: ShiftPatternConfig[] } | null = null
+let configIndexLoad: Promise<ShiftPatternConfig[] | null> | null = null
+
+async function loadConfigIndex(): Promise<ShiftPatternConfig[] | null> {
+    if (configIndex && Date.now() - configIndex.loadedAt < CONFIG_INDEX_TTL_MS) {
+        return configIndex.configs
+    }
+    if (!configIndexLoad) {
+        const load = (async () => {
+            try {
+                const { data, error } = await supabase
+                    .from('shift_pattern_configs')
+                    .select('*')
+                    .order('valid_from', { ascending: false })
+                    .order('created_at', { ascending: false })
+
+                if (error) {
+                    console.error('Error fetching shift config:', error)
+                    return null
+                }
+                // Skip the result if invalidateConfigs() ran while it was in flight
+                if (configIndexLoad === load) {
+                    configIndex = { loadedAt: Date.now(), configs: data || [] }
+                }
+                return data || []
+            } finally {
+                if (configIndexLoad === load) configIndexLoad = null
+            }
+        })()
+        configIndexLoad = load
+    }
+    return configIndexLoad
+}
+
+// Same rule as the old per-call query: the newest config with valid_from <= date whose
+// valid_to is open or >= date. Dates are yyyy-MM-dd, so string comparison orders them.
+function resolveConfig(configs: ShiftPatternConfig[], date: string): ShiftPatternConfig | null {
+    // Binary search for the first config that starts on or before the date
+    let lo = 0
+    let hi = configs.length
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1
+        if (configs[mid].valid_from > date) lo = mid + 1
+        else hi = mid
+    }
+    for (let i = lo; i < configs.length; i++) {
+        const validTo = configs[i].valid_to
+        if (!validTo || validTo >= date) return configs[i]
+    }
+    return null
+}
+
 export const shiftService = {
     // Fetch the active configuration for a specific date
     async getConfig(date?: Date | string): Promise<ShiftPatternConfig | null> {
         const d = date || new Date()
         const targetDate = typeof d === 'string' ? d : format(d, 'yyyy-MM-dd')
 
-        const { data, error } = await supabase
-            .from('shift_pattern_configs')
-            .select('*')
-            .lte('valid_from', targetDate)
-            .or(`valid_to.is.null,valid_to.gte.${targetDate}`)
-            .order('valid_from', { ascending: false })
-            .order('created_at', { ascending: false })
-            .limit(1)
-            .maybeSingle()
-
-        if (error) {
-            console.error('Error fetching shift config:', error)
-            return null
-        }
+        const configs = await loadConfigIndex()
+        return configs ? resolveConfig(configs, targetDate) : null
+    },
 
-        return data
+    // Drop the cached config index; call after inserting, updating or deleting a config
+    invalidateConfigs() {
+        configIndex = null
+        configIndexLoad = null
     },
 
     // Calculate shift info for a specific date and team
+    // shiftType is S (sleep) the day after the team's night shift when it has no shift of its own
     calculateShift(date: Date | string, teamName: string, config: ShiftPatternConfig): ShiftInfo {
-        const targetDate = typeof date === 'string' ? parseISO(date) : date
-        const anchorDate = parseISO(config.valid_from)
-
-        // Calculate days difference
-        const diff = differenceInDays(targetDate, anchorDate)
-
-        // Calculate index in cycle (handle negative diffs for past dates)
-        let index = diff % config.cycle_length
-        if (index < 0) index += config.cycle_length
-
-        // Get pattern for this day index
-        const dailyPattern = config.pattern_json.find(p => p.day === index)
-
-        if (!dailyPattern) {
-            // Fallback if pattern not found (should not happen if config is correct)
-            return {
-                date: format(targetDate, 'yyyy-MM-dd'),
-                team: teamName,
-                shiftType: 'Y',
-                roles: { director: 0, assistant: 1, video: 2 },
-                isSwap: false
-            }
-        }
-
-        let shiftType: 'A' | 'N' | 'S' | 'Y' = 'Y'
-        let isSwap = false
-
-        if (dailyPattern?.A?.team === teamName) {
-            shiftType = 'A'
-            isSwap = dailyPattern.A.is_swap
-        } else if (dailyPattern?.N?.team === teamName) {
-            shiftType = 'N'
-            isSwap = dailyPattern.N.is_swap
-        } else {
-            // Check previous day for Sleep (S) logic if needed, or just assume Y/S based on pattern
-            // For now, if not A or N, it's Off (Y) or Sleep (S). 
-            // The user's pattern implies S follows N, but for simple role calculation, Y is fine.
-            // If we need strict S/Y distinction, we'd need to check previous day's N.
-            shiftType = 'Y'
-        }
-
-        // Define Roles Indices
-        // Default: Director=0, Assistant=1, Video=2
-        // Swap: Director=1, Assistant=0, Video=2
-        const roles = isSwap
-            ? { director: 1, assistant: 0, video: 2 }
-            : { director: 0, assistant: 1, video: 2 }
-
-        return {
-            date: format(targetDate, 'yyyy-MM-dd'),
-            team: teamName,
-            shiftType,
-            roles,
-            isSwap
-        }
+        const matrix = getShiftCalendar(config).project(date, date, [teamName])
+        return toShiftInfo(matrix, 0, 0)
     },
 
     // Get shift info for a range of dates
     calculateShiftRange(startDate: Date, endDate: Date, teamName: string, config: ShiftPatternConfig): ShiftInfo[] {
-        const results: ShiftInfo[] = []
-        let current = startDate
-
-        while (current <= endDate) {
-            results.push(this.calculateShift(current, teamName, config))
-            current = addDays(current, 1)
-        }
+        const matrix = getShiftCalendar(config).project(startDate, endDate, [teamName])
+        return matrix.dates.map((_, day) => toShiftInfo(matrix, 0, day))
+    },
 
-        return results
+    // Shift codes and roles of several teams (default: every team in the pattern) over a
+    // date range, computed in a single pass. Use this for roster grids instead of calling
+    // calculateShift per team per day.
+    projectRoster(startDate: Date | string, endDate: Date | string, config: ShiftPatternConfig, teams?: string[]): RosterMatrix {
+        return getShiftCalendar(config).project(startDate, endDate, teams)
     },
 
     // Calculate the expected next team based on current team and shift
-    getNextTeam(currentTeam: string, currentShift: 'day' | 'night', config: ShiftPatternConfig): string | null {
-        // 1. Find the day index in the cycle where the current team is working the current shift
-        const currentPatternIndex = config.pattern_json.findIndex(p => {
-            if (currentShift === 'day') return p.A.team === currentTeam
-            return p.N.team === currentTeam
-        })
-
-        if (currentPatternIndex === -1) return null
-
-        let nextTeam = ''
-
-        if (currentShift === 'day') {
-            // Next is Night of the SAME day index
-            const pattern = config.pattern_json.find(p => p.day === currentPatternIndex)
-            if (pattern) {
-                nextTeam = pattern.N.team
-            }
-        } else {
-            // Next is Day of the NEXT day index
-            const nextDayIndex = (currentPatternIndex + 1) % config.cycle_length
-            const pattern = config.pattern_json.find(p => p.day === nextDayIndex)
-            if (pattern) {
-                nextTeam = pattern.A.team
-            }
-        }
-
-        return nextTeam || null
+    // Pass the logical date of the current shift when the team works several times per cycle;
+    // without it the team's first position in the cycle is used.
+    getNextTeam(currentTeam: string, currentShift: 'day' | 'night', config: ShiftPatternConfig, date?: Date | string): string | null {
+        return getShiftCalendar(config).relief(currentTeam, currentShift === 'day' ? 'A' : 'N', date)
     },
 
     // Determine the logical date and shift type based on current time
@@ -185,15 +171,7 @@ export const shiftService = {
 
     // Get teams for a specific date based on the pattern
     getTeamsForDate(date: Date | string, config: ShiftPatternConfig): { A: string, N: string } | null {
-        const targetDate = typeof date === 'string' ? parseISO(date) : date
-        const anchorDate = parseISO(config.valid_from)
-
-        const diff = differenceInDays(targetDate, anchorDate)
-        let index = diff % config.cycle_length
-        if (index < 0) index += config.cycle_length
-
-        const dailyPattern = config.pattern_json.find(p => p.day === index)
-
+        const dailyPattern = getShiftCalendar(config).dayAt(date)
         if (!dailyPattern) return null
 
         return {
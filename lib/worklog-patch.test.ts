@@ -0,0 +1,95 @@
+import { describe, it, expect } from "vitest"
+import { applyPatch, coalescePatch, diff, diffWorklog, type WorklogSnapshot } from "./worklog-patch"
+
+const snapshot = (overrides: Partial<WorklogSnapshot> = {}): WorklogSnapshot => ({
+    workers: { director: ["김감독"], assistant: ["이부감독"], video: ["박영상"] },
+    channelLogs: {
+        "MBC ON": { posts: [], timecodes: { 0: "MBC ON 12:00:00:00부터 정규1번", 1: "MBC ON 13:00:00:00부터 정규2번" } },
+        "MBC M": { posts: [{ id: "p1", summary: "송출 확인" }], timecodes: {} },
+    },
+    systemIssues: [],
+    ...overrides,
+})
+
+describe("diffWorklog", () => {
+    it("returns nothing for an unchanged worklog", () => {
+        expect(diffWorklog(snapshot(), snapshot())).toEqual([])
+    })
+
+    it("sends one op per edited timecode", () => {
+        const next = snapshot()
+        next.channelLogs = {
+            ...next.channelLogs,
+            "MBC ON": { posts: [], timecodes: { 0: "MBC ON 12:00:00:00부터 정규1번", 1: "MBC ON 13:30:00:00부터 정규2번" } },
+        }
+
+        expect(diffWorklog(snapshot(), next)).toEqual([
+            { op: "set", path: ["channel_logs", "MBC ON", "timecodes", "1"], value: "MBC ON 13:30:00:00부터 정규2번" },
+        ])
+    })
+
+    it("removes deleted keys and adds new channels", () => {
+        const next = snapshot()
+        next.channelLogs = {
+            "MBC ON": { posts: [], timecodes: { 0: "MBC ON 12:00:00:00부터 정규1번" } },
+            "MBC M": next.channelLogs["MBC M"],
+            "MBC DRAMA": { posts: [], timecodes: { 0: "DRAMA" } },
+        }
+
+        expect(diffWorklog(snapshot(), next)).toEqual([
+            { op: "remove", path: ["channel_logs", "MBC ON", "timecodes", "1"] },
+            { op: "set", path: ["channel_logs", "MBC DRAMA"], value: { posts: [], timecodes: { 0: "DRAMA" } } },
+        ])
+    })
+
+    it("replaces arrays whole", () => {
+        const next = snapshot({ systemIssues: [{ id: "i1", summary: "장애" }] })
+        next.workers = { ...next.workers, video: ["박영상", "최영상"] }
+
+        expect(diffWorklog(snapshot(), next)).toEqual([
+            { op: "set", path: ["workers", "video"], value: ["박영상", "최영상"] },
+            { op: "set", path: ["system_issues"], value: [{ id: "i1", summary: "장애" }] },
+        ])
+    })
+})
+
+describe("applyPatch", () => {
+    it("round-trips a diff", () => {
+        const base = { a: { b: 1, c: [1, 2] }, d: "x" }
+        const next = { a: { b: 2, c: [1, 2], e: { f: true } } }
+
+        expect(applyPatch(base, diff(base, next))).toEqual(next)
+    })
+
+    it("leaves the input untouched and shares unchanged branches", () => {
+        const base = { a: { b: 1 }, keep: { c: 2 } }
+        const result = applyPatch(base, [{ op: "set", path: ["a", "b"], value: 3 }])
+
+        expect(base.a.b).toBe(1)
+        expect(result.keep).toBe(base.keep)
+    })
+
+    it("creates missing parents on set and ignores removing a missing key", () => {
+        expect(applyPatch({}, [{ op: "set", path: ["x", "y"], value: 1 }])).toEqual({ x: { y: 1 } })
+        expect(applyPatch({ a: 1 }, [{ op: "remove", path: ["x", "y"] }])).toEqual({ a: 1 })
+    })
+})
+
+describe("coalescePatch", () => {
+    it("keeps only the last write to a path and drops writes under a replaced parent", () => {
+        const tc = (key: string) => ["channel_logs", "MBC ON", "timecodes", key]
+        const ops = coalescePatch([
+            { op: "set", path: tc("0"), value: "a" },
+            { op: "set", path: tc("1"), value: "b" },
+            { op: "set", path: tc("0"), value: "ab" },
+            { op: "set", path: ["workers", "video"], value: ["x"] },
+            { op: "set", path: ["workers"], value: { director: [] } },
+        ])
+
+        expect(ops).toEqual([
+            { op: "set", path: tc("1"), value: "b" },
+            { op: "set", path: tc("0"), value: "ab" },
+            { op: "set", path: ["workers"], value: { director: [] } },
+        ])
+    })
+})
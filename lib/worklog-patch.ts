@@ -0,0 +1,90 @@
+import type { ChannelLog } from '../store/worklog'
+
+// One change to a worklog JSONB column. path[0] is the column (channel_logs, workers,
+// system_issues), the rest are object keys inside it; applied by patch_worklog
+// (28_patch_worklog.sql).
+export type PatchOp =
+    | { op: 'set'; path: string[]; value: unknown }
+    | { op: 'remove'; path: string[] }
+
+// The editable JSON part of a worklog, as last acknowledged by the server
+export interface WorklogSnapshot {
+    workers: { [role: string]: unknown }
+    channelLogs: { [channel: string]: ChannelLog }
+    systemIssues: { id: string; summary: string }[]
+}
+
+export const PATCH_COLUMNS = {
+    workers: 'workers',
+    channelLogs: 'channel_logs',
+    systemIssues: 'system_issues',
+} as const satisfies Record<keyof WorklogSnapshot, string>
+
+function isPlainObject(value: unknown): value is { [key: string]: unknown } {
+    return typeof value === 'object' && value !== null && !Array.isArray(value)
+}
+
+export function deepEqual(a: unknown, b: unknown): boolean {
+    if (a === b) return true
+    if (Array.isArray(a) && Array.isArray(b)) {
+        return a.length === b.length && a.every((item, i) => deepEqual(item, b[i]))
+    }
+    if (isPlainObject(a) && isPlainObject(b)) {
+        const keys = Object.keys(a).filter(k => a[k] !== undefined)
+        return keys.length === Object.keys(b).filter(k => b[k] !== undefined).length &&
+            keys.every(k => deepEqual(a[k], b[k]))
+    }
+    return false
+}
+
+// Ops turning `base` into `next`. Objects are compared key by key so one edited timecode is
+// one op; arrays and scalars are replaced whole.
+export function diff(base: unknown, next: unknown, path: string[] = []): PatchOp[] {
+    if (!isPlainObject(base) || !isPlainObject(next)) {
+        return deepEqual(base, next) ? [] : [{ op: 'set', path, value: next }]
+    }
+    const ops: PatchOp[] = []
+    for (const key of Object.keys(base)) {
+        if (base[key] !== undefined && next[key] === undefined) ops.push({ op: 'remove', path: [...path, key] })
+    }
+    for (const key of Object.keys(next)) {
+        if (next[key] === undefined) continue
+        if (base[key] === undefined) ops.push({ op: 'set', path: [...path, key], value: next[key] })
+        else ops.push(...diff(base[key], next[key], [...path, key]))
+    }
+    return ops
+}
+
+export function diffWorklog(base: WorklogSnapshot, next: WorklogSnapshot): PatchOp[] {
+    return (Object.keys(PATCH_COLUMNS) as (keyof WorklogSnapshot)[]).flatMap(field =>
+        diff(base[field], next[field], [PATCH_COLUMNS[field]])
+    )
+}
+
+// `doc` with `ops` applied (paths relative to doc), copying only the objects along each path
+export function applyPatch<T>(doc: T, ops: PatchOp[]): T {
+    let result: unknown = doc
+    for (const op of ops) result = applyOp(result, op.path, op)
+    return result as T
+}
+
+function applyOp(doc: unknown, path: string[], op: PatchOp): unknown {
+    if (path.length === 0) return op.op === 'set' ? op.value : undefined
+    const [key, ...rest] = path
+    if (op.op === 'remove' && (!isPlainObject(doc) || doc[key] === undefined)) return doc
+    const copy = { ...(isPlainObject(doc) ? doc : {}) }
+    const value = applyOp(copy[key], rest, op)
+    if (value === undefined) delete copy[key]
+    else copy[key] = value
+    return copy
+}
+
+// `ops` without the ones a later op overwrites (same path, or a path below a later op's),
+// e.g. successive edits of one timecode collapse to the last one
+export function coalescePatch(ops: PatchOp[]): PatchOp[] {
+    return ops.filter((op, i) =>
+        !ops.slice(i + 1).some(later =>
+            later.path.length <= op.path.length && later.path.every((key, k) => key === op.path[k])
+        )
+    )
+}
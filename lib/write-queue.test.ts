@@ -0,0 +1,217 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest"
+
+// No indexedDB or window under node: the queue runs in memory and only flushes on its timer,
+// which stays fake so each test calls flush() itself.
+type WriteQueue = typeof import("./write-queue")
+
+let queue: WriteQueue
+let online = true
+
+const sender = (respond: (target: string, payload: any) => any = () => ({ error: null })) =>
+    vi.fn(async (target: string, payload: any) => respond(target, payload))
+
+beforeEach(async () => {
+    vi.useFakeTimers()
+    vi.resetModules()
+    online = true
+    vi.stubGlobal("navigator", { get onLine() { return online } })
+    queue = await import("./write-queue")
+})
+
+afterEach(() => {
+    vi.unstubAllGlobals()
+    vi.useRealTimers()
+})
+
+describe("submitWrite", () => {
+    it("sends directly while online", async () => {
+        const send = sender()
+        queue.registerWriteSender("posts.update", send)
+
+        expect(await queue.submitWrite("posts.update", "p1", { title: "a" })).toEqual({ error: null })
+        expect(send).toHaveBeenCalledWith("p1", { title: "a" })
+        expect(queue.pendingWriteCount()).toBe(0)
+    })
+
+    it("queues while offline and replays in order once back online", async () => {
+        const calls: string[] = []
+        const record = (kind: string) => sender(target => {
+            calls.push(`${kind}:${target}`)
+            return { error: null }
+        })
+        queue.registerWriteSender("posts.update", record("posts"))
+        queue.registerWriteSender("worklogs.update", record("worklogs"))
+
+        online = false
+        expect(await queue.submitWrite("posts.update", "p1", { title: "a" })).toEqual({ error: null, queued: true })
+        await queue.submitWrite("worklogs.update", "w1", { status: "작성중" })
+        await queue.submitWrite("posts.update", "p2", { title: "b" })
+        expect(queue.pendingWriteCount()).toBe(3)
+        expect(calls).toEqual([])
+
+        online = true
+        await queue.flush()
+        expect(calls).toEqual(["posts:p1", "worklogs:w1", "posts:p2"])
+        expect(queue.pendingWriteCount()).toBe(0)
+    })
+
+    it("queues behind earlier writes to the same row even when online", async () => {
+        const send = sender()
+        queue.registerWriteSender("worklogs.update", send)
+
+        online = false
+        await queue.submitWrite("worklogs.update", "w1", { status: "작성중" })
+        online = true
+        expect(await queue.submitWrite("worklogs.update", "w1", { type: "야간" })).toEqual({ error: null, queued: true })
+        expect(send).not.toHaveBeenCalled()
+    })
+})
+
+describe("merging", () => {
+    it("merges consecutive writes to a row by column and by patch path", async () => {
+        const update = sender()
+        const patch = sender()
+        queue.registerWriteSender("worklogs.update", update)
+        queue.registerWriteSender("worklogs.patch", patch)
+
+        online = false
+        await queue.submitWrite("worklogs.update", "w1", { status: "작성중", type: "주간" })
+        await queue.submitWrite("worklogs.update", "w1", { type: "야간" })
+        await queue.submitWrite("worklogs.patch", "w1", [{ op: "set", path: ["workers", "video"], value: ["a"] }])
+        await queue.submitWrite("worklogs.patch", "w1", [{ op: "set", path: ["workers", "video"], value: ["b"] }])
+        expect(queue.pendingWriteCount()).toBe(2)
+
+        online = true
+        await queue.flush()
+        expect(update).toHaveBeenCalledOnce()
+        expect(update).toHaveBeenCalledWith("w1", { status: "작성중", type: "야간" })
+        expect(patch).toHaveBeenCalledOnce()
+        expect(patch).toHaveBeenCalledWith("w1", [{ op: "set", path: ["workers", "video"], value: ["b"] }])
+    })
+
+    it("does not merge into a write of another kind in between", async () => {
+        const calls: any[] = []
+        const record = sender((target, payload) => {
+            calls.push(payload)
+            return { error: null }
+        })
+        queue.registerWriteSender("worklogs.update", record)
+        queue.registerWriteSender("worklogs.patch", record)
+
+        online = false
+        await queue.submitWrite("worklogs.update", "w1", { status: "작성중" })
+        await queue.submitWrite("worklogs.patch", "w1", [{ op: "remove", path: ["system_issues"] }])
+        await queue.submitWrite("worklogs.update", "w1", { status: "근무종료" })
+        expect(queue.pendingWriteCount()).toBe(3)
+
+        online = true
+        await queue.flush()
+        expect(calls).toEqual([{ status: "작성중" }, [{ op: "remove", path: ["system_issues"] }], { status: "근무종료" }])
+    })
+
+    it("does not merge into the write being sent", async () => {
+        let release!: () => void
+        const calls: any[] = []
+        const send = vi.fn(async (target: string, payload: any) => {
+            calls.push(payload)
+            if (calls.length === 1) await new Promise<void>(resolve => { release = resolve })
+            return { error: null }
+        })
+        queue.registerWriteSender("worklogs.update", send)
+
+        online = false
+        await queue.submitWrite("worklogs.update", "w1", { status: "작성중" })
+        online = true
+        const flushing = queue.flush()
+        await vi.waitFor(() => expect(calls).toHaveLength(1))
+
+        await queue.submitWrite("worklogs.update", "w1", { type: "야간" })
+        expect(queue.pendingWriteCount()).toBe(2)
+
+        release()
+        await flushing
+        expect(calls).toEqual([{ status: "작성중" }, { type: "야간" }])
+        expect(queue.pendingWriteCount()).toBe(0)
+    })
+})
+
+describe("flush", () => {
+    it("replays under the queue lock, so a write to the same row waits for it", async () => {
+        // Web Locks stand-in: one holder at a time, in request order
+        let tail = Promise.resolve()
+        let held = false
+        const locks = {
+            request: (_name: string, task: () => Promise<any>) => {
+                const run = tail.then(async () => {
+                    held = true
+                    try { return await task() } finally { held = false }
+                })
+                tail = run.catch(() => {})
+                return run
+            },
+        }
+        vi.stubGlobal("navigator", { get onLine() { return online }, locks })
+
+        let release!: () => void
+        const calls: [any, boolean][] = []
+        queue.registerWriteSender("worklogs.update", async (target, payload) => {
+            calls.push([payload, held])
+            if (calls.length === 1) await new Promise<void>(resolve => { release = resolve })
+            return { error: null }
+        })
+
+        online = false
+        await queue.submitWrite("worklogs.update", "w1", { status: "작성중" })
+        online = true
+        const flushing = queue.flush()
+        await vi.waitFor(() => expect(calls).toHaveLength(1))
+
+        const submitting = queue.submitWrite("worklogs.update", "w1", { type: "야간" })
+        await vi.advanceTimersByTimeAsync(0)
+        expect(calls).toHaveLength(1)
+
+        release()
+        expect(await submitting).toEqual({ error: null })
+        await flushing
+        expect(calls).toEqual([[{ status: "작성중" }, true], [{ type: "야간" }, false]])
+    })
+
+    it("keeps the queue intact on a network error and retries later", async () => {
+        let reachable = false
+        const send = sender(() => reachable ? { error: null } : { error: { message: "TypeError: Failed to fetch" } })
+        queue.registerWriteSender("posts.update", send)
+
+        online = false
+        await queue.submitWrite("posts.update", "p1", { title: "a" })
+        await queue.submitWrite("posts.update", "p2", { title: "b" })
+        online = true
+
+        await queue.flush()
+        expect(send).toHaveBeenCalledTimes(1)
+        expect(queue.pendingWriteCount()).toBe(2)
+
+        reachable = true
+        await queue.flush()
+        expect(send).toHaveBeenCalledTimes(3)
+        expect(queue.pendingWriteCount()).toBe(0)
+    })
+
+    it("drops a write the server rejects, reports it and goes on", async () => {
+        const rejection = { message: "new row violates row-level security policy", code: "42501" }
+        const send = sender(target => target === "p1" ? { error: rejection } : { error: null })
+        const dropped = vi.fn()
+        queue.registerWriteSender("posts.update", send)
+        queue.onWriteDropped(dropped)
+
+        online = false
+        await queue.submitWrite("posts.update", "p1", { title: "a" })
+        await queue.submitWrite("posts.update", "p2", { title: "b" })
+        online = true
+
+        await queue.flush()
+        expect(send).toHaveBeenCalledTimes(2)
+        expect(queue.pendingWriteCount()).toBe(0)
+        expect(dropped).toHaveBeenCalledOnce()
+        expect(dropped).toHaveBeenCalledWith(expect.objectContaining({ kind: "posts.update", target: "p1" }), rejection)
+    })
+})
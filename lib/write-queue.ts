@@ -0,0 +1,295 @@
+import { coalescePatch, type PatchOp } from './worklog-patch'
+
+// Client-side write-ahead queue for edits made while the network is down.
+//
+// A write goes straight to Supabase as before. If that fails because the network is
+// unreachable (or the row already has queued writes, to keep them in order), it is stored
+// in IndexedDB instead and replayed in order once the connection returns. Consecutive
+// queued writes to the same row merge into one: field updates by column, worklog patches
+// by path.
+//
+// Every tab shares the one IndexedDB queue. Reading and changing it, and each replayed send,
+// happen under a Web Lock after re-reading the store, so two tabs never replay the same write
+// and each sees the other's queued writes. A BroadcastChannel tells the other tabs to refresh
+// their pending count.
+
+export type WriteKind = 'worklogs.update' | 'worklogs.patch' | 'posts.update'
+
+export interface QueuedWrite {
+    seq?: number // IndexedDB key, assigned when first stored
+    kind: WriteKind
+    target: string // row id
+    // Column map for *.update, PatchOp[] for worklogs.patch
+    payload: any
+    queuedAt: number
+}
+
+export type WriteSender = (target: string, payload: any) => Promise<{ error: any }>
+
+const DB_NAME = 'mcr-write-queue'
+const STORE_NAME = 'writes'
+const LOCK_NAME = 'mcr-write-queue'
+const FLUSH_DELAY_MS = 1000
+const MAX_RETRY_DELAY_MS = 60 * 1000
+
+const senders = new Map<WriteKind, WriteSender>()
+const listeners = new Set<(count: number) => void>()
+const dropListeners = new Set<(write: QueuedWrite, error: any) => void>()
+// Mirror of the IndexedDB store in seq order, re-read under the lock before it is used
+let pending: QueuedWrite[] = []
+let inFlight: QueuedWrite | null = null
+let flushing = false
+let channel: BroadcastChannel | null = null
+let loaded: Promise<void> | null = null
+let flushTimer: ReturnType<typeof setTimeout> | null = null
+let retryDelay = FLUSH_DELAY_MS
+
+// Each kind's sender is registered by the store that owns the table
+export function registerWriteSender(kind: WriteKind, sender: WriteSender) {
+    senders.set(kind, sender)
+    if (typeof window === 'undefined') return
+    // Writes left over from an earlier session go out as soon as their sender exists
+    load().then(() => {
+        if (pending.some(w => w.kind === kind)) scheduleFlush(0)
+    })
+}
+
+export function pendingWriteCount(): number {
+    return pending.length
+}
+
+export function onPendingWritesChange(listener: (count: number) => void): () => void {
+    listeners.add(listener)
+    return () => {
+        listeners.delete(listener)
+    }
+}
+
+// Called when the server rejects a replayed write (RLS, row deleted, validation) and it is
+// dropped. The editor already showed it as saved, so the UI has to tell the user.
+export function onWriteDropped(listener: (write: QueuedWrite, error: any) => void): () => void {
+    dropListeners.add(listener)
+    return () => {
+        dropListeners.delete(listener)
+    }
+}
+
+// Sends a write now, or queues it if the network is down or the row has writes queued.
+// A queued write resolves with `queued: true` and no error.
+export async function submitWrite(kind: WriteKind, target: string, payload: any): Promise<{ error: any, queued?: boolean }> {
+    await load()
+    const sender = senders.get(kind)
+    if (!sender) throw new Error(`No sender registered for ${kind}`)
+
+    const hasQueued = isOnline() && await withLock(async () => {
+        await refresh()
+        return pending.some(w => sameRow(w, kind, target))
+    })
+    if (!isOnline() || hasQueued) {
+        await enqueue(kind, target, payload)
+        return { error: null, queued: true }
+    }
+
+    const result = await send(sender, target, payload)
+    if (result.error && isNetworkError(result.error)) {
+        await enqueue(kind, target, payload)
+        return { error: null, queued: true }
+    }
+    return result
+}
+
+export function isNetworkError(error: any): boolean {
+    if (!isOnline()) return true
+    const message = String(error?.message ?? error ?? '')
+    return /failed to fetch|networkerror|network request failed|load failed/i.test(message)
+}
+
+function isOnline(): boolean {
+    return typeof navigator === 'undefined' || navigator.onLine !== false
+}
+
+function sameRow(write: QueuedWrite, kind: WriteKind, target: string): boolean {
+    return write.target === target && write.kind.split('.')[0] === kind.split('.')[0]
+}
+
+async function send(sender: WriteSender, target: string, payload: any): Promise<{ error: any }> {
+    try {
+        return await sender(target, payload)
+    } catch (error) {
+        return { error }
+    }
+}
+
+function merge(kind: WriteKind, earlier: any, later: any): any {
+    return kind === 'worklogs.patch'
+        ? coalescePatch([...(earlier as PatchOp[]), ...(later as PatchOp[])])
+        : { ...earlier, ...later }
+}
+
+async function enqueue(kind: WriteKind, target: string, payload: any) {
+    await withLock(async () => {
+        await refresh()
+        // Only the row's latest write can absorb this one; merging further back would reorder
+        // it past writes of another kind. A write already being sent is left alone.
+        const last = [...pending].reverse().find(w => sameRow(w, kind, target))
+        if (last && last.kind === kind && !isInFlight(last)) {
+            last.payload = merge(kind, last.payload, payload)
+            last.queuedAt = Date.now()
+            if (last.seq !== undefined) await persist(store => store.put(last))
+        } else {
+            const write: QueuedWrite = { kind, target, payload, queuedAt: Date.now() }
+            pending.push(write)
+            const seq = await persist(store => store.add(write))
+            if (seq !== undefined) write.seq = seq as number
+        }
+    })
+    changed()
+    scheduleFlush(FLUSH_DELAY_MS)
+}
+
+function isInFlight(write: QueuedWrite): boolean {
+    return write === inFlight || (write.seq !== undefined && write.seq === inFlight?.seq)
+}
+
+function scheduleFlush(delay: number) {
+    if (flushTimer) clearTimeout(flushTimer)
+    flushTimer = setTimeout(() => {
+        flushTimer = null
+        flush()
+    }, delay)
+}
+
+type FlushStep = 'done' | 'retry' | { write: QueuedWrite, error: any }
+
+// Replays queued writes oldest first. Stops at a network failure and retries with backoff;
+// a write the server rejects is dropped so it can't block the rest of the queue.
+// Each write is re-read and sent under the lock, so a write another tab already sent (and
+// deleted) is never sent again.
+export async function flush() {
+    await load()
+    if (flushing) return
+    flushing = true
+    try {
+        while (true) {
+            const step = await withLock<FlushStep>(async () => {
+                await refresh()
+                const write = pending[0]
+                if (!write) return 'done'
+                const sender = senders.get(write.kind)
+                if (!sender) return 'done' // its store hasn't loaded yet; registerWriteSender flushes
+
+                inFlight = write
+                const { error } = await send(sender, write.target, write.payload)
+                inFlight = null
+
+                if (error && isNetworkError(error)) return 'retry'
+
+                pending = pending.filter(w => w !== write && (write.seq === undefined || w.seq !== write.seq))
+                if (write.seq !== undefined) await persist(store => store.delete(write.seq!))
+                return { write, error }
+            })
+
+            if (step === 'done') break
+            if (step === 'retry') {
+                scheduleFlush(retryDelay)
+                retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY_MS)
+                return
+            }
+            changed()
+            if (step.error) {
+                console.error(`Dropping queued ${step.write.kind} for ${step.write.target}:`, step.error)
+                dropListeners.forEach(listener => listener(step.write, step.error))
+            }
+        }
+        retryDelay = FLUSH_DELAY_MS
+    } finally {
+        flushing = false
+    }
+}
+
+function notify() {
+    listeners.forEach(listener => listener(pending.length))
+}
+
+// Tell this tab's listeners and the other tabs that the queue changed
+function changed() {
+    notify()
+    channel?.postMessage('changed')
+}
+
+// Runs `task` while holding the queue lock shared by all tabs. Without Web Locks (old
+// browsers, tests) only this tab's own flushes are serialized, through `flushing`.
+function withLock<T>(task: () => Promise<T>): Promise<T> {
+    if (typeof navigator === 'undefined' || !navigator.locks) return task()
+    return navigator.locks.request(LOCK_NAME, task) as Promise<T>
+}
+
+// Re-reads the queue from IndexedDB; call while holding the lock. A memory-only queue is
+// already current.
+async function refresh() {
+    const database = await openDb()
+    if (database) pending = await readAll(database)
+}
+
+// --- IndexedDB -------------------------------------------------------------
+
+let db: Promise<IDBDatabase | null> | null = null
+
+function openDb(): Promise<IDBDatabase | null> {
+    if (typeof indexedDB === 'undefined') return Promise.resolve(null)
+    db ??= new Promise(resolve => {
+        const request = indexedDB.open(DB_NAME, 1)
+        request.onupgradeneeded = () => {
+            request.result.createObjectStore(STORE_NAME, { keyPath: 'seq', autoIncrement: true })
+        }
+        request.onsuccess = () => resolve(request.result)
+        request.onerror = () => {
+            // Private mode and the like: keep the queue in memory only
+            console.error('Write queue storage unavailable:', request.error)
+            resolve(null)
+        }
+    })
+    return db
+}
+
+async function persist(operation: (store: IDBObjectStore) => IDBRequest): Promise<IDBValidKey | undefined> {
+    const database = await openDb()
+    if (!database) return undefined
+    return new Promise((resolve, reject) => {
+        const request = operation(database.transaction(STORE_NAME, 'readwrite').objectStore(STORE_NAME))
+        request.onsuccess = () => resolve(request.result as IDBValidKey)
+        request.onerror = () => reject(request.error)
+    })
+}
+
+function readAll(database: IDBDatabase): Promise<QueuedWrite[]> {
+    return new Promise((resolve, reject) => {
+        const request = database.transaction(STORE_NAME, 'readonly').objectStore(STORE_NAME).getAll()
+        request.onsuccess = () => resolve(request.result)
+        request.onerror = () => reject(request.error)
+    })
+}
+
+function load(): Promise<void> {
+    loaded ??= (async () => {
+        await withLock(refresh)
+        if (typeof window !== 'undefined') {
+            window.addEventListener('online', () => {
+                retryDelay = FLUSH_DELAY_MS
+                scheduleFlush(0)
+            })
+            if (typeof BroadcastChannel !== 'undefined') {
+                channel = new BroadcastChannel(DB_NAME)
+                channel.onmessage = async () => {
+                    await withLock(refresh)
+                    notify()
+                }
+            }
+        }
+        if (pending.length > 0) {
+            notify()
+            scheduleFlush(0)
+        }
+    })()
+    return loaded
+}
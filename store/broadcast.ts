@@ -1,5 +1,6 @@
 import { create } from 'zustand'
 import { supabase } from '@/lib/supabase'
+import type { RowChange } from '@/lib/realtime'
 
 // 중계 상태 타입
 export type BroadcastStatus = 'scheduled' | 'standby' | 'live' | 'completed' | 'issue'
@@ -48,6 +49,8 @@ export interface DailySummary {
 interface BroadcastStore {
     schedules: BroadcastSchedule[]
     loading: boolean
+    // Date the loaded list is limited to, if any; Realtime rows for other dates are ignored
+    scheduleDate: string | null
     fetchSchedules: (date?: string) => Promise<void>
     addSchedule: (schedule: Omit<BroadcastSchedule, 'id' | 'created_at'>) => Promise<BroadcastSchedule | null>
     updateSchedule: (id: string, updates: Partial<BroadcastSchedule>) => Promise<{ error: any }>
@@ -55,14 +58,17 @@ interface BroadcastStore {
     updateStatus: (id: string, status: BroadcastStatus) => Promise<{ error: any }>
     markCompleted: (id: string) => Promise<{ error: any }>
     getDailySummaries: () => DailySummary[]
+    // Applies a batch of Realtime change events (see hooks/use-realtime-sync.ts)
+    applyRemoteSchedules: (changes: RowChange<BroadcastSchedule>[]) => void
 }
 
 export const useBroadcastStore = create<BroadcastStore>((set, get) => ({
     schedules: [],
     loading: false,
+    scheduleDate: null,
 
     fetchSchedules: async (date?: string) => {
-        set({ loading: true })
+        set({ loading: true, scheduleDate: date || null })
 
         let query = supabase
             .from('broadcast_schedules')
@@ -191,6 +197,24 @@ export const useBroadcastStore = create<BroadcastStore>((set, get) => ({
         return { error: null }
     },
 
+    applyRemoteSchedules: (changes) => {
+        set(state => {
+            const byId = new Map(state.schedules.map(s => [s.id, s]))
+            for (const { type, row } of changes) {
+                if (type === 'DELETE' || (state.scheduleDate && row.date !== state.scheduleDate)) {
+                    byId.delete(row.id)
+                } else {
+                    byId.set(row.id, { ...byId.get(row.id), ...row })
+                }
+            }
+            // Same order as fetchSchedules: date desc, time asc
+            const schedules = Array.from(byId.values()).sort((a, b) =>
+                a.date !== b.date ? b.date.localeCompare(a.date) : (a.time || '').localeCompare(b.time || '')
+            )
+            return { schedules }
+        })
+    },
+
     getDailySummaries: () => {
         const { schedules } = get()
         const groupedByDate = new Map<string, BroadcastSchedule[]>()
@@ -1,5 +1,7 @@
 import { create } from 'zustand'
 import { supabase } from '../lib/supabase'
+import { registerWriteSender, submitWrite } from '../lib/write-queue'
+import type { RowChange } from '../lib/realtime'
 
 export interface Category {
     id: string
@@ -69,10 +71,33 @@ export interface Comment {
     }
 }
 
+// Post edits made while offline are queued and replayed through this (lib/write-queue.ts)
+registerWriteSender('posts.update', async (id, updates) =>
+    supabase.from('posts').update(updates).eq('id', id)
+)
+
+const POST_SELECT = `
+    *,
+    author:users!posts_author_user_id_fkey(name),
+    category:categories(name, slug),
+    worklog:worklogs(id, work_date:date, type, group:groups(id, name)),
+    comments(count)
+`
+
+// Map author_user_id to author_id for the frontend
+function toPost(row: any): Post {
+    return {
+        ...row,
+        author_id: row.author_user_id || row.author_id, // Fallback to existing author_id if available
+    }
+}
+
 interface PostStore {
     posts: Post[]
     categories: Category[]
     loading: boolean
+    // Whether the loaded list was filtered; new posts from Realtime only join an unfiltered list
+    filtered: boolean
     fetchCategories: () => Promise<void>
     fetchPosts: (filters?: { categoryId?: string, priority?: string, search?: string, tag?: string }) => Promise<void>
     addPost: (post: Partial<Post>) => Promise<Post>
@@ -83,12 +108,15 @@ interface PostStore {
     addComment: (comment: Partial<Comment>) => Promise<void>
     updateComment: (id: string, updates: Partial<Comment>) => Promise<void>
     deleteComment: (id: string) => Promise<void>
+    // Applies a batch of Realtime change events (see hooks/use-realtime-sync.ts)
+    applyRemotePosts: (changes: RowChange[]) => Promise<void>
 }
 
 export const usePostStore = create<PostStore>((set, get) => ({
     posts: [],
     categories: [],
     loading: false,
+    filtered: false,
 
     fetchCategories: async () => {
         const { data, error } = await supabase
@@ -106,16 +134,10 @@ export const usePostStore = create<PostStore>((set, get) => ({
     },
 
     fetchPosts: async (filters) => {
-        set({ loading: true })
+        set({ loading: true, filtered: Boolean(filters?.categoryId || filters?.priority || filters?.search || filters?.tag) })
         let query = supabase
             .from('posts')
-            .select(`
-                *,
-                author:users!posts_author_user_id_fkey(name),
-                category:categories(name, slug),
-                worklog:worklogs(id, work_date:date, type, group:groups(id, name)),
-                comments(count)
-            `)
+            .select(POST_SELECT)
             .order('created_at', { ascending: false })
 
         if (filters?.categoryId) {
@@ -139,11 +161,7 @@ export const usePostStore = create<PostStore>((set, get) => ({
             return
         }
 
-        // Map author_user_id to author_id for the frontend
-        const mappedPosts = data.map((post: any) => ({
-            ...post,
-            author_id: post.author_user_id || post.author_id, // Fallback to existing author_id if available
-        }))
+        const mappedPosts = data.map(toPost)
 
         set({ posts: mappedPosts as any, loading: false })
 
@@ -200,31 +218,35 @@ export const usePostStore = create<PostStore>((set, get) => ({
     },
 
     updatePost: async (id, updates) => {
-        const { error } = await supabase
-            .from('posts')
-            .update(updates)
-            .eq('id', id)
+        const { error, queued } = await submitWrite('posts.update', id, updates)
 
         if (error) {
             console.error('Error updating post:', error)
             throw error
         }
 
-        get().fetchPosts()
+        if (queued) {
+            // Refetching would show the old row until the queue is replayed
+            set(state => ({ posts: state.posts.map(p => p.id === id ? { ...p, ...updates } : p) }))
+        } else {
+            get().fetchPosts()
+        }
     },
 
     resolvePost: async (id, note) => {
-        const { error } = await supabase
-            .from('posts')
-            .update({ status: 'resolved', resolution_note: note })
-            .eq('id', id)
+        const updates: Partial<Post> = { status: 'resolved', resolution_note: note }
+        const { error, queued } = await submitWrite('posts.update', id, updates)
 
         if (error) {
             console.error('Error resolving post:', error)
             throw error
         }
 
-        get().fetchPosts()
+        if (queued) {
+            set(state => ({ posts: state.posts.map(p => p.id === id ? { ...p, ...updates } : p) }))
+        } else {
+            get().fetchPosts()
+        }
     },
 
     deletePost: async (id) => {
@@ -303,5 +325,45 @@ export const usePostStore = create<PostStore>((set, get) => ({
             console.error('Error deleting comment:', error)
             throw error
         }
+    },
+
+    applyRemotePosts: async (changes) => {
+        const removed = new Set(changes.filter(c => c.type === 'DELETE').map(c => c.row.id))
+        const loaded = new Map(get().posts.map(p => [p.id, p]))
+        const merged = new Map<string, any>()
+        const refetch: string[] = []
+        for (const { type, row } of changes) {
+            if (type === 'DELETE') continue
+            const existing = loaded.get(row.id)
+            if (existing && existing.category_id === row.category_id && existing.worklog_id === row.worklog_id) {
+                // Same joins: the event row has everything that changed
+                merged.set(row.id, row)
+            } else if (existing || !get().filtered) {
+                // New post or a changed join (category, worklog): read it with its embeds
+                refetch.push(row.id)
+            }
+        }
+
+        let fetched: Post[] = []
+        if (refetch.length > 0) {
+            const { data, error } = await supabase
+                .from('posts')
+                .select(POST_SELECT)
+                .in('id', refetch)
+
+            if (error) console.error('Error fetching changed posts:', error)
+            else fetched = data.map(toPost)
+        }
+
+        set(state => {
+            const posts = state.posts
+                .filter(p => !removed.has(p.id))
+                .map(p => merged.has(p.id) ? { ...p, ...toPost(merged.get(p.id)) } : p)
+                .map(p => fetched.find(f => f.id === p.id) ?? p)
+            const added = fetched.filter(f => !posts.some(p => p.id === f.id))
+            return {
+                posts: [...added, ...posts].sort((a, b) => b.created_at.localeCompare(a.created_at))
+            }
+        })
     }
 }))
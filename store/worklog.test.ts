@@ -0,0 +1,109 @@
+import { describe, it, expect, vi, beforeEach } from "vitest"
+
+// Every query resolves to the next queued response; calls are recorded per query
+const { responses, queries } = vi.hoisted(() => ({
+    responses: [] as { data: any, error: any }[],
+    queries: [] as string[][],
+}))
+
+vi.mock("../lib/supabase", () => {
+    const query = () => {
+        const calls: string[] = []
+        queries.push(calls)
+        const builder: any = new Proxy({}, {
+            get: (_, method: string) => {
+                if (method === "then") {
+                    const response = responses.shift() ?? { data: [], error: null }
+                    return (resolve: any, reject: any) => Promise.resolve(response).then(resolve, reject)
+                }
+                return (...args: any[]) => {
+                    calls.push(`${method}(${args.map(a => JSON.stringify(a)).join(",")})`)
+                    return builder
+                }
+            },
+        })
+        return builder
+    }
+    return { supabase: { from: query, rpc: query } }
+})
+vi.mock("../app/statistics/actions", () => ({ invalidateStatistics: vi.fn() }))
+
+import { selectImportantWorklogs, useWorklogStore, type Worklog } from "./worklog"
+
+const row = (id: string, date: string, type: "주간" | "야간" = "주간"): Worklog => ({
+    id,
+    date,
+    groupName: "1조",
+    type,
+    workers: { director: [], assistant: [], video: [] },
+    status: "작성중",
+    signature: "0/4",
+    isImportant: false,
+})
+
+describe("fetchMoreWorklogs", () => {
+    beforeEach(() => {
+        responses.length = 0
+        queries.length = 0
+        const worklogs = [row("a", "2026-10-02"), row("b", "2026-10-01")]
+        useWorklogStore.setState({
+            worklogs,
+            worklogCursor: { date: "2026-10-01", type: "주간", id: "b" },
+            hasMoreWorklogs: true,
+            loadingMoreWorklogs: false,
+            loadedThroughDate: null,
+        })
+    })
+
+    it("loads down to a date and records how far it reached", async () => {
+        responses.push({ data: [{ id: "c", date: "2026-09-20", type: "야간" }], error: null })
+
+        await useWorklogStore.getState().fetchMoreWorklogs("2026-09-15")
+
+        const state = useWorklogStore.getState()
+        expect(state.worklogs.map(w => w.id)).toEqual(["a", "b", "c"])
+        expect(state.worklogCursor).toEqual({ date: "2026-09-20", type: "야간", id: "c" })
+        expect(state.loadedThroughDate).toBe("2026-09-15")
+        expect(queries[0]).toContain('gte("date","2026-09-15")')
+    })
+
+    it("keeps the list and cursor for a date with no rows", async () => {
+        const before = useWorklogStore.getState()
+        responses.push({ data: [], error: null })
+
+        await useWorklogStore.getState().fetchMoreWorklogs("2026-09-15")
+
+        const state = useWorklogStore.getState()
+        expect(state.worklogs).toBe(before.worklogs)
+        expect(state.worklogCursor).toBe(before.worklogCursor)
+        expect(state.hasMoreWorklogs).toBe(true)
+        expect(state.loadingMoreWorklogs).toBe(false)
+        expect(state.loadedThroughDate).toBe("2026-09-15")
+    })
+
+    it("stops paging once a page comes back empty", async () => {
+        responses.push({ data: [], error: null })
+
+        await useWorklogStore.getState().fetchMoreWorklogs()
+
+        const state = useWorklogStore.getState()
+        expect(state.worklogs.map(w => w.id)).toEqual(["a", "b"])
+        expect(state.worklogCursor).toBeNull()
+        expect(state.hasMoreWorklogs).toBe(false)
+    })
+})
+
+describe("selectImportantWorklogs", () => {
+    it("keeps important logs older than the loaded window and lets loaded rows win", () => {
+        const old = { ...row("old", "2025-03-01"), isImportant: true }
+        const unstarred = { ...row("u", "2026-09-30"), isImportant: true }
+        const worklogs = [
+            { ...row("a", "2026-10-02"), isImportant: true },
+            row("b", "2026-10-01"),
+            { ...unstarred, isImportant: false },
+        ]
+
+        expect(selectImportantWorklogs({ worklogs, importantWorklogs: [unstarred, old] }).map(w => w.id))
+            .toEqual(["a", "old"])
+    })
+})
@@ -1,6 +1,10 @@
 
 import { create } from 'zustand'
 import { supabase } from '../lib/supabase'
+import { invalidateStatistics } from '../app/statistics/actions'
+import { applyPatch, PATCH_COLUMNS, type PatchOp } from '../lib/worklog-patch'
+import { registerWriteSender, submitWrite } from '../lib/write-queue'
+import type { RowChange } from '../lib/realtime'
 
 // Channel timecode entry (운행표 수정)
 export interface ChannelTimecodeEntry {
@@ -58,13 +62,174 @@ export interface Worklog {
     maxPriority?: '긴급' | '중요' | '일반' | null
 }
 
+// The list is ordered newest first: date desc, then type (야간 < 주간), then id to break
+// ties between groups. Pages are fetched by keyset on that order, so loading the next page
+// costs the same however many worklogs exist.
+export const WORKLOG_PAGE_SIZE = 60
+
+const LIST_COLUMNS = `
+    id, date, group_name, type, workers, status, signatures,
+    is_important, ai_summary, updated_at
+`
+
+// updated_at is stamped when a transaction starts, so a row can commit with a timestamp a
+// little behind the watermark. Delta syncs re-read this much history; merging is idempotent.
+const SYNC_OVERLAP_MS = 30 * 1000
+
+// Latest updated_at among `rows`, or `current` if none is newer
+function latestUpdate(rows: { updated_at?: string | null }[], current: string | null): string | null {
+    let latest = current
+    for (const row of rows) {
+        if (row.updated_at && (!latest || Date.parse(row.updated_at) > Date.parse(latest))) latest = row.updated_at
+    }
+    return latest
+}
+
+export interface WorklogListKey {
+    date: string
+    type: string
+    id: string
+}
+
+function listKey(log: Pick<Worklog, 'date' | 'type' | 'id'>): WorklogListKey {
+    return { date: log.date, type: log.type, id: String(log.id) }
+}
+
+// Negative if `a` comes before `b` in the list
+function compareListKey(a: WorklogListKey, b: WorklogListKey): number {
+    if (a.date !== b.date) return a.date > b.date ? -1 : 1
+    if (a.type !== b.type) return a.type < b.type ? -1 : 1
+    if (a.id !== b.id) return a.id < b.id ? -1 : 1
+    return 0
+}
+
+// PostgREST or=(...) filter for rows after `cursor` in list order
+function afterCursor({ date, type, id }: WorklogListKey): string {
+    return `date.lt.${date},and(date.eq.${date},type.gt.${type}),and(date.eq.${date},type.eq.${type},id.gt.${id})`
+}
+
+function listQuery() {
+    return supabase
+        .from('worklogs')
+        .select(LIST_COLUMNS)
+        .is('deleted_at', null)
+        .order('date', { ascending: false })
+        .order('type', { ascending: true })
+        .order('id', { ascending: true })
+}
+
+function toListWorklog(log: any): Worklog {
+    const sigCount = Object.values(log.signatures || {}).filter((sig: any) => sig !== null).length
+    return {
+        id: log.id,
+        date: log.date,
+        groupName: log.group_name,
+        type: log.type,
+        workers: log.workers,
+        status: log.status,
+        signature: `${sigCount}/4`,
+        signatures: log.signatures,
+        isImportant: log.is_important,
+        aiSummary: log.ai_summary,
+        // channelLogs and systemIssues will be loaded lazily
+    }
+}
+
+// Channel logs feed the statistics page; drop the worklog's day from its server cache
+async function invalidateWorklogStatistics(id: string) {
+    let date = useWorklogStore.getState().worklogs.find(w => String(w.id) === id)?.date
+    if (!date) {
+        const { data } = await supabase.from('worklogs').select('date').eq('id', id).maybeSingle()
+        date = data?.date
+    }
+    if (date) await invalidateStatistics([date])
+}
+
+// Edits that can't reach the server are queued and replayed through these (lib/write-queue.ts).
+// Direct sends and replays both pass through, so the statistics cache is invalidated either way.
+registerWriteSender('worklogs.update', async (id, dbUpdates) => {
+    const { error } = await supabase.from('worklogs').update(dbUpdates).eq('id', id)
+    if (!error && dbUpdates.channel_logs) {
+        invalidateWorklogStatistics(id).catch(err => console.error('Error invalidating statistics:', err))
+    }
+    return { error }
+})
+registerWriteSender('worklogs.patch', async (id, ops: PatchOp[]) => {
+    const { data: found, error } = await supabase.rpc('patch_worklog', { p_id: id, p_ops: ops })
+    if (!error && found && ops.some(op => op.path[0] === PATCH_COLUMNS.channelLogs)) {
+        invalidateWorklogStatistics(id).catch(err => console.error('Error invalidating statistics:', err))
+    }
+    return { error: error || (found ? null : { message: 'worklog not found' }) }
+})
+
+// Loaded list with changed rows merged in and removed ids dropped. A changed row that isn't
+// loaded yet only joins if it falls inside the loaded window; older ones arrive with
+// fetchMoreWorklogs.
+function mergeChangedRows(
+    worklogs: Worklog[],
+    cursor: WorklogListKey | null,
+    changed: Worklog[],
+    removedIds: string[]
+): Worklog[] {
+    const byId = new Map(worklogs.map(w => [String(w.id), w]))
+    for (const id of removedIds) byId.delete(id)
+    for (const fresh of changed) {
+        const id = String(fresh.id)
+        const existing = byId.get(id)
+        if (existing) {
+            // Keep lazily loaded fields (channelLogs, systemIssues) the change doesn't carry
+            byId.set(id, { ...existing, ...fresh })
+        } else if (!cursor || compareListKey(listKey(fresh), cursor) <= 0) {
+            byId.set(id, fresh)
+        }
+    }
+    return Array.from(byId.values()).sort((a, b) => compareListKey(listKey(a), listKey(b)))
+}
+
+// Important worklogs shown on the dashboard, newest first. Fetched on their own because the
+// loaded list only covers the newest pages; rows of the list override fetched copies.
+export const IMPORTANT_WORKLOG_LIMIT = 5
+
+export function selectImportantWorklogs(state: { worklogs: Worklog[], importantWorklogs: Worklog[] }): Worklog[] {
+    const byId = new Map(state.importantWorklogs.map(w => [String(w.id), w]))
+    for (const log of state.worklogs) byId.set(String(log.id), log)
+    return Array.from(byId.values())
+        .filter(w => w.isImportant)
+        .sort((a, b) => compareListKey(listKey(a), listKey(b)))
+        .slice(0, IMPORTANT_WORKLOG_LIMIT)
+}
+
 interface WorklogStore {
     worklogs: Worklog[]
+    // See selectImportantWorklogs
+    importantWorklogs: Worklog[]
     lastFetchTime: number | null
-    fetchWorklogs: () => Promise<void>
+    // Keyset position of the oldest loaded list page, null once everything is loaded
+    worklogCursor: WorklogListKey | null
+    hasMoreWorklogs: boolean
+    loadingMoreWorklogs: boolean
+    // Every worklog on or after this date is loaded (set by fetchMoreWorklogs(throughDate)),
+    // so a date filter at or after it needs no further loading
+    loadedThroughDate: string | null
+    // Latest updated_at merged into the list; delta syncs ask for rows changed after it
+    syncWatermark: string | null
+    // (Re)loads the newest page of the list. Once loaded, an expired cache is refreshed with
+    // syncWorklogs; forceRefresh reloads the page.
+    fetchWorklogs: (forceRefresh?: boolean) => Promise<void>
+    // Merges rows changed since syncWatermark (including soft deletes) into the loaded list
+    syncWorklogs: () => Promise<void>
+    // Applies a batch of Realtime change events (see hooks/use-realtime-sync.ts)
+    applyRemoteWorklogs: (changes: RowChange[]) => void
+    // Appends the next older page, or everything down to `throughDate`
+    fetchMoreWorklogs: (throughDate?: string) => Promise<void>
+    fetchImportantWorklogs: () => Promise<void>
     fetchWorklogById: (id: string) => Promise<Worklog | null>
     addWorklog: (worklog: Omit<Worklog, 'id'>) => Promise<Worklog | { error: any } | null>
-    updateWorklog: (id: string | number, updates: Partial<Worklog>) => Promise<{ error: any, conflict?: boolean }>
+    // `queued` means the network was down and the write will be replayed later
+    updateWorklog: (id: string | number, updates: Partial<Worklog>) => Promise<{ error: any, conflict?: boolean, queued?: boolean }>
+    // Applies field-level changes to the JSON columns (see lib/worklog-patch.ts) instead of
+    // rewriting them
+    patchWorklog: (id: string | number, ops: PatchOp[]) => Promise<{ error: any, queued?: boolean }>
     deleteWorklog: (id: string | number) => Promise<{ error: any | null }>
     softDeleteWorklog: (id: string | number, userId?: string) => Promise<{ error: any | null }>
     restoreWorklog: (id: string | number) => Promise<{ error: any | null }>
@@ -74,7 +239,13 @@ interface WorklogStore {
 
 export const useWorklogStore = create<WorklogStore>((set, get) => ({
     worklogs: [],
+    importantWorklogs: [],
     lastFetchTime: null,
+    worklogCursor: null,
+    hasMoreWorklogs: false,
+    loadingMoreWorklogs: false,
+    loadedThroughDate: null,
+    syncWatermark: null,
     fetchWorklogs: async (forceRefresh = false) => {
         const now = Date.now()
         const lastFetch = get().lastFetchTime
@@ -86,16 +257,10 @@ export const useWorklogStore = create<WorklogStore>((set, get) => ({
             return
         }
 
+        if (!forceRefresh && get().syncWatermark) return get().syncWorklogs()
+
         console.log('Fetching fresh worklogs')
-        const { data, error } = await supabase
-            .from('worklogs')
-            .select(`
-                id, date, group_name, type, workers, status, signatures,
-                is_important, ai_summary
-            `)
-            .is('deleted_at', null)
-            .order('date', { ascending: false })
-            .order('type', { ascending: true })
+        const { data, error } = await listQuery().limit(WORKLOG_PAGE_SIZE + 1)
 
         if (error) {
             console.error('Error fetching worklogs:', JSON.stringify(error, null, 2))
@@ -106,24 +271,126 @@ export const useWorklogStore = create<WorklogStore>((set, get) => ({
 
         console.log('Worklogs fetched:', data?.length || 0)
 
-        const formattedWorklogs: Worklog[] = data.map((log: any) => {
-            const sigCount = Object.values(log.signatures || {}).filter((sig: any) => sig !== null).length
+        const hasMore = data.length > WORKLOG_PAGE_SIZE
+        const page: Worklog[] = data.slice(0, WORKLOG_PAGE_SIZE).map(toListWorklog)
+        const pageCursor = page.length > 0 ? listKey(page[page.length - 1]) : null
+        const pageWatermark = latestUpdate(data, null)
+
+        set(state => {
+            if (!hasMore || !pageCursor) {
+                return { worklogs: page, worklogCursor: null, hasMoreWorklogs: false, loadedThroughDate: null, syncWatermark: pageWatermark, lastFetchTime: now }
+            }
+            // Only the first page is refreshed; older pages already loaded stay in the window.
+            // They were last synced at the old watermark, so the watermark can't move past it.
+            const older = state.worklogs.filter(w => compareListKey(listKey(w), pageCursor) > 0)
+            const cursor = state.worklogCursor && compareListKey(state.worklogCursor, pageCursor) > 0
+                ? state.worklogCursor
+                : pageCursor
+            const keepOld = older.length > 0 && state.syncWatermark &&
+                (!pageWatermark || Date.parse(state.syncWatermark) < Date.parse(pageWatermark))
+            const watermark = keepOld ? state.syncWatermark : pageWatermark
+            return { worklogs: [...page, ...older], worklogCursor: cursor, hasMoreWorklogs: true, syncWatermark: watermark, lastFetchTime: now }
+        })
+    },
+    syncWorklogs: async () => {
+        const { syncWatermark } = get()
+        if (!syncWatermark) return get().fetchWorklogs(true)
+
+        const since = new Date(Date.parse(syncWatermark) - SYNC_OVERLAP_MS).toISOString()
+        const { data, error } = await supabase
+            .from('worklogs')
+            .select(`${LIST_COLUMNS}, deleted_at`)
+            .gte('updated_at', since)
+            .order('updated_at', { ascending: true })
+
+        if (error) {
+            console.error('Error syncing worklogs:', error)
+            return
+        }
+
+        console.log('Worklogs changed since last sync:', data.length)
+
+        const rows = data as any[]
+        set(state => ({
+            worklogs: mergeChangedRows(
+                state.worklogs,
+                state.worklogCursor,
+                rows.filter(row => !row.deleted_at).map(toListWorklog),
+                rows.filter(row => row.deleted_at).map(row => String(row.id))
+            ),
+            syncWatermark: latestUpdate(rows, state.syncWatermark),
+            lastFetchTime: Date.now()
+        }))
+    },
+    applyRemoteWorklogs: (changes) => {
+        const removed = changes
+            .filter(c => c.type === 'DELETE' || c.row.deleted_at)
+            .map(c => String(c.row.id))
+        const changed = changes
+            .filter(c => c.type !== 'DELETE' && !c.row.deleted_at)
+            .map(c => ({
+                ...toListWorklog(c.row),
+                isAutoCreated: c.row.is_auto_created || false,
+                // Events carry the whole row, so the lazily loaded fields come up to date too
+                ...(c.row.channel_logs !== undefined ? parseChannelData(c.row) : {})
+            }))
+        set(state => ({ worklogs: mergeChangedRows(state.worklogs, state.worklogCursor, changed, removed) }))
+    },
+    fetchMoreWorklogs: async (throughDate?: string) => {
+        const { worklogCursor: cursor, loadingMoreWorklogs } = get()
+        if (!cursor || loadingMoreWorklogs) return
+
+        set({ loadingMoreWorklogs: true })
+        let query = listQuery().or(afterCursor(cursor))
+        // With a date, load everything down to that date in one request (e.g. a date filter
+        // older than the window); otherwise one page.
+        query = throughDate ? query.gte('date', throughDate) : query.limit(WORKLOG_PAGE_SIZE + 1)
+        const { data, error } = await query
+
+        if (error) {
+            console.error('Error fetching more worklogs:', error)
+            set({ loadingMoreWorklogs: false })
+            return
+        }
+
+        const hasMore = throughDate ? true : data.length > WORKLOG_PAGE_SIZE
+        const page: Worklog[] = (throughDate ? data : data.slice(0, WORKLOG_PAGE_SIZE)).map(toListWorklog)
+        const through = get().loadedThroughDate
+        const reached = throughDate
+            ? { loadedThroughDate: through && through < throughDate ? through : throughDate }
+            : {}
+
+        // Nothing older in range: keep the list (and its reference) as it is
+        if (page.length === 0) {
+            set(hasMore
+                ? { ...reached, loadingMoreWorklogs: false }
+                : { worklogCursor: null, hasMoreWorklogs: false, loadingMoreWorklogs: false })
+            return
+        }
+
+        set(state => {
+            const loaded = new Set(state.worklogs.map(w => String(w.id)))
+            const worklogs = [...state.worklogs, ...page.filter(w => !loaded.has(String(w.id)))]
+                .sort((a, b) => compareListKey(listKey(a), listKey(b)))
             return {
-                id: log.id,
-                date: log.date,
-                groupName: log.group_name,
-                type: log.type,
-                workers: log.workers,
-                status: log.status,
-                signature: `${sigCount}/4`,
-                signatures: log.signatures,
-                isImportant: log.is_important,
-                aiSummary: log.ai_summary,
-                // channelLogs and systemIssues will be loaded lazily
+                worklogs,
+                worklogCursor: hasMore ? listKey(page[page.length - 1]) : null,
+                hasMoreWorklogs: hasMore,
+                loadingMoreWorklogs: false,
+                ...reached
             }
         })
+    },
+    fetchImportantWorklogs: async () => {
+        const { data, error } = await listQuery()
+            .eq('is_important', true)
+            .limit(IMPORTANT_WORKLOG_LIMIT)
 
-        set({ worklogs: formattedWorklogs, lastFetchTime: now })
+        if (error) {
+            console.error('Error fetching important worklogs:', error)
+            return
+        }
+        set({ importantWorklogs: data.map(toListWorklog) })
     },
     addWorklog: async (worklog) => {
         // 1. Get group_id
@@ -227,8 +494,9 @@ export const useWorklogStore = create<WorklogStore>((set, get) => ({
             return null
         }
         const createdLog = data[0]
+        if (worklog.channelLogs) invalidateStatistics([createdLog.date]).catch(err => console.error('Error invalidating statistics:', err))
 
-        get().fetchWorklogs()
+        get().syncWorklogs()
 
         const signatures = createdLog.signatures || { operation: null, mcr: null, team_leader: null, network: null }
         const sigCount = Object.values(signatures).filter(Boolean).length
@@ -310,9 +578,10 @@ export const useWorklogStore = create<WorklogStore>((set, get) => ({
             )
         }))
 
-        const dbUpdates: any = {
-            status: updates.status,
-        }
+        const dbUpdates: any = {}
+
+        // Only fields that are set: a queued write merges into earlier ones by column
+        if (updates.status) dbUpdates.status = updates.status
 
         // NOTE: New columns (channel_timecode, channel_posts, system_issues) will be added after migration.
         // For now, only write to channel_logs for backward compatibility.
@@ -324,10 +593,7 @@ export const useWorklogStore = create<WorklogStore>((set, get) => ({
         if (updates.isAutoCreated !== undefined) dbUpdates.is_auto_created = updates.isAutoCreated
         if (updates.systemIssues) dbUpdates.system_issues = updates.systemIssues
 
-        const { error } = await supabase
-            .from('worklogs')
-            .update(dbUpdates)
-            .eq('id', id)
+        const { error, queued } = await submitWrite('worklogs.update', String(id), dbUpdates)
 
         if (error) {
             // Suppress error logging for duplicate key constraint (collision handled in UI)
@@ -336,7 +602,34 @@ export const useWorklogStore = create<WorklogStore>((set, get) => ({
             }
             return { error }
         }
-        return { error: null }
+        return { error: null, queued }
+    },
+
+    patchWorklog: async (id, ops) => {
+        if (ops.length === 0) return { error: null }
+
+        // Optimistic update of the fields the store already holds
+        set(state => ({
+            worklogs: state.worklogs.map(w => {
+                if (String(w.id) !== String(id)) return w
+                const patched = { ...w }
+                for (const [field, column] of Object.entries(PATCH_COLUMNS) as [keyof typeof PATCH_COLUMNS, string][]) {
+                    const fieldOps = ops.filter(op => op.path[0] === column).map(op => ({ ...op, path: op.path.slice(1) }))
+                    if (fieldOps.length > 0 && patched[field] !== undefined) {
+                        patched[field] = applyPatch(patched[field], fieldOps) as any
+                    }
+                }
+                return patched
+            })
+        }))
+
+        const { error, queued } = await submitWrite('worklogs.patch', String(id), ops)
+
+        if (error) {
+            console.error('Error patching worklog:', error)
+            return { error }
+        }
+        return { error: null, queued }
     },
 
     fetchWorklogPosts: async (worklogId: string) => {
@@ -409,7 +702,7 @@ export const useWorklogStore = create<WorklogStore>((set, get) => ({
         }
 
         // Refresh worklogs to include restored item
-        get().fetchWorklogs()
+        get().syncWorklogs()
 
         return { error: null }
     }
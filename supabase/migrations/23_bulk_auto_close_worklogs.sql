@@ -0,0 +1,48 @@
+-- =====================================================
+-- 근무일지 일괄 자동 마감 (check-worklog cron)
+-- =====================================================
+-- 마감 시간이 지난 근무일지를 한 번의 UPDATE로 종료하고, 종료한 id를 돌려줍니다.
+-- 운영 서명이 비어 있으면 operation/leader 서명을 'System Auto-Close'로 채우고,
+-- system_issues에는 사전 결재 여부에 따라 안내 문구를 하나 추가합니다.
+
+CREATE OR REPLACE FUNCTION public.auto_close_worklogs(
+    p_date DATE,
+    p_type TEXT,
+    p_summary TEXT,
+    p_presigned_summary TEXT
+)
+RETURNS TABLE (id UUID)
+SECURITY DEFINER
+SET search_path = public
+LANGUAGE sql
+AS $$
+    WITH stale AS (
+        SELECT w.id,
+               COALESCE(w.signatures, '{}'::jsonb) AS signatures,
+               COALESCE(w.signatures->>'operation', '') <> '' AS is_pre_signed
+        FROM public.worklogs w
+        WHERE w.date = p_date
+          AND w.type = p_type
+          AND w.status NOT IN ('서명완료', '근무종료')
+        FOR UPDATE
+    )
+    UPDATE public.worklogs w
+    SET status = '근무종료',
+        signature = '4/4',
+        signatures = CASE
+            WHEN s.is_pre_signed THEN s.signatures
+            ELSE s.signatures || jsonb_build_object('operation', 'System Auto-Close', 'leader', 'System Auto-Close')
+        END,
+        system_issues = COALESCE(w.system_issues, '[]'::jsonb) || jsonb_build_array(jsonb_build_object(
+            'id', gen_random_uuid(),
+            'summary', CASE WHEN s.is_pre_signed THEN p_presigned_summary ELSE p_summary END
+        ))
+    FROM stale s
+    WHERE w.id = s.id
+    RETURNING w.id;
+$$;
+
+-- cron은 service role로만 호출합니다
+REVOKE EXECUTE ON FUNCTION public.auto_close_worklogs(DATE, TEXT, TEXT, TEXT) FROM PUBLIC, anon, authenticated;
+
+CREATE INDEX IF NOT EXISTS idx_worklogs_date_type_status ON public.worklogs(date, type, status);
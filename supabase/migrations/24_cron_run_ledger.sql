@@ -0,0 +1,75 @@
+-- =====================================================
+-- cron 실행 기록 · 워터마크 · 잠금
+-- =====================================================
+-- cron_runs: 작업(job)별 실행 기록. status = 'running'인 행은 작업당 하나뿐이라
+--   동시에 호출된 cron은 cron_begin_run에서 NULL을 받고 바로 종료합니다.
+-- cron_watermarks: 작업이 어디까지 처리했는지 (예: check-worklog / auto_close:주간 → 2025-01-31).
+--   다음 실행은 워터마크 이후에 새로 도래한 일만 처리합니다.
+
+CREATE TABLE IF NOT EXISTS public.cron_runs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'succeeded', 'failed', 'abandoned')),
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    result JSONB,
+    error TEXT
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_cron_runs_one_running ON public.cron_runs(job) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_cron_runs_job_started_at ON public.cron_runs(job, started_at DESC);
+
+CREATE TABLE IF NOT EXISTS public.cron_watermarks (
+    job TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    run_id UUID REFERENCES public.cron_runs(id) ON DELETE SET NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (job, key)
+);
+
+CREATE TRIGGER update_cron_watermarks_updated_at BEFORE UPDATE ON public.cron_watermarks
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- service role만 사용합니다 (RLS 활성화 + 정책 없음)
+ALTER TABLE public.cron_runs ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.cron_watermarks ENABLE ROW LEVEL SECURITY;
+
+-- 잠금 획득: 실행 중인 run이 없으면 새 run을 만들고 id를 반환, 있으면 NULL.
+-- p_lease보다 오래 'running'인 run은 중단된 것으로 보고 'abandoned' 처리합니다.
+CREATE OR REPLACE FUNCTION public.cron_begin_run(p_job TEXT, p_lease INTERVAL DEFAULT INTERVAL '5 minutes')
+RETURNS UUID
+SECURITY DEFINER
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_run_id UUID;
+BEGIN
+    UPDATE public.cron_runs
+    SET status = 'abandoned', finished_at = NOW()
+    WHERE job = p_job AND status = 'running' AND started_at < NOW() - p_lease;
+
+    INSERT INTO public.cron_runs (job)
+    VALUES (p_job)
+    ON CONFLICT (job) WHERE status = 'running' DO NOTHING
+    RETURNING id INTO v_run_id;
+
+    RETURN v_run_id;
+END;
+$$;
+
+-- 잠금 해제: run을 succeeded / failed로 마치고 결과를 남깁니다.
+CREATE OR REPLACE FUNCTION public.cron_finish_run(p_run_id UUID, p_status TEXT, p_result JSONB DEFAULT NULL, p_error TEXT DEFAULT NULL)
+RETURNS VOID
+SECURITY DEFINER
+SET search_path = public
+LANGUAGE sql
+AS $$
+    UPDATE public.cron_runs
+    SET status = p_status, finished_at = NOW(), result = p_result, error = p_error
+    WHERE id = p_run_id AND status = 'running';
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.cron_begin_run(TEXT, INTERVAL) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.cron_finish_run(UUID, TEXT, JSONB, TEXT) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,85 @@
+-- =====================================================
+-- 채널별 일간 수정 건수 집계 (통계 페이지)
+-- =====================================================
+-- worklogs.channel_logs의 채널별 timecodes 개수를 (날짜, 채널) 단위로 미리 합산해 둡니다.
+-- 통계 페이지는 channel_logs 전체 대신 이 표만 읽으므로, 조회 비용이 일수 × 채널 수에 비례합니다.
+-- worklogs가 바뀌면 트리거가 해당 날짜만 다시 계산합니다.
+
+CREATE TABLE IF NOT EXISTS public.worklog_channel_daily_stats (
+    date DATE NOT NULL,
+    channel TEXT NOT NULL,
+    modifications INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (date, channel)
+);
+
+ALTER TABLE public.worklog_channel_daily_stats ENABLE ROW LEVEL SECURITY;
+
+-- 모든 인증된 사용자가 조회 가능 (쓰기는 트리거만)
+CREATE POLICY "Enable read access for authenticated users"
+ON public.worklog_channel_daily_stats FOR SELECT
+TO authenticated
+USING (true);
+
+-- 하루치 집계를 worklogs에서 다시 계산
+CREATE OR REPLACE FUNCTION public.refresh_worklog_channel_daily_stats(p_date DATE)
+RETURNS VOID
+SECURITY DEFINER
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM public.worklog_channel_daily_stats WHERE date = p_date;
+
+    INSERT INTO public.worklog_channel_daily_stats (date, channel, modifications)
+    SELECT p_date, c.key, SUM(
+        CASE jsonb_typeof(c.value->'timecodes')
+            WHEN 'object' THEN (SELECT COUNT(*) FROM jsonb_object_keys(c.value->'timecodes'))
+            WHEN 'array' THEN jsonb_array_length(c.value->'timecodes')
+            ELSE 0
+        END
+    ) AS modifications
+    FROM public.worklogs w
+    CROSS JOIN LATERAL jsonb_each(
+        CASE WHEN jsonb_typeof(w.channel_logs) = 'object' THEN w.channel_logs ELSE '{}'::jsonb END
+    ) AS c
+    WHERE w.date = p_date
+      AND jsonb_typeof(c.value) = 'object'
+    GROUP BY c.key
+    HAVING SUM(
+        CASE jsonb_typeof(c.value->'timecodes')
+            WHEN 'object' THEN (SELECT COUNT(*) FROM jsonb_object_keys(c.value->'timecodes'))
+            WHEN 'array' THEN jsonb_array_length(c.value->'timecodes')
+            ELSE 0
+        END
+    ) > 0;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.handle_worklog_channel_stats()
+RETURNS TRIGGER
+SECURITY DEFINER
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.refresh_worklog_channel_daily_stats(OLD.date);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.date IS DISTINCT FROM OLD.date) THEN
+        PERFORM public.refresh_worklog_channel_daily_stats(NEW.date);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS on_worklog_channel_logs_changed ON public.worklogs;
+
+CREATE TRIGGER on_worklog_channel_logs_changed
+    AFTER INSERT OR DELETE OR UPDATE OF channel_logs, date ON public.worklogs
+    FOR EACH ROW
+    EXECUTE FUNCTION public.handle_worklog_channel_stats();
+
+-- 기존 데이터 채우기
+SELECT public.refresh_worklog_channel_daily_stats(d.date)
+FROM (SELECT DISTINCT date FROM public.worklogs) AS d;
@@ -0,0 +1,10 @@
+-- =====================================================
+-- 업무일지 목록 keyset 페이지네이션 인덱스
+-- =====================================================
+-- 목록은 (date DESC, type, id) 순서로 한 페이지씩 읽습니다 (store/worklog.ts fetchWorklogs).
+-- 삭제되지 않은 행만 담은 부분 인덱스라, 다음 페이지 조회도 커서 위치에서 바로 시작하고
+-- 일지가 몇 년치 쌓여도 비용이 페이지 크기에만 비례합니다.
+
+CREATE INDEX IF NOT EXISTS idx_worklogs_list_keyset
+ON public.worklogs (date DESC, type, id)
+WHERE deleted_at IS NULL;
@@ -0,0 +1,9 @@
+-- =====================================================
+-- 업무일지 변경분 동기화 인덱스
+-- =====================================================
+-- 업무일지 스토어는 마지막 동기화 이후 updated_at이 바뀐 행만 다시 읽습니다
+-- (store/worklog.ts syncWorklogs). 소프트 삭제도 updated_at을 갱신하므로 deleted_at으로
+-- 거르지 않는 전체 인덱스입니다.
+
+CREATE INDEX IF NOT EXISTS idx_worklogs_updated_at
+ON public.worklogs (updated_at);
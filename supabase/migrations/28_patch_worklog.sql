@@ -0,0 +1,99 @@
+-- =====================================================
+-- 업무일지 부분 저장 (worklog-detail 자동 저장)
+-- =====================================================
+-- 자동 저장은 마지막으로 저장된 상태와 비교해 바뀐 항목만 보냅니다 (lib/worklog-patch.ts).
+-- p_ops: [{"op": "set" | "remove", "path": ["channel_logs", "MBC ON", "timecodes", "3"], "value": ...}]
+-- path의 첫 항목은 컬럼(channel_logs, workers, system_issues), 나머지는 그 안의 객체 키입니다.
+-- 운행표 하나를 고쳐도 channel_logs 전체 대신 그 항목만 전송·기록됩니다.
+-- RLS가 그대로 적용되도록 호출한 사용자 권한으로 실행합니다.
+
+-- p_doc의 p_path 위치에 p_value를 쓰거나(set) 지웁니다(remove). set은 없는 상위 객체를 만듭니다.
+CREATE OR REPLACE FUNCTION public.jsonb_patch_path(p_doc JSONB, p_path TEXT[], p_op TEXT, p_value JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+IMMUTABLE
+SET search_path = public
+AS $$
+DECLARE
+    depth INTEGER := COALESCE(array_length(p_path, 1), 0);
+BEGIN
+    IF depth = 0 THEN
+        RETURN CASE WHEN p_op = 'set' THEN p_value ELSE NULL END;
+    END IF;
+    IF p_op = 'remove' THEN
+        RETURN p_doc #- p_path;
+    END IF;
+    IF jsonb_typeof(p_doc) IS DISTINCT FROM 'object' THEN
+        p_doc := '{}'::jsonb;
+    END IF;
+    FOR i IN 1..depth - 1 LOOP
+        IF jsonb_typeof(p_doc #> p_path[1:i]) IS DISTINCT FROM 'object' THEN
+            p_doc := jsonb_set(p_doc, p_path[1:i], '{}'::jsonb, true);
+        END IF;
+    END LOOP;
+    RETURN jsonb_set(p_doc, p_path, p_value, true);
+END;
+$$;
+
+-- 삭제되지 않은 업무일지에 p_ops를 순서대로 적용합니다. 없으면 FALSE.
+CREATE OR REPLACE FUNCTION public.patch_worklog(p_id UUID, p_ops JSONB)
+RETURNS BOOLEAN
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_channel_logs JSONB;
+    v_workers JSONB;
+    v_system_issues JSONB;
+    v_op JSONB;
+    v_column TEXT;
+    v_path TEXT[];
+    v_touched TEXT[] := '{}';
+BEGIN
+    SELECT channel_logs, workers, system_issues
+    INTO v_channel_logs, v_workers, v_system_issues
+    FROM public.worklogs
+    WHERE id = p_id AND deleted_at IS NULL
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN FALSE;
+    END IF;
+
+    FOR v_op IN SELECT value FROM jsonb_array_elements(p_ops) LOOP
+        v_column := v_op->'path'->>0;
+        v_path := ARRAY(
+            SELECT p.key
+            FROM jsonb_array_elements_text(v_op->'path') WITH ORDINALITY AS p(key, n)
+            WHERE p.n > 1
+            ORDER BY p.n
+        );
+
+        CASE v_column
+            WHEN 'channel_logs' THEN
+                v_channel_logs := public.jsonb_patch_path(v_channel_logs, v_path, v_op->>'op', v_op->'value');
+            WHEN 'workers' THEN
+                v_workers := public.jsonb_patch_path(v_workers, v_path, v_op->>'op', v_op->'value');
+            WHEN 'system_issues' THEN
+                v_system_issues := public.jsonb_patch_path(v_system_issues, v_path, v_op->>'op', v_op->'value');
+            ELSE
+                RAISE EXCEPTION 'patch_worklog: % is not a patchable column', v_column;
+        END CASE;
+        v_touched := array_append(v_touched, v_column);
+    END LOOP;
+
+    -- channel_logs는 통계 트리거(25_worklog_channel_daily_stats.sql)가 걸려 있어 바뀔 때만 씁니다
+    IF 'workers' = ANY(v_touched) OR 'system_issues' = ANY(v_touched) THEN
+        UPDATE public.worklogs
+        SET workers = v_workers, system_issues = v_system_issues
+        WHERE id = p_id;
+    END IF;
+    IF 'channel_logs' = ANY(v_touched) THEN
+        UPDATE public.worklogs
+        SET channel_logs = v_channel_logs
+        WHERE id = p_id;
+    END IF;
+
+    RETURN TRUE;
+END;
+$$;
@@ -0,0 +1,21 @@
+-- =====================================================
+-- Realtime 변경 이벤트 발행 (worklogs, posts, broadcast_schedules)
+-- =====================================================
+-- 클라이언트는 세 테이블의 행 변경 이벤트를 받아 스토어에 바로 반영합니다
+-- (hooks/use-realtime-sync.ts). 다른 세션의 수정·서명이 다시 조회하지 않아도 보입니다.
+-- 이벤트도 RLS를 따르므로 읽을 수 있는 행의 변경만 전달됩니다.
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['worklogs', 'posts', 'broadcast_schedules'] LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = t
+        ) THEN
+            EXECUTE format('ALTER PUBLICATION supabase_realtime ADD TABLE public.%I', t);
+        END IF;
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,62 @@
+-- =====================================================
+-- 근무조 편성 일괄 반영 (근무 패턴 마법사 3단계)
+-- =====================================================
+-- p_assignments: {"1조": [user_id, ...], "2조": [...], "Unassigned": [...]} (배열 순서 = display_order)
+-- 편성표 전체를 한 번의 호출·한 트랜잭션으로 group_members에 반영합니다.
+-- * 편성된 사용자는 지정된 조 외의 모든 조에서 빠지고, 지정된 조에 추가되거나 순서가 갱신됩니다.
+-- * Unassigned의 사용자는 모든 조에서 빠집니다.
+-- * groups에 없는 조 이름의 사용자는 건드리지 않습니다.
+-- * 다른 조로 옮겨도 기존 role은 유지됩니다.
+-- 반환: {"assigned": 편성 인원, "removed": 삭제된 소속 수, "written": 추가·순서 변경된 소속 수}
+
+CREATE OR REPLACE FUNCTION public.assign_group_members(p_assignments JSONB)
+RETURNS JSONB
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_users UUID[];
+    v_groups UUID[];
+    v_orders INTEGER[];
+    v_roles TEXT[];
+    v_removed INTEGER;
+    v_written INTEGER;
+BEGIN
+    SELECT
+        array_agg(m.user_id::uuid ORDER BY t.team, m.n),
+        array_agg(g.id ORDER BY t.team, m.n),
+        array_agg(m.n::integer ORDER BY t.team, m.n),
+        array_agg((
+            SELECT gm.role FROM public.group_members gm
+            WHERE gm.user_id = m.user_id::uuid
+            ORDER BY gm.group_id IS NOT DISTINCT FROM g.id DESC
+            LIMIT 1
+        ) ORDER BY t.team, m.n)
+    INTO v_users, v_groups, v_orders, v_roles
+    FROM jsonb_each(p_assignments) AS t(team, members)
+    CROSS JOIN LATERAL jsonb_array_elements_text(t.members) WITH ORDINALITY AS m(user_id, n)
+    LEFT JOIN public.groups g ON g.name = t.team
+    WHERE t.team = 'Unassigned' OR g.id IS NOT NULL;
+
+    DELETE FROM public.group_members gm
+    USING unnest(v_users, v_groups) AS r(user_id, group_id)
+    WHERE gm.user_id = r.user_id
+      AND gm.group_id IS DISTINCT FROM r.group_id;
+    GET DIAGNOSTICS v_removed = ROW_COUNT;
+
+    INSERT INTO public.group_members (group_id, user_id, display_order, role)
+    SELECT r.group_id, r.user_id, r.display_order, COALESCE(r.role, '영상')
+    FROM unnest(v_users, v_groups, v_orders, v_roles) AS r(user_id, group_id, display_order, role)
+    WHERE r.group_id IS NOT NULL
+    ON CONFLICT (group_id, user_id) DO UPDATE
+        SET display_order = EXCLUDED.display_order
+        WHERE public.group_members.display_order IS DISTINCT FROM EXCLUDED.display_order;
+    GET DIAGNOSTICS v_written = ROW_COUNT;
+
+    RETURN jsonb_build_object(
+        'assigned', (SELECT COUNT(*) FROM unnest(v_groups) AS g(id) WHERE g.id IS NOT NULL),
+        'removed', v_removed,
+        'written', v_written
+    );
+END;
+$$;
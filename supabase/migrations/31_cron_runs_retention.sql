@@ -0,0 +1,26 @@
+-- =====================================================
+-- cron 실행 기록 보관 기간 (24_cron_run_ledger.sql)
+-- =====================================================
+-- 매 분 실행되는 작업은 1년에 약 50만 건의 cron_runs를 남기므로, run을 마칠 때
+-- 같은 작업의 오래된 기록을 함께 지웁니다.
+-- * 성공·중단(succeeded, abandoned): 7일 보관
+-- * 실패(failed): 30일 보관
+-- 워터마크가 가리키던 run이 지워지면 run_id는 NULL이 됩니다 (ON DELETE SET NULL).
+
+CREATE OR REPLACE FUNCTION public.cron_finish_run(p_run_id UUID, p_status TEXT, p_result JSONB DEFAULT NULL, p_error TEXT DEFAULT NULL)
+RETURNS VOID
+SECURITY DEFINER
+SET search_path = public
+LANGUAGE sql
+AS $$
+    UPDATE public.cron_runs
+    SET status = p_status, finished_at = NOW(), result = p_result, error = p_error
+    WHERE id = p_run_id AND status = 'running';
+
+    DELETE FROM public.cron_runs
+    WHERE job = (SELECT job FROM public.cron_runs WHERE id = p_run_id)
+      AND status <> 'running'
+      AND started_at < NOW() - CASE WHEN status = 'failed' THEN INTERVAL '30 days' ELSE INTERVAL '7 days' END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.cron_finish_run(UUID, TEXT, JSONB, TEXT) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,47 @@
+-- =====================================================
+-- 채널별 일간 집계 갱신 직렬화 (25_worklog_channel_daily_stats.sql)
+-- =====================================================
+-- 같은 날짜의 업무일지(주간·야간, 또는 두 탭의 자동 저장)를 동시에 고치면 두 트랜잭션이
+-- 모두 DELETE 후 같은 (date, channel)을 INSERT하다 한쪽이 23505로 실패하고,
+-- AFTER 트리거 안이라 업무일지 저장까지 롤백됐습니다.
+-- 날짜별 트랜잭션 advisory lock으로 같은 날짜의 재계산을 한 번에 하나씩 실행합니다.
+-- 뒤에 들어온 쪽은 앞 트랜잭션이 커밋된 뒤의 worklogs로 다시 계산합니다.
+-- ON CONFLICT는 잠금과 별개로 집계 때문에 저장이 실패하지 않도록 남겨 둡니다.
+
+CREATE OR REPLACE FUNCTION public.refresh_worklog_channel_daily_stats(p_date DATE)
+RETURNS VOID
+SECURITY DEFINER
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('worklog_channel_daily_stats:' || p_date));
+
+    DELETE FROM public.worklog_channel_daily_stats WHERE date = p_date;
+
+    INSERT INTO public.worklog_channel_daily_stats (date, channel, modifications)
+    SELECT p_date, c.key, SUM(
+        CASE jsonb_typeof(c.value->'timecodes')
+            WHEN 'object' THEN (SELECT COUNT(*) FROM jsonb_object_keys(c.value->'timecodes'))
+            WHEN 'array' THEN jsonb_array_length(c.value->'timecodes')
+            ELSE 0
+        END
+    ) AS modifications
+    FROM public.worklogs w
+    CROSS JOIN LATERAL jsonb_each(
+        CASE WHEN jsonb_typeof(w.channel_logs) = 'object' THEN w.channel_logs ELSE '{}'::jsonb END
+    ) AS c
+    WHERE w.date = p_date
+      AND jsonb_typeof(c.value) = 'object'
+    GROUP BY c.key
+    HAVING SUM(
+        CASE jsonb_typeof(c.value->'timecodes')
+            WHEN 'object' THEN (SELECT COUNT(*) FROM jsonb_object_keys(c.value->'timecodes'))
+            WHEN 'array' THEN jsonb_array_length(c.value->'timecodes')
+            ELSE 0
+        END
+    ) > 0
+    ON CONFLICT (date, channel) DO UPDATE
+        SET modifications = EXCLUDED.modifications, updated_at = NOW();
+END;
+$$;
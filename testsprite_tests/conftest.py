@@ -0,0 +1,115 @@
+"""pytest collection for the generated TC*.py scripts.
+
+    python -m pytest testsprite_tests -q
+    python -m pytest testsprite_tests -k TC004 --headed
+
+Each script becomes one test item. All items in a pytest process share one
+Chromium (see harness/browser.py); each still gets its own BrowserContext.
+"""
+
+import pytest
+
+from harness.cases import Case
+from harness.results import record_durations, write_metrics, write_queries, write_results
+from harness.runner import CaseResult, Worker
+from harness.supabase_local import LocalSupabase
+
+_worker_key = pytest.StashKey[Worker]()
+_runs_key = pytest.StashKey[list[tuple[str, Case, CaseResult]]]()
+_supabase_key = pytest.StashKey[LocalSupabase]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("testsprite")
+    group.addoption("--headed", action="store_true", default=False, help="run Chromium with a window")
+    group.addoption(
+        "--local-supabase",
+        action="store_true",
+        default=False,
+        help="serve a fresh harness.supabase_local for the session",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[_runs_key] = []
+    if config.getoption("local_supabase", False):
+        config.stash[_supabase_key] = LocalSupabase().start()
+        config.stash[_supabase_key].export_credentials()
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    local = config.stash.get(_supabase_key, None)
+    if local is not None:
+        local.stop()
+
+
+def pytest_collect_file(file_path, parent):
+    if Case.from_path(file_path) is not None:
+        return TCFile.from_parent(parent, path=file_path)
+    return None
+
+
+class CaseFailure(Exception):
+    def __init__(self, result: CaseResult) -> None:
+        super().__init__(result.error)
+        self.result = result
+
+
+class TCFile(pytest.File):
+    def collect(self):
+        case = Case.from_path(self.path)
+        yield TCItem.from_parent(self, name=case.name, case=case)
+
+
+class TCItem(pytest.Item):
+    def __init__(self, *, case: Case, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.case = case
+
+    def runtest(self) -> None:
+        config = self.config
+        if _worker_key not in config.stash:
+            config.stash[_worker_key] = Worker(headless=not config.getoption("headed"))
+        result = config.stash[_worker_key].run(self.case)
+        self.user_properties.append(("wall_time", result.duration))
+        config.stash[_runs_key].append((self.nodeid, self.case, result))
+        if not result.passed:
+            raise CaseFailure(result)
+
+    def repr_failure(self, excinfo, style=None):
+        if isinstance(excinfo.value, CaseFailure):
+            return excinfo.value.result.error or "failed"
+        return super().repr_failure(excinfo, style)
+
+    def reportinfo(self):
+        return self.path, 0, self.case.title
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    worker = session.config.stash.get(_worker_key, None)
+    if worker is not None:
+        worker.close()
+    runs = session.config.stash.get(_runs_key, [])
+    if runs:
+        # Same artifacts as `python -m harness`, so either mode feeds the shard planner.
+        record_durations(result for _, _, result in runs)
+        write_results([case for _, case, _ in runs], [result for _, _, result in runs])
+        write_metrics(result for _, _, result in runs)
+        write_queries(result for _, _, result in runs)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config: pytest.Config) -> None:
+    runs = config.stash.get(_runs_key, [])
+    if not runs:
+        return
+    terminalreporter.section("case wall time")
+    for nodeid, _, result in sorted(runs, key=lambda run: run[2].duration, reverse=True):
+        terminalreporter.write_line(f"{result.duration:8.2f}s  {result.status.lower():<7}  {nodeid}")
+    terminalreporter.write_line(f"{sum(run[2].duration for run in runs):8.2f}s  total")
+    flagged = [(nodeid, result) for nodeid, _, result in runs if result.queries.get("findings")]
+    if flagged:
+        terminalreporter.section("supabase queries")
+        for nodeid, result in flagged:
+            terminalreporter.write_line(f"{nodeid} ({result.queries['total']} requests)")
+            for finding in result.queries["findings"]:
+                terminalreporter.write_line(f"    {finding}")
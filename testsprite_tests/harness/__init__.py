@@ -0,0 +1 @@
+"""Runner harness for the generated TestSprite Playwright scripts."""
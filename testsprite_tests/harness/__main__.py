@@ -0,0 +1,63 @@
+"""Command-line entry point for the process-pool mode.
+
+    cd testsprite_tests
+    python -m harness -n 4
+    python -m harness -n 2 TC004 TC005 --headed
+    python -m harness --local-supabase   # app started against harness.supabase_local
+"""
+
+import argparse
+import os
+import sys
+
+from .cases import discover_cases
+from .results import load_durations, record_durations, write_metrics, write_queries, write_results
+from .runner import Worker
+from .shard import run_parallel
+from .supabase_local import LocalSupabase
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness", description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="case ids (TC004) or file stems; default: all")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--headed", action="store_true", help="run Chromium with a window")
+    parser.add_argument("--local-supabase", action="store_true", help="serve a fresh harness.supabase_local for the run")
+    args = parser.parse_args(argv)
+
+    cases = discover_cases(select=args.cases)
+    if not cases:
+        parser.error("no matching cases")
+
+    local = LocalSupabase().start() if args.local_supabase else None
+    try:
+        if local:
+            # Spawned workers inherit os.environ, so they see the fixture accounts too.
+            local.export_credentials()
+        # Log each role in once here rather than once per worker process.
+        worker = Worker(headless=not args.headed)
+        try:
+            worker.bootstrap(cases)
+        finally:
+            worker.close()
+
+        results = run_parallel(cases, args.workers, load_durations(), headless=not args.headed)
+    finally:
+        if local:
+            local.stop()
+    record_durations(results)
+    write_results(cases, results)
+    write_metrics(results)
+    write_queries(results)
+
+    for result in sorted(results, key=lambda r: r.duration, reverse=True):
+        print(f"{result.duration:8.2f}s  {result.status:<7}  {result.name}")
+        for finding in result.queries.get("findings", []):
+            print(f"{'':19}{finding}")
+    failed = sum(not result.passed for result in results)
+    print(f"{len(results) - failed} passed, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Recorded responses for the app's Gemini and OpenWeather backed routes.
+
+``/api/ai-summary`` and ``/api/post-summary`` call Gemini (``ai-summary``
+retries 429s for up to ~30s), ``/api/weather`` calls OpenWeather. Under test
+they make a case as slow and as flaky as the upstream. :class:`ApiMocks` is a
+context hook that answers them with ``context.route`` from
+``harness/api_fixtures/<route>.json`` instead. Each fixture holds named
+variants: ``ok``, ``rate_limited`` (what the route returns once the upstream
+has answered 429) and optionally ``invalid``.
+
+Environment:
+
+* ``TESTSPRITE_API_MOCKS``: ``replay`` (default), ``record`` (let requests
+  through and save 2xx responses as the new ``ok`` variant) or ``off``.
+* ``TESTSPRITE_API_LATENCY_MS``: delay before each mocked response, either one
+  number for every route or per route: ``ai-summary=1500,weather=200``.
+* ``TESTSPRITE_API_RATE_LIMIT``: answer the first N calls of a route with its
+  ``rate_limited`` variant: ``post-summary=1,ai-summary=2``.
+
+New cases can pass scenarios directly::
+
+    mocks = ApiMocks({"post-summary": Scenario(rate_limited=1, latency_ms=800)})
+    await mocks.install(context)
+    ...
+    assert mocks.calls["post-summary"] == 2
+"""
+
+import asyncio
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import BrowserContext, Route
+
+FIXTURES_DIR = Path(__file__).with_name("api_fixtures")
+
+ROUTES = {
+    "ai-summary": "**/api/ai-summary",
+    "post-summary": "**/api/post-summary",
+    "weather": "**/api/weather",
+}
+MODES = ("replay", "record", "off")
+
+
+@dataclass
+class Scenario:
+    variant: str = "ok"
+    latency_ms: int = 0
+    rate_limited: int = 0
+
+
+def load_fixture(name: str) -> dict[str, Any]:
+    return json.loads((FIXTURES_DIR / f"{name}.json").read_text(encoding="utf-8"))
+
+
+def _record(name: str, status: int, body: Any) -> None:
+    path = FIXTURES_DIR / f"{name}.json"
+    fixture = load_fixture(name) if path.exists() else {}
+    fixture["ok"] = {"status": status, "body": body}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(fixture, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _per_route(value: str | None) -> dict[str, int]:
+    """``"800"`` -> every route; ``"weather=200,ai-summary=1500"`` -> those routes."""
+    if not value:
+        return {}
+    if "=" not in value:
+        return {name: int(value) for name in ROUTES}
+    pairs = (item.split("=", 1) for item in value.split(",") if item.strip())
+    return {name.strip(): int(n) for name, n in pairs}
+
+
+def scenarios_from_env() -> dict[str, Scenario]:
+    latency = _per_route(os.environ.get("TESTSPRITE_API_LATENCY_MS"))
+    rate_limited = _per_route(os.environ.get("TESTSPRITE_API_RATE_LIMIT"))
+    unknown = (set(latency) | set(rate_limited)) - set(ROUTES)
+    if unknown:
+        raise ValueError(f"unknown mocked routes {sorted(unknown)}; expected {sorted(ROUTES)}")
+    return {name: Scenario(latency_ms=latency.get(name, 0), rate_limited=rate_limited.get(name, 0)) for name in ROUTES}
+
+
+class ApiMocks:
+    def __init__(self, scenarios: dict[str, Scenario] | None = None, mode: str | None = None) -> None:
+        self.mode = mode or os.environ.get("TESTSPRITE_API_MOCKS") or "replay"
+        if self.mode not in MODES:
+            raise ValueError(f"TESTSPRITE_API_MOCKS must be one of {MODES}, not {self.mode!r}")
+        self.scenarios = {**scenarios_from_env(), **(scenarios or {})}
+        self.calls: Counter[str] = Counter()
+
+    async def install(self, context: BrowserContext) -> None:
+        if self.mode == "off":
+            return
+        for name, pattern in ROUTES.items():
+            await context.route(pattern, partial(self._handle, name))
+
+    async def _handle(self, name: str, route: Route) -> None:
+        self.calls[name] += 1
+        if self.mode == "record":
+            response = await route.fetch()
+            if response.ok:
+                _record(name, response.status, await response.json())
+            await route.fulfill(response=response)
+            return
+        scenario = self.scenarios.get(name, Scenario())
+        if scenario.latency_ms:
+            await asyncio.sleep(scenario.latency_ms / 1000)
+        variant = "rate_limited" if self.calls[name] <= scenario.rate_limited else scenario.variant
+        recorded = load_fixture(name)[variant]
+        await route.fulfill(status=recorded["status"], json=recorded["body"])
@@ -0,0 +1,275 @@
+"""Log in once per role and reuse the session in every case that needs it.
+
+Most scripts open with the same few steps: click 게스트/관리자 로그인, type an
+email and password, submit, close the dialog. That costs seconds of typing and
+a Supabase ``auth/v1/token`` round trip per case. Instead, each role in
+:data:`ROLES` is logged in once through the real UI, and the result is saved
+under ``tmp/auth/<role>.json`` until it expires. New contexts for a case get:
+
+* the saved Playwright storage state (cookies and localStorage, which holds the
+  Supabase session), and
+* an init script restoring sessionStorage, where ``store/auth.ts`` persists the
+  zustand ``auth-storage`` entry (storage state does not cover sessionStorage).
+
+The case's leading login steps are then dropped from the script. Cases in
+:data:`LOGIN_CASES` test the login flow itself and always use the form, as
+does any case whose role has no credentials configured
+(``TESTSPRITE_<ROLE>_EMAIL`` / ``TESTSPRITE_<ROLE>_PASSWORD``).
+"""
+
+import ast
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from playwright.async_api import BrowserContext, Page
+
+from .browser import SharedBrowser
+from .cases import BASE_URL, SUITE_DIR, Case
+from .locators import case_aliases, resolve
+
+logger = logging.getLogger(__name__)
+
+AUTH_DIR = SUITE_DIR / "tmp" / "auth"
+# Saved sessions are reused for at most this long, and never past the
+# Supabase access token's own expiry.
+STATE_TTL = 30 * 60
+EXPIRY_MARGIN = 60
+
+SUPABASE_TOKEN_KEY = re.compile(r"^sb-.+-auth-token$")
+RESTORE_SESSION_STORAGE = """
+(([origin, items]) => {
+  if (location.origin !== origin || sessionStorage.getItem('__harness_restored')) return
+  for (const [key, value] of Object.entries(items)) sessionStorage.setItem(key, value)
+  sessionStorage.setItem('__harness_restored', '1')
+})
+"""
+
+
+async def _login_with_modal(page: Page, email: str, password: str) -> None:
+    # Support-team accounts get a full login, others a (non-persisted) guest session.
+    await page.goto(BASE_URL)
+    await resolve(page, "sidebar.guest_login").click()
+    await resolve(page, "login_modal.email").fill(email)
+    await resolve(page, "login_modal.password").fill(password)
+    await resolve(page, "login_modal.submit").click()
+    await resolve(page, "login_modal.dialog").wait_for(state="hidden")
+
+
+async def _login_shift(page: Page, email: str, password: str) -> None:
+    await page.goto(f"{BASE_URL}/login")
+    await resolve(page, "login_page.email").fill(email)
+    await resolve(page, "login_page.password").fill(password)
+    await resolve(page, "login_page.submit").click()
+    await resolve(page, "login_page.shift_mode").click()
+    # handleStartSession confirm()s when no 감독 is assigned.
+    page.once("dialog", lambda dialog: asyncio.ensure_future(dialog.accept()))
+    await resolve(page, "login_page.start_session").click()
+    await page.wait_for_url("**/dashboard")
+
+
+LoginFlow = Callable[[Page, str, str], Awaitable[None]]
+
+# guest: the app keeps guestSession in memory only, so a saved guest state
+# carries the Supabase session but not the 5-minute guest UI state.
+ROLES: dict[str, LoginFlow] = {
+    "admin": _login_with_modal,
+    "shift": _login_shift,
+    "guest": _login_with_modal,
+}
+
+# Case ids whose subject is the login flow itself.
+LOGIN_CASES = {"TC001", "TC002", "TC003"}
+OAUTH_CASE = "TC004_Google_OAuth_login_integration"
+
+# Cases that edit or sign worklogs run as a shift worker; the rest as admin.
+CASE_ROLES = {
+    "TC004_Create_and_edit_worklog_with_auto_save_feature": "shift",
+    "TC005_Real_time_synchronization_of_worklog_edits_and_signatures": "shift",
+    "TC005_Worklog_tab_switching_and_URL_update": "shift",
+    "TC006_Automatic_and_manual_worklog_data_saving": "shift",
+}
+DEFAULT_ROLE = "admin"
+
+
+def role_for(case: Case) -> str | None:
+    if case.case_id in LOGIN_CASES or case.name == OAUTH_CASE:
+        return None
+    return CASE_ROLES.get(case.name, DEFAULT_ROLE)
+
+
+def credentials(role: str) -> tuple[str, str] | None:
+    email = os.environ.get(f"TESTSPRITE_{role.upper()}_EMAIL")
+    password = os.environ.get(f"TESTSPRITE_{role.upper()}_PASSWORD")
+    return (email, password) if email and password else None
+
+
+@dataclass
+class SavedState:
+    role: str
+    expires_at: float
+    storage_state: dict[str, Any]
+    session_storage: dict[str, Any]
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at - EXPIRY_MARGIN > time.time()
+
+    @classmethod
+    def load(cls, path: Path) -> "SavedState | None":
+        try:
+            return cls(**json.loads(path.read_text(encoding="utf-8")))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(self), ensure_ascii=False), encoding="utf-8")
+        # Atomic, so parallel workers never read a half-written file.
+        os.replace(tmp, path)
+
+    async def install(self, context: BrowserContext) -> None:
+        if self.session_storage:
+            arg = json.dumps([self.session_storage["origin"], self.session_storage["items"]])
+            await context.add_init_script(f"{RESTORE_SESSION_STORAGE}({arg})")
+
+
+def _token_expiry(storage_state: dict[str, Any]) -> float | None:
+    for origin in storage_state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            if SUPABASE_TOKEN_KEY.match(item["name"]):
+                try:
+                    return float(json.loads(item["value"])["expires_at"])
+                except (ValueError, KeyError, TypeError):
+                    return None
+    return None
+
+
+class AuthCache:
+    """Per-worker access to the saved sessions, logging in when one is stale."""
+
+    def __init__(self, shared: SharedBrowser, directory: Path = AUTH_DIR) -> None:
+        self._shared = shared
+        self._directory = directory
+        self._failed: set[str] = set()
+
+    async def state_for(self, role: str) -> SavedState | None:
+        creds = credentials(role)
+        if creds is None or role in self._failed:
+            return None
+        path = self._directory / f"{role}.json"
+        saved = SavedState.load(path)
+        if saved is not None and saved.fresh:
+            return saved
+        try:
+            saved = await self._login(role, *creds)
+        except Exception:
+            # Fall back to the script's own login steps for this role.
+            logger.warning("login bootstrap for role %r failed", role, exc_info=True)
+            self._failed.add(role)
+            return None
+        saved.save(path)
+        return saved
+
+    async def _login(self, role: str, email: str, password: str) -> SavedState:
+        context = await self._shared.new_context()
+        try:
+            page = await context.new_page()
+            await ROLES[role](page, email, password)
+            storage_state = await context.storage_state()
+            items = await page.evaluate("() => Object.fromEntries(Object.entries(sessionStorage))")
+            origin = await page.evaluate("() => location.origin")
+        finally:
+            await context.close()
+
+        expires_at = time.time() + STATE_TTL
+        token_expiry = _token_expiry(storage_state)
+        if token_expiry is not None:
+            expires_at = min(expires_at, token_expiry)
+        return SavedState(
+            role=role,
+            expires_at=expires_at,
+            storage_state=storage_state,
+            session_storage={"origin": origin, "items": items} if items else {},
+        )
+
+
+_LOGIN_KEYS = re.compile(r"^(login_modal\.|sidebar\.(guest_login|handover_login)$)")
+
+
+def _locator_selector(node: ast.stmt) -> str | None:
+    # `elem = frame.locator('<selector>').nth(0)` -> '<selector>'
+    if not (isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name) and node.targets[0].id == "elem"):
+        return None
+    for call in ast.walk(node.value):
+        if (
+            isinstance(call, ast.Call)
+            and isinstance(call.func, ast.Attribute)
+            and call.func.attr == "locator"
+            and call.args
+            and isinstance(call.args[0], ast.Constant)
+        ):
+            return call.args[0].value
+    return None
+
+
+def _assigns(node: ast.stmt, name: str) -> bool:
+    return isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == name for t in node.targets)
+
+
+def _strip_leading_login(body: list[ast.stmt], aliases: dict[str, str]) -> list[ast.stmt]:
+    start = next((i for i, node in enumerate(body) if _locator_selector(node) is not None), None)
+    if start is None:
+        return body
+    # Include the `frame = context.pages[-1]` that precedes the first step.
+    if start > 0 and _assigns(body[start - 1], "frame"):
+        start -= 1
+
+    end = start
+    while end < len(body):
+        node = body[end]
+        selector = _locator_selector(node)
+        if selector is not None:
+            if not _LOGIN_KEYS.match(aliases.get(selector, "")):
+                break
+        elif not _assigns(node, "frame") and not _is_step_action(node):
+            break
+        end += 1
+    # Keep a trailing `frame = ...` that belongs to the first kept step.
+    while end > start and _assigns(body[end - 1], "frame"):
+        end -= 1
+    return body[:start] + body[end:]
+
+
+def _is_step_action(node: ast.stmt) -> bool:
+    # `await page.wait_for_timeout(3000)` and `await elem.click(...)` / `.fill(...)`.
+    if not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Await)):
+        return False
+    call = node.value.value
+    return (
+        isinstance(call, ast.Call)
+        and isinstance(call.func, ast.Attribute)
+        and isinstance(call.func.value, ast.Name)
+        and (call.func.value.id == "elem" or (call.func.value.id == "page" and call.func.attr == "wait_for_timeout"))
+    )
+
+
+def login_step_stripper(case: Case) -> Callable[[ast.Module], None]:
+    """``load_run_test`` transform dropping the login steps a saved session makes redundant."""
+    aliases = case_aliases(case.source)
+
+    def transform(tree: ast.Module) -> None:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.AsyncFunctionDef) and node.name == "run_test":
+                for stmt in node.body:
+                    if isinstance(stmt, ast.Try):
+                        stmt.body = _strip_leading_login(stmt.body, aliases)
+
+    return transform
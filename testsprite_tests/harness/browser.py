@@ -0,0 +1,123 @@
+"""One Chromium per worker, shared by every case that worker runs.
+
+The generated scripts call ``async_api.async_playwright().start()`` and
+``pw.chromium.launch()`` themselves. :class:`AsyncApiShim` stands in for the
+``async_api`` module inside a loaded script so those calls resolve to the
+worker's :class:`SharedBrowser`: ``launch()`` is free, ``new_context()`` still
+returns a fresh, isolated ``BrowserContext``, and ``browser.close()`` /
+``pw.stop()`` only release what the case itself created.
+"""
+
+from typing import Any, Awaitable, Callable, Sequence
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+# The scripts also pass --single-process and --ipc=host; both make Chromium
+# unstable once several contexts share one browser process, so they are dropped.
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+
+
+# Called with each new context; may return an object the script sees instead.
+ContextHook = Callable[[BrowserContext], Awaitable[Any]]
+
+
+class SharedBrowser:
+    def __init__(self, headless: bool = True) -> None:
+        self.headless = headless
+        self._pw: Playwright | None = None
+        self._browser: Browser | None = None
+
+    async def start(self) -> None:
+        if self._browser is not None:
+            return
+        self._pw = await async_playwright().start()
+        self._browser = await self._pw.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+
+    async def stop(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    async def new_context(self, **kwargs: Any) -> BrowserContext:
+        await self.start()
+        assert self._browser is not None
+        return await self._browser.new_context(**kwargs)
+
+
+class _CaseBrowser:
+    """What ``pw.chromium.launch()`` returns to a script."""
+
+    def __init__(self, shim: "AsyncApiShim") -> None:
+        self._shim = shim
+
+    async def new_context(self, **kwargs: Any) -> Any:
+        return await self._shim.new_context(**kwargs)
+
+    async def close(self) -> None:
+        await self._shim.close()
+
+
+class _CaseChromium:
+    def __init__(self, shim: "AsyncApiShim") -> None:
+        self._shim = shim
+
+    async def launch(self, **_: Any) -> _CaseBrowser:
+        return _CaseBrowser(self._shim)
+
+
+class _CasePlaywright:
+    def __init__(self, shim: "AsyncApiShim") -> None:
+        self.chromium = _CaseChromium(shim)
+
+    async def start(self) -> "_CasePlaywright":
+        return self
+
+    async def stop(self) -> None:
+        pass
+
+
+class AsyncApiShim:
+    """Drop-in for ``playwright.async_api`` inside one case's namespace."""
+
+    def __init__(
+        self,
+        shared: SharedBrowser,
+        hooks: Sequence[ContextHook] = (),
+        context_options: dict[str, Any] | None = None,
+    ) -> None:
+        self._shared = shared
+        self._hooks = hooks
+        self._context_options = context_options or {}
+        self.contexts: list[BrowserContext] = []
+        self.handles: list[Any] = []
+
+    def async_playwright(self) -> _CasePlaywright:
+        return _CasePlaywright(self)
+
+    async def new_context(self, **kwargs: Any) -> Any:
+        context = await self._shared.new_context(**{**self._context_options, **kwargs})
+        self.contexts.append(context)
+        handle: Any = context
+        for hook in self._hooks:
+            handle = await hook(handle) or handle
+        self.handles.append(handle)
+        return handle
+
+    async def close(self) -> None:
+        while self.contexts:
+            context = self.contexts.pop()
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+
+    def __getattr__(self, name: str) -> Any:
+        # Error, TimeoutError, expect, ... resolve to the real module.
+        return getattr(async_api, name)
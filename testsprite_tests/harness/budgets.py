@@ -0,0 +1,64 @@
+"""Per-route performance budgets, checked against the records from harness/vitals.py.
+
+``perf_budgets.json`` maps a route to limits on the metrics of any navigation
+to it::
+
+    {"/worklog": {"ttiMs": 5000, "requests": 120, "transferKB": 15000, "supabaseQueries": 15}}
+
+Routes match the path only (``/worklog?id=…`` uses ``/worklog``) and may use
+``*`` for one segment (``/posts/*/edit``); an exact route wins over a pattern.
+A case that passes its own assertions but goes over a budget fails. Set
+``TESTSPRITE_NO_BUDGETS=1`` to record metrics without enforcing them.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterable
+
+from .cases import SUITE_DIR
+
+BUDGETS_PATH = SUITE_DIR / "perf_budgets.json"
+METRICS = ("ttiMs", "requests", "transferKB", "supabaseQueries")
+
+
+def load_budgets(path: Path = BUDGETS_PATH) -> dict[str, dict[str, float]]:
+    try:
+        budgets = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    for route, limits in budgets.items():
+        unknown = set(limits) - set(METRICS)
+        if unknown:
+            raise ValueError(f"{path.name}: unknown metrics {sorted(unknown)} for {route}; expected {METRICS}")
+    return budgets
+
+
+def _pattern(route: str) -> re.Pattern:
+    return re.compile("^" + "/".join("[^/]+" if part == "*" else re.escape(part) for part in route.split("/")) + "/?$")
+
+
+def budget_for(url: str, budgets: dict[str, dict[str, float]]) -> tuple[str, dict[str, float]] | None:
+    path = url.split("?", 1)[0].split("#", 1)[0] or "/"
+    if path in budgets:
+        return path, budgets[path]
+    for route, limits in budgets.items():
+        if "*" in route and _pattern(route).match(path):
+            return route, limits
+    return None
+
+
+def violations(navigations: Iterable[dict[str, Any]], budgets: dict[str, dict[str, float]] | None = None) -> list[str]:
+    """One line per metric over budget, e.g. ``/worklog (soft): ttiMs 6120 > 5000``."""
+    budgets = load_budgets() if budgets is None else budgets
+    lines = []
+    for navigation in navigations:
+        match = budget_for(navigation.get("url", ""), budgets)
+        if match is None:
+            continue
+        route, limits = match
+        for metric, limit in limits.items():
+            value = navigation.get(metric)
+            if value is not None and value > limit:
+                lines.append(f"{navigation['url']} ({navigation.get('kind')}, budget {route}): {metric} {value} > {limit}")
+    return lines
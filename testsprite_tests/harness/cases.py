@@ -0,0 +1,101 @@
+"""Discovery and loading of the generated ``TC*.py`` scripts.
+
+Every generated script ends with a module-level ``asyncio.run(run_test())``,
+so importing one would start its own Playwright instance and Chromium. The
+loader compiles the script with that call removed and returns ``run_test``
+from a private namespace in which the Playwright entry point can be swapped.
+"""
+
+import ast
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Mapping
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+CASE_PATTERN = re.compile(r"^(TC\d{3})_(\w+)\.py$")
+# The scripts hard-code this origin; harness code that navigates on its own uses it too.
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:3000")
+
+
+@dataclass(frozen=True)
+class Case:
+    path: Path
+    case_id: str
+    slug: str
+
+    @property
+    def name(self) -> str:
+        # Case ids are not unique across plan revisions (two TC001 files), the stem is.
+        return self.path.stem
+
+    @property
+    def title(self) -> str:
+        # Same format TestSprite uses in tmp/test_results.json: "TC001-Successful user login ..."
+        return f"{self.case_id}-{self.slug.replace('_', ' ')}"
+
+    @property
+    def source(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    @classmethod
+    def from_path(cls, path: Path) -> "Case | None":
+        match = CASE_PATTERN.match(path.name)
+        if not match:
+            return None
+        return cls(path=path, case_id=match.group(1), slug=match.group(2))
+
+
+def discover_cases(root: Path = SUITE_DIR, select: Iterable[str] | None = None) -> list[Case]:
+    """Return the cases under ``root`` in file-name order.
+
+    ``select`` filters by case id (``TC004``) or file stem.
+    """
+    cases = [case for case in map(Case.from_path, sorted(root.glob("TC*.py"))) if case]
+    if select:
+        wanted = set(select)
+        cases = [case for case in cases if case.case_id in wanted or case.name in wanted]
+    return cases
+
+
+def _is_entrypoint(node: ast.stmt) -> bool:
+    # Matches the trailing `asyncio.run(run_test())` of a generated script.
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def load_run_test(
+    case: Case,
+    overrides: Mapping[str, Any],
+    transform: Callable[[ast.Module], None] | None = None,
+) -> Callable[[], Awaitable[None]]:
+    """Compile ``case`` without its entry point and return its ``run_test``.
+
+    ``overrides`` replace module globals after the script's own imports ran,
+    e.g. ``{"async_api": shim}`` to redirect ``async_playwright().start()``.
+    ``transform`` may edit the parsed script before it is compiled.
+    """
+    tree = ast.parse(case.source, filename=str(case.path))
+    tree.body = [node for node in tree.body if not _is_entrypoint(node)]
+    if transform is not None:
+        transform(tree)
+
+    namespace: dict[str, Any] = {
+        "__name__": f"testsprite_case_{case.name}",
+        "__file__": str(case.path),
+    }
+    exec(compile(tree, str(case.path), "exec"), namespace)
+    namespace.update(overrides)
+
+    run_test = namespace.get("run_test")
+    if run_test is None:
+        raise LookupError(f"{case.path.name} does not define run_test()")
+    return run_test
@@ -0,0 +1,217 @@
+"""Semantic locators for the screens the generated scripts drive.
+
+The scripts address elements by absolute XPath
+(``xpath=html/body/div[2]/aside/div/div[2]/button[2]``). Those paths are slow
+to evaluate and break whenever a wrapper ``div`` is added anywhere above the
+element. :data:`REGISTRY` names the same elements by role, label, placeholder,
+test id or a stable CSS attribute, grouped by screen, and :func:`resolve`
+compiles a ``Locator`` for a registry key once per page.
+
+:func:`install` is a context hook: ``locator()`` calls on the pages a script
+receives are rewritten to registry keys, so the existing scripts use the
+registry without being regenerated and a layout change is fixed here once
+instead of in every script. Unknown selectors pass through unchanged.
+Set ``TESTSPRITE_RAW_XPATH=1`` to disable the rewrite.
+
+Sidebar menu XPaths cannot be aliased globally: the menu gained items between
+plan revisions, so ``li[3]`` is 업무일지 목록 in one script and 오늘 중계현황 in
+another. :func:`case_aliases` instead reads the comment TestSprite writes
+above each locator ("Click on '포스트 목록' ...") and maps that script's XPath
+to the menu item it names.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+from weakref import WeakKeyDictionary
+
+from playwright.async_api import Locator
+
+
+@dataclass(frozen=True)
+class Target:
+    role: str | None = None
+    name: str | None = None
+    exact: bool = False
+    label: str | None = None
+    placeholder: str | None = None
+    text: str | None = None
+    test_id: str | None = None
+    css: str | None = None
+    # Registry key of an enclosing element, e.g. "login_modal.dialog".
+    within: str | None = None
+
+    def compile(self, root: Any) -> Locator:
+        if self.test_id:
+            return root.get_by_test_id(self.test_id)
+        if self.role:
+            return root.get_by_role(self.role, name=self.name, exact=self.exact)
+        if self.label:
+            return root.get_by_label(self.label, exact=self.exact)
+        if self.placeholder:
+            return root.get_by_placeholder(self.placeholder, exact=self.exact)
+        if self.text:
+            return root.get_by_text(self.text, exact=self.exact)
+        if self.css:
+            return root.locator(self.css)
+        raise ValueError("Target needs at least one of test_id, role, label, placeholder, text or css")
+
+
+# (key, label) in the order of menuItems in components/layout/sidebar.tsx.
+SIDEBAR_MENU = [
+    ("dashboard", "대시보드"),
+    ("worklog_today", "오늘 업무일지"),
+    ("worklog_list", "업무일지 목록"),
+    ("posts", "포스트 목록"),
+    ("broadcasts", "오늘 중계현황"),
+    ("channels", "채널 관리"),
+    ("statistics", "통계 및 보고서"),
+    ("worker_pattern", "근무패턴 설정"),
+    ("contacts", "담당자 관리"),
+    ("settings", "프로그램 설정"),
+]
+
+REGISTRY: dict[str, dict[str, Target]] = {
+    "sidebar": {
+        "root": Target(css="aside"),
+        "nav": Target(css="aside nav"),
+        **{key: Target(role="link", name=label, exact=True, within="sidebar.nav") for key, label in SIDEBAR_MENU},
+        "handover_login": Target(role="button", name="다음 근무자 로그인 (교대)", within="sidebar.root"),
+        "guest_login": Target(role="button", name="게스트/관리자 로그인", within="sidebar.root"),
+    },
+    "header": {
+        "logout": Target(css="header button[title='로그아웃']"),
+    },
+    # Guest/admin dialog (guest-login-dialog.tsx) and the handover dialog
+    # (login-form.tsx in handover mode) share one layout.
+    "login_modal": {
+        "dialog": Target(role="dialog"),
+        "email": Target(css="#guest-email, #email", within="login_modal.dialog"),
+        "password": Target(css="#guest-password, #password", within="login_modal.dialog"),
+        "submit": Target(css="form button[type=submit]", within="login_modal.dialog"),
+        "close": Target(role="button", name="Close", exact=True, within="login_modal.dialog"),
+    },
+    # /login page (app/login/page.tsx) with LoginForm in shift mode.
+    "login_page": {
+        "email": Target(css="#email"),
+        "password": Target(css="#password"),
+        "submit": Target(css="form button[type=submit]"),
+        "shift_mode": Target(text="현장 근무", exact=True),
+        "start_session": Target(role="button", name="근무 시작하기"),
+    },
+    "shift_wizard": {
+        "valid_from": Target(css="input[type=date]"),
+        "cycle_length": Target(css="input[type=number]"),
+        "next": Target(role="button", name="다음 단계"),
+        "memo": Target(placeholder="예: 하계 휴가 기간 단축 운영, 신규 입사자 배치 등"),
+        "save": Target(role="button", name="설정 저장하기"),
+    },
+    "post_editor": {
+        "title": Target(placeholder="제목을 입력하세요"),
+        "generate_summary": Target(role="button", name="AI 요약 생성"),
+        "summary": Target(placeholder="AI 요약 생성 버튼을 누르거나 직접 입력하세요", exact=False),
+        "tags": Target(placeholder="태그 입력 (Enter로 추가)"),
+        "content": Target(css=".ql-editor"),
+        "save": Target(role="button", name="저장", exact=True),
+        "cancel": Target(role="button", name="취소", exact=True),
+    },
+}
+
+
+# Absolute XPaths emitted by TestSprite that mean the same element in every
+# script -> registry key.
+XPATH_ALIASES: dict[str, str] = {
+    "xpath=html/body/div[2]/aside/div/div[2]/button": "sidebar.handover_login",
+    "xpath=html/body/div[2]/aside/div/div[2]/button[2]": "sidebar.guest_login",
+    "xpath=html/body/div[2]/div/header/div/div[2]/button[2]": "header.logout",
+    "xpath=html/body/div[4]/form/div/input": "login_modal.email",
+    "xpath=html/body/div[4]/form/div/div/input": "login_modal.email",
+    "xpath=html/body/div[4]/form/div[2]/input": "login_modal.password",
+    "xpath=html/body/div[4]/form/div[2]/div/input": "login_modal.password",
+    "xpath=html/body/div[4]/form/button": "login_modal.submit",
+    "xpath=html/body/div[4]/button": "login_modal.close",
+}
+
+_SIDEBAR_XPATH = "xpath=html/body/div[2]/aside/div/nav/"
+_COMMENTED_LOCATOR = re.compile(r"^\s*#(?P<comment>.*)\n\s*elem = frame\.locator\('(?P<selector>[^']+)'\)", re.M)
+
+
+def case_aliases(source: str) -> dict[str, str]:
+    """:data:`XPATH_ALIASES` plus the sidebar XPaths of one script."""
+    aliases = dict(XPATH_ALIASES)
+    for match in _COMMENTED_LOCATOR.finditer(source):
+        selector = match.group("selector")
+        if not selector.startswith(_SIDEBAR_XPATH):
+            continue
+        named = [key for key, label in SIDEBAR_MENU if label in match.group("comment")]
+        if len(named) == 1:
+            aliases[selector] = f"sidebar.{named[0]}"
+    return aliases
+
+
+_compiled: "WeakKeyDictionary[Any, dict[str, Locator]]" = WeakKeyDictionary()
+
+
+def lookup(key: str) -> Target:
+    screen, _, name = key.partition(".")
+    try:
+        return REGISTRY[screen][name]
+    except KeyError:
+        raise KeyError(f"unknown locator {key!r}") from None
+
+
+def resolve(page: Any, key: str) -> Locator:
+    """Return the compiled locator for ``key`` (``"login_modal.email"``) on ``page``."""
+    cache = _compiled.setdefault(page, {})
+    if key not in cache:
+        target = lookup(key)
+        root = resolve(page, target.within) if target.within else page
+        cache[key] = target.compile(root)
+    return cache[key]
+
+
+class ResolvingPage:
+    def __init__(self, page: Any, aliases: dict[str, str]) -> None:
+        self._page = page
+        self._aliases = aliases
+
+    def locator(self, selector: str, **kwargs: Any) -> Locator:
+        key = self._aliases.get(selector)
+        if key is None or kwargs:
+            return self._page.locator(selector, **kwargs)
+        return resolve(self._page, key)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._page, name)
+
+
+class ResolvingContext:
+    def __init__(self, context: Any, aliases: dict[str, str]) -> None:
+        self._context = context
+        self._aliases = aliases
+        self._pages: dict[Any, ResolvingPage] = {}
+
+    def _wrap(self, page: Any) -> ResolvingPage:
+        if page not in self._pages:
+            self._pages[page] = ResolvingPage(page, self._aliases)
+        return self._pages[page]
+
+    @property
+    def pages(self) -> list[ResolvingPage]:
+        return [self._wrap(page) for page in self._context.pages]
+
+    async def new_page(self) -> ResolvingPage:
+        return self._wrap(await self._context.new_page())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+
+def hook_for(source: str) -> Callable[[Any], Awaitable[ResolvingContext]]:
+    """Context hook that rewrites the locators of the script ``source``."""
+    aliases = case_aliases(source)
+
+    async def install(context: Any) -> ResolvingContext:
+        return ResolvingContext(context, aliases)
+
+    return install
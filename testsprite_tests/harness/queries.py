@@ -0,0 +1,168 @@
+"""Log every PostgREST request a case makes and point out wasteful patterns.
+
+:class:`QueryLog` is a context hook that records each ``/rest/v1/`` request
+(table, method, query string, issuing page, start and end time) and groups
+them by *shape*: the query with filter values blanked out, so
+``users?select=name&id=eq.1`` and ``...id=eq.2`` share the shape
+``GET users?select=name&id=eq.?``. From that it reports:
+
+* **N+1**: one shape fetched :data:`N_PLUS_ONE_MIN` or more times with
+  different values, e.g. a ``users`` lookup per post after the main select;
+* **duplicate**: the exact same GET issued twice from one page;
+* **waterfall**: :data:`WATERFALL_MIN` or more requests from one page, each
+  starting only after the previous one finished (``fetchWorklogById`` ->
+  ``fetchWorklogChannelData`` -> ...);
+* **over-fetch**: ``select=*`` (or no ``select``), including ``table(*)``
+  embeds.
+
+Findings are reported, not enforced; see ``tmp/supabase_queries.json``.
+"""
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from playwright.async_api import BrowserContext, Request
+
+REST_PATH = re.compile(r"/rest/v1/(rpc/[^/?]+|[^/?]+)")
+# Query-string keys that shape the result rather than filter rows.
+NON_FILTER_KEYS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+N_PLUS_ONE_MIN = 3
+WATERFALL_MIN = 3
+# A request counts as waiting on the previous one if it starts within this
+# long after the previous one finished (and not before).
+WATERFALL_GAP_S = 0.1
+
+_IN_LIST = re.compile(r"\bin\.\([^)]*\)")
+_LITERAL = re.compile(r"\b(eq|neq|gt|gte|lt|lte|like|ilike|is|cs|cd|ov|fts|match|imatch)\.[^,()]*")
+
+
+def _blank(value: str) -> str:
+    return _LITERAL.sub(r"\1.?", _IN_LIST.sub("in.(?)", value))
+
+
+@dataclass
+class RestCall:
+    method: str
+    table: str
+    params: tuple[tuple[str, str], ...]
+    page: str
+    started: float
+    finished: float | None = None
+
+    @property
+    def select(self) -> str:
+        return dict(self.params).get("select", "*")
+
+    @property
+    def query(self) -> str:
+        return "&".join(f"{k}={v}" for k, v in self.params)
+
+    @property
+    def shape(self) -> str:
+        params = [(k, v if k in NON_FILTER_KEYS else _blank(v)) for k, v in self.params]
+        return f"{self.method} {self.table}?" + "&".join(f"{k}={v}" for k, v in params)
+
+    @classmethod
+    def from_request(cls, request: Request) -> "RestCall | None":
+        url = urlsplit(request.url)
+        match = REST_PATH.search(url.path)
+        if match is None:
+            return None
+        try:
+            page = urlsplit(request.frame.url).path
+        except Exception:
+            page = ""
+        params = tuple((k, unquote(v)) for k, v in parse_qsl(url.query, keep_blank_values=True))
+        return cls(request.method, match.group(1), params, page, started=0.0)
+
+
+def find_n_plus_one(calls: list[RestCall]) -> list[str]:
+    by_shape: dict[str, set[str]] = defaultdict(set)
+    counts: Counter[str] = Counter()
+    for call in calls:
+        if call.method == "GET":
+            by_shape[call.shape].add(call.query)
+            counts[call.shape] += 1
+    return [
+        f"N+1: {counts[shape]}x {shape} ({len(queries)} distinct values)"
+        for shape, queries in by_shape.items()
+        if counts[shape] >= N_PLUS_ONE_MIN and len(queries) >= N_PLUS_ONE_MIN
+    ]
+
+
+def find_duplicates(calls: list[RestCall]) -> list[str]:
+    counts = Counter((call.page, call.table, call.query) for call in calls if call.method == "GET")
+    return [
+        f"duplicate: {n}x GET {table}?{query} on {page or '?'}"
+        for (page, table, query), n in counts.items()
+        if n >= 2
+    ]
+
+
+def find_waterfalls(calls: list[RestCall]) -> list[str]:
+    findings = []
+    by_page: dict[str, list[RestCall]] = defaultdict(list)
+    for call in calls:
+        if call.finished is not None:
+            by_page[call.page].append(call)
+    for page, page_calls in by_page.items():
+        page_calls.sort(key=lambda c: c.started)
+        chain: list[RestCall] = []
+        for call in page_calls + [None]:
+            previous = chain[-1] if chain else None
+            if call is not None and previous is not None and 0 <= call.started - previous.finished <= WATERFALL_GAP_S:
+                chain.append(call)
+                continue
+            if len(chain) >= WATERFALL_MIN:
+                total_ms = (chain[-1].finished - chain[0].started) * 1000
+                hops = " -> ".join(c.table for c in chain)
+                findings.append(f"waterfall on {page or '?'}: {hops} ({len(chain)} serial requests, {total_ms:.0f}ms)")
+            # Overlapping requests restart the chain from the latest one.
+            chain = [call] if call is not None else []
+    return findings
+
+
+def find_over_fetch(calls: list[RestCall]) -> list[str]:
+    counts = Counter(call.table for call in calls if call.method == "GET" and "*" in call.select)
+    return [f"over-fetch: select=* on {table} ({n}x)" for table, n in counts.items()]
+
+
+class QueryLog:
+    def __init__(self) -> None:
+        self.calls: list[RestCall] = []
+        self._pending: dict[Request, RestCall] = {}
+
+    async def install(self, context: BrowserContext) -> None:
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+
+    def _on_request(self, request: Request) -> None:
+        call = RestCall.from_request(request)
+        if call is not None:
+            self._pending[request] = call
+
+    def _on_done(self, request: Request) -> None:
+        call = self._pending.pop(request, None)
+        if call is None:
+            return
+        # Timing is relative to startTime (epoch ms); responseEnd is -1 for failures.
+        timing = request.timing
+        call.started = timing["startTime"] / 1000
+        if timing.get("responseEnd", -1) >= 0:
+            call.finished = call.started + timing["responseEnd"] / 1000
+        self.calls.append(call)
+
+    def findings(self) -> list[str]:
+        calls = sorted(self.calls, key=lambda c: c.started)
+        return find_n_plus_one(calls) + find_duplicates(calls) + find_waterfalls(calls) + find_over_fetch(calls)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "total": len(self.calls),
+            "byTable": dict(sorted(Counter(call.table for call in self.calls).items())),
+            "findings": self.findings(),
+        }
@@ -0,0 +1,110 @@
+"""Persisted run data: per-case durations, tmp/test_results.json, navigation metrics and Supabase query reports."""
+
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from .cases import SUITE_DIR, Case
+from .runner import CaseResult
+
+TMP_DIR = SUITE_DIR / "tmp"
+DURATIONS_PATH = TMP_DIR / "durations.json"
+RESULTS_PATH = TMP_DIR / "test_results.json"
+METRICS_PATH = TMP_DIR / "perf_metrics.json"
+QUERIES_PATH = TMP_DIR / "supabase_queries.json"
+PLAN_PATH = SUITE_DIR / "testsprite_frontend_test_plan.json"
+
+
+def _read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def _write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def load_durations(path: Path = DURATIONS_PATH) -> dict[str, float]:
+    return _read_json(path, {})
+
+
+def record_durations(results: Iterable[CaseResult], path: Path = DURATIONS_PATH) -> None:
+    durations = load_durations(path)
+    for result in results:
+        durations[result.name] = round(result.duration, 3)
+    _write_json(path, dict(sorted(durations.items())))
+
+
+def _title_key(title: str) -> str:
+    # File names drop punctuation ("auto-save" -> "auto_save"), so compare on letters and digits.
+    return re.sub(r"[\W_]+", "", title).lower()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def write_results(cases: Iterable[Case], results: Iterable[CaseResult], path: Path = RESULTS_PATH) -> None:
+    """Merge ``results`` into the TestSprite results file, keyed by title.
+
+    Entries for cases that were not run are kept as they are; ids and
+    visualization links of existing entries are preserved.
+    """
+    by_name = {result.name: result for result in results}
+    descriptions = {
+        _title_key(f"{entry['id']}-{entry['title']}"): entry.get("description", "")
+        for entry in _read_json(PLAN_PATH, [])
+    }
+    entries = _read_json(path, [])
+    index = {_title_key(entry.get("title", "")): entry for entry in entries}
+    now = _now()
+
+    for case in cases:
+        result = by_name.get(case.name)
+        if result is None:
+            continue
+        key = _title_key(case.title)
+        entry = index.get(key)
+        if entry is None:
+            entry = {
+                "title": case.title,
+                "description": descriptions.get(key, ""),
+                "testType": "FRONTEND",
+                "createFrom": "harness",
+                "created": now,
+            }
+            entries.append(entry)
+            index[key] = entry
+        entry["code"] = case.path.read_text(encoding="utf-8")
+        entry["testStatus"] = result.status
+        entry["testError"] = result.error or ""
+        entry["modified"] = now
+
+    _write_json(path, entries)
+
+
+def write_metrics(results: Iterable[CaseResult], path: Path = METRICS_PATH) -> None:
+    """Replace the navigation records of every case in ``results``, keep the rest.
+
+    One entry per case name with stable key order, so a slower page shows up
+    as a plain diff against the previous run.
+    """
+    metrics = _read_json(path, {})
+    for result in results:
+        if result.navigations:
+            metrics[result.name] = {"status": result.status, "navigations": result.navigations}
+    _write_json(path, dict(sorted(metrics.items())))
+
+
+def write_queries(results: Iterable[CaseResult], path: Path = QUERIES_PATH) -> None:
+    """Replace the Supabase query report of every case in ``results``, keep the rest."""
+    reports = _read_json(path, {})
+    for result in results:
+        if result.queries:
+            reports[result.name] = result.queries
+    _write_json(path, dict(sorted(reports.items())))
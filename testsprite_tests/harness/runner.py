@@ -0,0 +1,109 @@
+"""Run loaded cases against a worker's shared browser and time them."""
+
+import asyncio
+import os
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any
+
+from . import api_mocks, auth_state, budgets, locators, queries, vitals, waits
+from .auth_state import AuthCache
+from .browser import AsyncApiShim, SharedBrowser
+from .cases import Case, load_run_test
+
+PASSED = "PASSED"
+FAILED = "FAILED"
+
+
+@dataclass
+class CaseResult:
+    name: str
+    status: str
+    duration: float
+    error: str | None = None
+    # One record per navigation, see harness/vitals.py.
+    navigations: list[dict[str, Any]] = field(default_factory=list)
+    # Supabase request counts and findings, see harness/queries.py.
+    queries: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def passed(self) -> bool:
+        return self.status == PASSED
+
+
+def _flag(name: str) -> bool:
+    return os.environ.get(name) == "1"
+
+
+async def run_case(case: Case, shared: SharedBrowser, auth: AuthCache | None = None) -> CaseResult:
+    hooks = []
+    context_options = {}
+    transform = None
+    role = auth_state.role_for(case)
+    saved = await auth.state_for(role) if auth is not None and role else None
+    if saved is not None:
+        hooks.append(saved.install)
+        context_options["storage_state"] = saved.storage_state
+        transform = auth_state.login_step_stripper(case)
+    hooks.append(api_mocks.ApiMocks().install)
+    query_log = queries.QueryLog()
+    hooks.append(query_log.install)
+    recorder = None if _flag("TESTSPRITE_NO_VITALS") else vitals.Recorder()
+    if recorder is not None:
+        hooks.append(recorder.install)
+    if not _flag("TESTSPRITE_FIXED_WAITS"):
+        hooks.append(waits.install)
+    if not _flag("TESTSPRITE_RAW_XPATH"):
+        hooks.append(locators.hook_for(case.source))
+    shim = AsyncApiShim(shared, hooks, context_options)
+    overrides = {"async_api": shim}
+    if not _flag("TESTSPRITE_FIXED_WAITS"):
+        overrides["asyncio"] = waits.AsyncioShim(shim)
+    start = time.perf_counter()
+    try:
+        run_test = load_run_test(case, overrides, transform)
+        await run_test()
+    except Exception as exc:
+        # AssertionError messages from the scripts already describe the failure;
+        # anything else (timeouts, selector errors) needs its traceback.
+        error = str(exc) if isinstance(exc, AssertionError) else traceback.format_exc()
+        status = FAILED
+    else:
+        error, status = None, PASSED
+    finally:
+        await shim.close()
+    navigations = recorder.navigations if recorder is not None else []
+    if status == PASSED and not _flag("TESTSPRITE_NO_BUDGETS"):
+        over = budgets.violations(navigations)
+        if over:
+            status, error = FAILED, "performance budget exceeded:\n" + "\n".join(over)
+    return CaseResult(case.name, status, time.perf_counter() - start, error, navigations, query_log.report())
+
+
+class Worker:
+    """Owns an event loop and a browser; runs cases one at a time.
+
+    Playwright objects are bound to the loop that created them, so the loop
+    lives as long as the browser instead of one ``asyncio.run`` per case.
+    """
+
+    def __init__(self, headless: bool = True) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.shared = SharedBrowser(headless=headless)
+        self.auth = AuthCache(self.shared)
+
+    def run(self, case: Case) -> CaseResult:
+        return self.loop.run_until_complete(run_case(case, self.shared, self.auth))
+
+    def bootstrap(self, cases: list[Case]) -> None:
+        """Refresh the saved session of every role ``cases`` need."""
+        roles = {auth_state.role_for(case) for case in cases} - {None}
+        for role in sorted(roles):
+            self.loop.run_until_complete(self.auth.state_for(role))
+
+    def close(self) -> None:
+        try:
+            self.loop.run_until_complete(self.shared.stop())
+        finally:
+            self.loop.close()
@@ -0,0 +1,51 @@
+"""Process-pool mode: shard the cases across N worker processes.
+
+Each process runs its own :class:`~harness.runner.Worker` (one Chromium) over
+its shard. Shards are built longest-processing-time first from the durations
+of earlier runs, so the slowest cases start immediately and the shards finish
+at roughly the same time.
+"""
+
+import heapq
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from statistics import mean
+
+from .cases import Case
+from .runner import CaseResult, Worker
+
+# Used for cases that have never been timed, until a run records them.
+DEFAULT_DURATION = 60.0
+
+
+def plan_shards(cases: list[Case], workers: int, durations: dict[str, float]) -> list[list[Case]]:
+    known = [durations[case.name] for case in cases if case.name in durations]
+    fallback = mean(known) if known else DEFAULT_DURATION
+
+    def cost(case: Case) -> float:
+        return durations.get(case.name, fallback)
+
+    shards: list[list[Case]] = [[] for _ in range(max(1, min(workers, len(cases))))]
+    loads = [(0.0, i) for i in range(len(shards))]
+    for case in sorted(cases, key=cost, reverse=True):
+        load, i = heapq.heappop(loads)
+        shards[i].append(case)
+        heapq.heappush(loads, (load + cost(case), i))
+    return [shard for shard in shards if shard]
+
+
+def run_shard(shard: list[Case], headless: bool = True) -> list[CaseResult]:
+    worker = Worker(headless=headless)
+    try:
+        return [worker.run(case) for case in shard]
+    finally:
+        worker.close()
+
+
+def run_parallel(cases: list[Case], workers: int, durations: dict[str, float], headless: bool = True) -> list[CaseResult]:
+    shards = plan_shards(cases, workers, durations)
+    # spawn, not fork: a forked child would inherit the parent's asyncio state.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as pool:
+        futures = [pool.submit(run_shard, shard, headless) for shard in shards]
+        return [result for future in futures for result in future.result()]
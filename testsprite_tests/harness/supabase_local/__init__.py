@@ -0,0 +1,5 @@
+"""A local stand-in for the Supabase API (PostgREST + GoTrue), seeded from the migrations."""
+
+from .server import DEFAULT_PORT, LocalSupabase, rpc
+
+__all__ = ["DEFAULT_PORT", "LocalSupabase", "rpc"]
@@ -0,0 +1,39 @@
+"""Serve the local Supabase stand-in until interrupted.
+
+    cd testsprite_tests
+    python -m harness.supabase_local            # http://127.0.0.1:54321
+    python -m harness.supabase_local --port 54400
+
+Prints the environment to start the app with.
+"""
+
+import argparse
+import logging
+import sys
+
+from .server import DEFAULT_PORT, FIXTURES_PATH, LocalSupabase
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.supabase_local", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--no-fixtures", action="store_true", help="migrations and seed data only")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+
+    server = LocalSupabase(args.host, args.port, fixtures=None if args.no_fixtures else FIXTURES_PATH)
+    for key, value in server.env().items():
+        print(f"{key}={value}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
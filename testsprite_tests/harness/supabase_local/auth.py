@@ -0,0 +1,191 @@
+"""GoTrue's password flow: sign-up, sign-in, refresh, ``/user`` and logout.
+
+Tokens are real HS256 JWTs signed with the Supabase CLI's default local
+secret, so anything that decodes them (supabase-js, middleware) sees the
+usual claims. Signing up also creates the ``public.users`` profile, as the
+``on_auth_user_created`` trigger in ``03_triggers.sql`` does.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from .schema import now_iso
+from .store import Database, Query
+
+# `supabase start` defaults; ANON_KEY comes out as the well-known demo key.
+JWT_SECRET = "super-secret-jwt-token-with-at-least-32-characters-long"
+ACCESS_TOKEN_TTL = 3600
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def encode_jwt(claims: dict[str, Any]) -> str:
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = _b64(json.dumps(claims, separators=(",", ":"), ensure_ascii=False).encode())
+    signature = hmac.new(JWT_SECRET.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(signature)}"
+
+
+def decode_jwt(token: str) -> dict[str, Any] | None:
+    try:
+        header, payload, signature = token.split(".")
+        expected = hmac.new(JWT_SECRET.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64(expected), signature):
+            return None
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except ValueError:
+        return None
+    return claims if claims.get("exp", 0) > time.time() else None
+
+
+ANON_KEY = encode_jwt({"iss": "supabase-demo", "role": "anon", "exp": 1983812996})
+SERVICE_ROLE_KEY = encode_jwt({"iss": "supabase-demo", "role": "service_role", "exp": 1983812996})
+
+
+class AuthError(Exception):
+    """Rendered as GoTrue's ``{code, error_code, msg}`` error body."""
+
+    def __init__(self, status: int, error_code: str, msg: str):
+        super().__init__(msg)
+        self.status = status
+        self.error_code = error_code
+        self.msg = msg
+
+    def body(self) -> dict[str, Any]:
+        return {"code": self.status, "error_code": self.error_code, "msg": self.msg}
+
+
+@dataclass
+class AuthUser:
+    email: str
+    password: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    user_metadata: dict[str, Any] = field(default_factory=dict)
+    created_at: str = field(default_factory=now_iso)
+    last_sign_in_at: str | None = None
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": self.email,
+            "email_confirmed_at": self.created_at,
+            "confirmed_at": self.created_at,
+            "phone": "",
+            "last_sign_in_at": self.last_sign_in_at,
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": self.user_metadata,
+            "identities": [],
+            "created_at": self.created_at,
+            "updated_at": self.last_sign_in_at or self.created_at,
+            "is_anonymous": False,
+        }
+
+
+class GoTrue:
+    def __init__(self, db: Database):
+        self.db = db
+        self.users: dict[str, AuthUser] = {}
+        self.refresh_tokens: dict[str, str] = {}
+
+    def by_email(self, email: str) -> AuthUser | None:
+        email = email.strip().lower()
+        return next((u for u in self.users.values() if u.email == email), None)
+
+    def sign_up(self, email: str, password: str, metadata: dict[str, Any] | None = None, user_id: str | None = None) -> AuthUser:
+        if not email or not password:
+            raise AuthError(400, "validation_failed", "Signup requires a valid password")
+        if self.by_email(email):
+            raise AuthError(422, "user_already_exists", "User already registered")
+        user = AuthUser(email.strip().lower(), password, user_metadata=dict(metadata or {}))
+        if user_id:
+            user.id = user_id
+        self.users[user.id] = user
+        self.db.insert(
+            "users",
+            [{"id": user.id, "email": user.email, "name": user.user_metadata.get("name", user.email), "role": "tech_staff"}],
+            ignore_duplicates=True,
+        )
+        return user
+
+    def session(self, user: AuthUser) -> dict[str, Any]:
+        user.last_sign_in_at = now_iso()
+        expires_at = int(time.time()) + ACCESS_TOKEN_TTL
+        refresh_token = secrets.token_urlsafe(16)
+        self.refresh_tokens[refresh_token] = user.id
+        access_token = encode_jwt(
+            {
+                "aud": "authenticated",
+                "exp": expires_at,
+                "iat": expires_at - ACCESS_TOKEN_TTL,
+                "iss": "http://localhost/auth/v1",
+                "sub": user.id,
+                "email": user.email,
+                "phone": "",
+                "role": "authenticated",
+                "aal": "aal1",
+                "session_id": str(uuid.uuid4()),
+                "app_metadata": {"provider": "email", "providers": ["email"]},
+                "user_metadata": user.user_metadata,
+                "is_anonymous": False,
+            }
+        )
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL,
+            "expires_at": expires_at,
+            "refresh_token": refresh_token,
+            "user": user.to_json(),
+        }
+
+    def password_grant(self, email: str, password: str) -> dict[str, Any]:
+        user = self.by_email(email or "")
+        if user is None or not hmac.compare_digest(user.password, password or ""):
+            raise AuthError(400, "invalid_credentials", "Invalid login credentials")
+        return self.session(user)
+
+    def refresh_grant(self, refresh_token: str) -> dict[str, Any]:
+        user_id = self.refresh_tokens.pop(refresh_token or "", None)
+        if user_id is None or user_id not in self.users:
+            raise AuthError(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+        return self.session(self.users[user_id])
+
+    def user_for(self, authorization: str | None) -> AuthUser:
+        token = (authorization or "").removeprefix("Bearer ").strip()
+        claims = decode_jwt(token)
+        user = self.users.get(claims.get("sub", "")) if claims else None
+        if user is None:
+            raise AuthError(403, "bad_jwt", "invalid JWT: unable to parse or verify signature")
+        return user
+
+    def update(self, user: AuthUser, body: dict[str, Any]) -> AuthUser:
+        if body.get("email"):
+            user.email = body["email"].strip().lower()
+            self.db.update("users", _by_id(user.id), {"email": user.email})
+        if body.get("password"):
+            user.password = body["password"]
+        if isinstance(body.get("data"), dict):
+            user.user_metadata.update(body["data"])
+            # on_auth_user_updated: sync name / avatar into public.users.
+            patch = {k: v for k, v in (("name", body["data"].get("name")), ("profile_image_url", body["data"].get("avatar_url"))) if v}
+            if patch:
+                self.db.update("users", _by_id(user.id), patch)
+        return user
+
+    def logout(self, user: AuthUser) -> None:
+        self.refresh_tokens = {t: uid for t, uid in self.refresh_tokens.items() if uid != user.id}
+
+
+def _by_id(user_id: str) -> Query:
+    return Query.from_params([("id", f"eq.{user_id}")])
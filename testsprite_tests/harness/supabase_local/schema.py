@@ -0,0 +1,414 @@
+"""Read table definitions and seed rows out of ``supabase/migrations/*.sql``.
+
+This is not a SQL parser. It understands the handful of statement shapes the
+migrations actually use (``CREATE TABLE``, ``ALTER TABLE ... ADD COLUMN /
+RENAME COLUMN / ADD CONSTRAINT ... UNIQUE``, ``CREATE UNIQUE INDEX`` and
+``INSERT ... VALUES``) and skips everything else: policies, triggers,
+functions, ``UPDATE``s over existing data.
+"""
+
+import json
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[3] / "supabase" / "migrations"
+
+_TOKEN = re.compile(
+    r"""
+    (?P<string>'(?:[^']|'')*')
+    | (?P<quoted>"[^"]*")
+    | (?P<number>-?\d+(?:\.\d+)?)
+    | (?P<word>\w+)
+    | (?P<cast>::)
+    | (?P<punct>\S)
+    """,
+    re.VERBOSE,
+)
+_DOLLAR_QUOTE = re.compile(r"\$\w*\$")
+# Keywords that end a column's type / DEFAULT expression.
+_CONSTRAINT_WORDS = {"NOT", "NULL", "PRIMARY", "REFERENCES", "UNIQUE", "CHECK", "CONSTRAINT", "DEFAULT"}
+_TABLE_CONSTRAINTS = {"PRIMARY", "UNIQUE", "CONSTRAINT", "FOREIGN", "CHECK", "EXCLUDE"}
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass(frozen=True)
+class Token:
+    kind: str
+    text: str
+
+    @property
+    def upper(self) -> str:
+        return self.text.upper() if self.kind == "word" else self.text
+
+    @property
+    def ident(self) -> str:
+        return self.text[1:-1] if self.kind == "quoted" else self.text.lower() if self.kind == "word" else self.text
+
+
+@dataclass
+class Column:
+    name: str
+    type: str = "text"
+    default: tuple[Token, ...] = ()
+
+    @property
+    def is_array(self) -> bool:
+        return self.type.endswith("[]")
+
+    @property
+    def is_json(self) -> bool:
+        return self.type in ("json", "jsonb")
+
+    def default_value(self) -> Any:
+        return evaluate(self.default, self) if self.default else None
+
+
+@dataclass
+class Table:
+    name: str
+    columns: dict[str, Column] = field(default_factory=dict)
+    primary_key: tuple[str, ...] = ("id",)
+    unique: list[tuple[str, ...]] = field(default_factory=list)
+    # column -> referenced table, for columns pointing at another public table.
+    foreign_keys: dict[str, str] = field(default_factory=dict)
+    # column -> "CASCADE" / "SET NULL", from ``ON DELETE``.
+    on_delete: dict[str, str] = field(default_factory=dict)
+
+    def add_column(self, column: Column) -> None:
+        self.columns.setdefault(column.name, column)
+
+    def rename_column(self, old: str, new: str) -> None:
+        if old in self.columns:
+            column = self.columns.pop(old)
+            column.name = new
+            self.columns[new] = column
+        for mapping in (self.foreign_keys, self.on_delete):
+            if old in mapping:
+                mapping[new] = mapping.pop(old)
+        self.unique = [tuple(new if c == old else c for c in key) for key in self.unique]
+
+
+@dataclass
+class Seed:
+    table: str
+    rows: list[dict[str, Any]]
+    # ``ON CONFLICT ... DO NOTHING`` / ``DO UPDATE``: skip rows that collide.
+    on_conflict: bool = False
+
+
+@dataclass
+class Schema:
+    tables: dict[str, Table] = field(default_factory=dict)
+    seeds: list[Seed] = field(default_factory=list)
+
+    def table(self, name: str) -> Table:
+        if name not in self.tables:
+            self.tables[name] = Table(name)
+        return self.tables[name]
+
+    def rename_column(self, table: str, old: str, new: str) -> None:
+        # Rows seeded by earlier migrations are renamed along with the table.
+        self.table(table).rename_column(old, new)
+        for seed in self.seeds:
+            if seed.table == table:
+                seed.rows = [{new if k == old else k: v for k, v in row.items()} for row in seed.rows]
+
+
+def split_statements(sql: str) -> list[str]:
+    """Split on top-level ``;``, dropping comments and ``$$`` bodies."""
+    statements, current, i = [], [], 0
+    while i < len(sql):
+        ch = sql[i]
+        if sql.startswith("--", i):
+            i = sql.find("\n", i)
+            i = len(sql) if i < 0 else i
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = len(sql) if end < 0 else end + 2
+            continue
+        dollar = _DOLLAR_QUOTE.match(sql, i)
+        if dollar:
+            end = sql.find(dollar.group(), i + len(dollar.group()))
+            i = len(sql) if end < 0 else end + len(dollar.group())
+            current.append("''")
+            continue
+        if ch in "'\"":
+            end = i + 1
+            while end < len(sql):
+                if sql[end] == ch and sql[end + 1 : end + 2] == ch:
+                    end += 2
+                elif sql[end] == ch:
+                    break
+                else:
+                    end += 1
+            current.append(sql[i : end + 1])
+            i = end + 1
+            continue
+        if ch == ";":
+            statements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+        i += 1
+    statements.append("".join(current).strip())
+    return [s for s in statements if s]
+
+
+def tokenize(statement: str) -> list[Token]:
+    return [Token(m.lastgroup, m.group()) for m in _TOKEN.finditer(statement)]
+
+
+def _split_top_level(tokens: list[Token], sep: str = ",") -> list[list[Token]]:
+    parts, current, depth = [], [], 0
+    for token in tokens:
+        if token.text in "([":
+            depth += 1
+        elif token.text in ")]":
+            depth -= 1
+        if depth == 0 and token.text == sep and token.kind == "punct":
+            parts.append(current)
+            current = []
+        else:
+            current.append(token)
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _parenthesized(tokens: list[Token], start: int) -> tuple[list[Token], int]:
+    """Tokens between the ``(`` at ``start`` and its match, and the index after it."""
+    depth = 0
+    for i in range(start, len(tokens)):
+        if tokens[i].text == "(":
+            depth += 1
+        elif tokens[i].text == ")":
+            depth -= 1
+            if depth == 0:
+                return tokens[start + 1 : i], i + 1
+    return tokens[start + 1 :], len(tokens)
+
+
+def _table_name(tokens: list[Token], i: int) -> tuple[str | None, int]:
+    """Read ``[schema.]name``; ``None`` for anything outside ``public``."""
+    name = tokens[i].ident
+    if i + 2 < len(tokens) and tokens[i + 1].text == ".":
+        return (tokens[i + 2].ident if name == "public" else None), i + 3
+    return name, i + 1
+
+
+def _skip_words(tokens: list[Token], i: int, *words: str) -> int:
+    for word in words:
+        if i < len(tokens) and tokens[i].upper == word:
+            i += 1
+    return i
+
+
+def _idents(tokens: list[Token]) -> tuple[str, ...]:
+    return tuple(t.ident for t in tokens if t.kind in ("word", "quoted"))
+
+
+def _column(tokens: list[Token], table: Table) -> Column:
+    column = Column(tokens[0].ident)
+    i, type_words = 1, []
+    while i < len(tokens) and tokens[i].upper not in _CONSTRAINT_WORDS:
+        type_words.append(tokens[i].text)
+        i += 1
+    type_text = " ".join(type_words).lower().replace(" [ ]", "[]").replace(" [", "[").replace("[ ", "[")
+    column.type = re.sub(r"\s*\(.*?\)", "", type_text) or "text"
+    while i < len(tokens):
+        word = tokens[i].upper
+        if word == "DEFAULT":
+            j = i + 1
+            while j < len(tokens) and tokens[j].upper not in _CONSTRAINT_WORDS:
+                j += 1
+            column.default = tuple(tokens[i + 1 : j])
+            i = j
+        elif word == "PRIMARY":
+            table.primary_key = (column.name,)
+            i += 2
+        elif word == "UNIQUE":
+            table.unique.append((column.name,))
+            i += 1
+        elif word == "REFERENCES":
+            ref, i = _table_name(tokens, i + 1)
+            if ref:
+                table.foreign_keys[column.name] = ref
+        elif word == "ON" and i + 2 < len(tokens) and tokens[i + 1].upper == "DELETE":
+            action = tokens[i + 2].upper
+            if action in ("CASCADE", "SET"):
+                table.on_delete[column.name] = "CASCADE" if action == "CASCADE" else "SET NULL"
+            i += 3
+        else:
+            i += 1
+    return column
+
+
+def _table_constraint(tokens: list[Token], table: Table) -> None:
+    i = 2 if tokens[0].upper == "CONSTRAINT" else 0
+    if i >= len(tokens):
+        return
+    word = tokens[i].upper
+    if word in ("UNIQUE", "PRIMARY") and "(" in [t.text for t in tokens]:
+        start = [t.text for t in tokens].index("(")
+        cols, _ = _parenthesized(tokens, start)
+        if word == "UNIQUE":
+            table.unique.append(_idents(cols))
+        else:
+            table.primary_key = _idents(cols)
+    elif word == "FOREIGN":
+        cols, j = _parenthesized(tokens, i + 2)
+        j = _skip_words(tokens, j, "REFERENCES")
+        ref, _ = _table_name(tokens, j)
+        if ref and len(cols) == 1:
+            table.foreign_keys[cols[0].ident] = ref
+
+
+def _create_table(tokens: list[Token], schema: Schema) -> None:
+    i = _skip_words(tokens, 2, "IF", "NOT", "EXISTS")
+    name, i = _table_name(tokens, i)
+    if not name or i >= len(tokens) or tokens[i].text != "(":
+        return
+    table = schema.table(name)
+    body, _ = _parenthesized(tokens, i)
+    for part in _split_top_level(body):
+        if not part:
+            continue
+        if part[0].upper in _TABLE_CONSTRAINTS:
+            _table_constraint(part, table)
+        else:
+            table.add_column(_column(part, table))
+
+
+def _alter_table(tokens: list[Token], schema: Schema) -> None:
+    i = _skip_words(tokens, 2, "IF", "EXISTS", "ONLY")
+    name, i = _table_name(tokens, i)
+    if not name:
+        return
+    table = schema.table(name)
+    for action in _split_top_level(tokens[i:]):
+        words = [t.upper for t in action]
+        if words[:1] == ["ADD"]:
+            rest = action[1:]
+            if rest and rest[0].upper in _TABLE_CONSTRAINTS:
+                _table_constraint(rest, table)
+                continue
+            j = _skip_words(rest, 0, "COLUMN", "IF", "NOT", "EXISTS")
+            if j < len(rest):
+                table.add_column(_column(rest[j:], table))
+        elif words[:2] == ["RENAME", "COLUMN"] and len(action) >= 5:
+            schema.rename_column(name, action[2].ident, action[4].ident)
+        elif words[:1] == ["RENAME"] and len(action) >= 4 and words[2] == "TO":
+            schema.rename_column(name, action[1].ident, action[3].ident)
+        elif words[:2] == ["DROP", "COLUMN"]:
+            j = _skip_words(action, 2, "IF", "EXISTS")
+            if j < len(action):
+                table.columns.pop(action[j].ident, None)
+
+
+def _create_unique_index(tokens: list[Token], schema: Schema) -> None:
+    texts = [t.upper for t in tokens]
+    if "ON" not in texts:
+        return
+    name, i = _table_name(tokens, texts.index("ON") + 1)
+    while i < len(tokens) and tokens[i].text != "(":
+        i += 1
+    cols, end = _parenthesized(tokens, i)
+    # Partial indexes (... WHERE status = 'running') only constrain some rows; not modelled.
+    if "WHERE" in texts[end:]:
+        return
+    # Expression indexes (lower(email), ...) have nested parentheses; skip them.
+    if name and cols and all(t.kind in ("word", "quoted") or t.text == "," for t in cols):
+        schema.table(name).unique.append(_idents(cols))
+
+
+def evaluate(tokens: tuple[Token, ...] | list[Token], column: Column | None = None) -> Any:
+    """Value of a literal expression: ``'x'::jsonb``, ``NOW()``, ``TRUE``, ``42``."""
+    if not tokens:
+        return None
+    head = tokens[0]
+    if head.text == "(" and tokens[-1].text == ")":
+        return evaluate(tokens[1:-1], column)
+    if head.kind == "word":
+        word = head.upper
+        if word in ("GEN_RANDOM_UUID", "UUID_GENERATE_V4"):
+            return str(uuid.uuid4())
+        if word in ("NOW", "CURRENT_TIMESTAMP", "TIMEZONE"):
+            return now_iso()
+        if word == "CURRENT_DATE":
+            return datetime.now(timezone.utc).date().isoformat()
+        if word in ("TRUE", "FALSE"):
+            return word == "TRUE"
+        if word == "NULL":
+            return None
+        return None
+    if head.kind == "number":
+        return float(head.text) if "." in head.text else int(head.text)
+    if head.kind == "string":
+        text = head.text[1:-1].replace("''", "'")
+        cast = tokens[2].text.lower() if len(tokens) > 2 and tokens[1].kind == "cast" else ""
+        if cast in ("json", "jsonb") or (column and column.is_json):
+            return json.loads(text)
+        if cast.endswith("[]") or (len(tokens) > 3 and tokens[3].text == "[") or (column and column.is_array):
+            return parse_array(text)
+        return text
+    return None
+
+
+def parse_array(text: str) -> list[str]:
+    """``{a,"b c"}`` -> ``['a', 'b c']``."""
+    inner = text.strip()[1:-1]
+    if not inner:
+        return []
+    return [item.strip().strip('"') for item in re.findall(r'"(?:[^"\\]|\\.)*"|[^,]+', inner)]
+
+
+def _insert(tokens: list[Token], schema: Schema) -> None:
+    name, i = _table_name(tokens, 2)
+    if not name or i >= len(tokens) or tokens[i].text != "(":
+        return
+    cols, i = _parenthesized(tokens, i)
+    names = _idents(cols)
+    if i >= len(tokens) or tokens[i].upper != "VALUES":
+        return  # INSERT ... SELECT
+    table = schema.table(name)
+    rows, i = [], i + 1
+    while i < len(tokens) and tokens[i].text == "(":
+        values, i = _parenthesized(tokens, i)
+        parts = _split_top_level(values)
+        rows.append({c: evaluate(p, table.columns.get(c)) for c, p in zip(names, parts)})
+        if i < len(tokens) and tokens[i].text == ",":
+            i += 1
+    on_conflict = any(t.upper == "CONFLICT" for t in tokens[i:])
+    schema.seeds.append(Seed(name, rows, on_conflict))
+
+
+def parse(sql: str, schema: Schema | None = None) -> Schema:
+    schema = schema or Schema()
+    for statement in split_statements(sql):
+        tokens = tokenize(statement)
+        words = [t.upper for t in tokens[:3]]
+        if words[:2] == ["CREATE", "TABLE"]:
+            _create_table(tokens, schema)
+        elif words[:2] == ["ALTER", "TABLE"]:
+            _alter_table(tokens, schema)
+        elif words[:3] == ["CREATE", "UNIQUE", "INDEX"]:
+            _create_unique_index(tokens, schema)
+        elif words[:2] == ["INSERT", "INTO"]:
+            _insert(tokens, schema)
+    return schema
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> Schema:
+    """Every migration in file-name order, the way ``supabase db reset`` applies them."""
+    schema = Schema()
+    for path in sorted(directory.glob("*.sql")):
+        parse(path.read_text(encoding="utf-8"), schema)
+    return schema
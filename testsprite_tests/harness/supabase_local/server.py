@@ -0,0 +1,432 @@
+"""HTTP front end: ``/rest/v1`` (PostgREST) and ``/auth/v1`` (GoTrue) on one port.
+
+Point the app at it with ``NEXT_PUBLIC_SUPABASE_URL`` /
+``NEXT_PUBLIC_SUPABASE_ANON_KEY`` (see :meth:`LocalSupabase.env`). Row Level
+Security is not emulated: every request sees every row.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from .auth import ANON_KEY, SERVICE_ROLE_KEY, AuthError, GoTrue
+from .schema import Schema, load_migrations, now_iso
+from .store import Database, PostgrestError, Query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 54321
+FIXTURES_PATH = Path(__file__).with_name("fixtures.json")
+SINGLE_OBJECT = "application/vnd.pgrst.object+json"
+
+Rpc = Callable[["LocalSupabase", dict[str, Any]], Any]
+RPCS: dict[str, Rpc] = {}
+
+
+def rpc(name: str) -> Callable[[Rpc], Rpc]:
+    """Register a stand-in for a ``CREATE FUNCTION`` the app calls via ``supabase.rpc``."""
+
+    def register(fn: Rpc) -> Rpc:
+        RPCS[name] = fn
+        return fn
+
+    return register
+
+
+@rpc("update_user_email")
+def _update_user_email(server: "LocalSupabase", args: dict[str, Any]) -> None:
+    # scripts/create_update_email_func.sql
+    user = server.auth.users.get(args.get("target_user_id", ""))
+    if user is not None:
+        server.auth.update(user, {"email": args.get("new_email")})
+
+
+@rpc("auto_close_worklogs")
+def _auto_close_worklogs(server: "LocalSupabase", args: dict[str, Any]) -> list[dict[str, Any]]:
+    # supabase/migrations/23_bulk_auto_close_worklogs.sql
+    stale = Query.from_params(
+        [("date", f"eq.{args['p_date']}"), ("type", f"eq.{args['p_type']}"), ("status", "not.in.(서명완료,근무종료)")]
+    )
+    rows, _ = server.db.select("worklogs", stale)
+    closed = []
+    for row in rows:
+        signatures = row.get("signatures") or {}
+        pre_signed = bool(signatures.get("operation"))
+        if not pre_signed:
+            signatures = {**signatures, "operation": "System Auto-Close", "leader": "System Auto-Close"}
+        summary = args["p_presigned_summary"] if pre_signed else args["p_summary"]
+        patch = {
+            "status": "근무종료",
+            "signature": "4/4",
+            "signatures": signatures,
+            "system_issues": [*(row.get("system_issues") or []), {"id": str(uuid.uuid4()), "summary": summary}],
+        }
+        server.db.update("worklogs", Query.from_params([("id", f"eq.{row['id']}")]), patch)
+        closed.append({"id": row["id"]})
+    return closed
+
+
+def _patch_path(doc: Any, path: list[str], op: dict[str, Any]) -> Any:
+    if not path:
+        return op.get("value") if op["op"] == "set" else None
+    key, rest = path[0], path[1:]
+    if op["op"] == "remove" and (not isinstance(doc, dict) or key not in doc):
+        return doc
+    doc = dict(doc) if isinstance(doc, dict) else {}
+    if op["op"] == "remove" and not rest:
+        doc.pop(key, None)
+    else:
+        doc[key] = _patch_path(doc.get(key), rest, op)
+    return doc
+
+
+@rpc("patch_worklog")
+def _patch_worklog(server: "LocalSupabase", args: dict[str, Any]) -> bool:
+    # supabase/migrations/28_patch_worklog.sql
+    target = Query.from_params([("id", f"eq.{args['p_id']}"), ("deleted_at", "is.null")])
+    rows, _ = server.db.select("worklogs", target)
+    if not rows:
+        return False
+    patch: dict[str, Any] = {}
+    for op in args.get("p_ops") or []:
+        column, path = op["path"][0], op["path"][1:]
+        if column not in ("channel_logs", "workers", "system_issues"):
+            raise PostgrestError(400, "P0001", f"patch_worklog: {column} is not a patchable column")
+        patch[column] = _patch_path(patch.get(column, rows[0].get(column)), path, op)
+    if patch:
+        server.db.update("worklogs", target, patch)
+    return True
+
+
+@rpc("assign_group_members")
+def _assign_group_members(server: "LocalSupabase", args: dict[str, Any]) -> dict[str, int]:
+    # supabase/migrations/30_assign_group_members.sql
+    groups = {g["name"]: g["id"] for g in server.db.select("groups", Query.from_params([]))[0]}
+    roster = [
+        (user_id, groups.get(team), order)
+        for team, user_ids in (args.get("p_assignments") or {}).items()
+        if team == "Unassigned" or team in groups
+        for order, user_id in enumerate(user_ids, start=1)
+    ]
+    removed = written = 0
+    for user_id, group_id, order in roster:
+        memberships, _ = server.db.select("group_members", Query.from_params([("user_id", f"eq.{user_id}")]))
+        role = next((m["role"] for m in sorted(memberships, key=lambda m: m["group_id"] != group_id)), "영상")
+        for m in memberships:
+            if m["group_id"] != group_id:
+                server.db.delete("group_members", Query.from_params([("id", f"eq.{m['id']}")]))
+                removed += 1
+        if group_id is None:
+            continue
+        current = next((m for m in memberships if m["group_id"] == group_id), None)
+        if current is None:
+            server.db.insert("group_members", [{"group_id": group_id, "user_id": user_id, "display_order": order, "role": role}])
+            written += 1
+        elif current.get("display_order") != order:
+            server.db.update("group_members", Query.from_params([("id", f"eq.{current['id']}")]), {"display_order": order})
+            written += 1
+    assigned = sum(1 for _, group_id, _ in roster if group_id is not None)
+    return {"assigned": assigned, "removed": removed, "written": written}
+
+
+@rpc("cron_begin_run")
+def _cron_begin_run(server: "LocalSupabase", args: dict[str, Any]) -> str | None:
+    # supabase/migrations/24_cron_run_ledger.sql
+    job = args["p_job"]
+    minutes = int(str(args.get("p_lease") or "5 minutes").split()[0])
+    running = Query.from_params([("job", f"eq.{job}"), ("status", "eq.running")])
+    stale_before = (datetime.now(timezone.utc) - timedelta(minutes=minutes)).isoformat()
+    for run in server.db.select("cron_runs", running)[0]:
+        if run["started_at"] < stale_before:
+            server.db.update("cron_runs", Query.from_params([("id", f"eq.{run['id']}")]), {"status": "abandoned", "finished_at": now_iso()})
+    if server.db.select("cron_runs", running)[0]:
+        return None
+    return server.db.insert("cron_runs", [{"job": job}])[0]["id"]
+
+
+@rpc("cron_finish_run")
+def _cron_finish_run(server: "LocalSupabase", args: dict[str, Any]) -> None:
+    # supabase/migrations/31_cron_runs_retention.sql
+    patch = {"status": args["p_status"], "finished_at": now_iso(), "result": args.get("p_result"), "error": args.get("p_error")}
+    server.db.update("cron_runs", Query.from_params([("id", f"eq.{args['p_run_id']}"), ("status", "eq.running")]), patch)
+    finished = server.db.select("cron_runs", Query.from_params([("id", f"eq.{args['p_run_id']}")]))[0]
+    if not finished:
+        return
+    now = datetime.now(timezone.utc)
+    for run in server.db.select("cron_runs", Query.from_params([("job", f"eq.{finished[0]['job']}")]))[0]:
+        keep = timedelta(days=30 if run["status"] == "failed" else 7)
+        if run["status"] != "running" and run["started_at"] < (now - keep).isoformat():
+            server.db.delete("cron_runs", Query.from_params([("id", f"eq.{run['id']}")]))
+
+
+class LocalSupabase:
+    """Migrations + fixtures in memory, served until :meth:`stop`."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        schema: Schema | None = None,
+        fixtures: Path | None = FIXTURES_PATH,
+    ):
+        self.db = Database(schema or load_migrations())
+        self.auth = GoTrue(self.db)
+        self.roles: dict[str, tuple[str, str]] = {}
+        if fixtures:
+            self.load_fixtures(json.loads(fixtures.read_text(encoding="utf-8")))
+        self.httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict[str, str]:
+        """Variables for ``pnpm dev`` and for the harness's role logins."""
+        env = {
+            "NEXT_PUBLIC_SUPABASE_URL": self.url,
+            "NEXT_PUBLIC_SUPABASE_ANON_KEY": ANON_KEY,
+            "SUPABASE_SERVICE_ROLE_KEY": SERVICE_ROLE_KEY,
+        }
+        for role, (email, password) in self.roles.items():
+            env[f"TESTSPRITE_{role.upper()}_EMAIL"] = email
+            env[f"TESTSPRITE_{role.upper()}_PASSWORD"] = password
+        return env
+
+    def export_credentials(self) -> None:
+        """Default ``TESTSPRITE_<ROLE>_*`` to the fixture accounts (see harness/auth_state.py)."""
+        for key, value in self.env().items():
+            if key.startswith("TESTSPRITE_"):
+                os.environ.setdefault(key, value)
+
+    def load_fixtures(self, fixtures: dict[str, Any]) -> None:
+        groups = {g["name"]: g["id"] for g in self.db.select("groups", Query())[0]}
+        for entry in fixtures.get("users", []):
+            user = self.auth.sign_up(entry["email"], entry["password"], {"name": entry["name"]})
+            self.db.update("users", Query.from_params([("id", f"eq.{user.id}")]), entry.get("profile", {}))
+            members = [
+                {"group_id": groups[m["group"]], "user_id": user.id, **{k: v for k, v in m.items() if k != "group"}}
+                for m in entry.get("groups", [])
+            ]
+            self.db.insert("group_members", members)
+            if entry.get("harness_role"):
+                self.roles[entry["harness_role"]] = (entry["email"], entry["password"])
+        for table, rows in fixtures.get("tables", {}).items():
+            self.db.insert(table, rows)
+
+    def start(self) -> "LocalSupabase":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="supabase-local", daemon=True)
+        self._thread.start()
+        logger.info("local Supabase listening on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "LocalSupabase":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+class _Response(Exception):
+    def __init__(self, status: int, body: Any = None, headers: dict[str, str] | None = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+def _prefer(header: str | None) -> dict[str, str]:
+    prefs = {}
+    for item in (header or "").split(","):
+        key, _, value = item.strip().partition("=")
+        if key:
+            prefs[key] = value
+    return prefs
+
+
+def _content_range(offset: int, count: int, total: int | None) -> str:
+    span = f"{offset}-{offset + count - 1}" if count else "*"
+    return f"{span}/{'*' if total is None else total}"
+
+
+def _handler_for(server: LocalSupabase) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug("%s %s", self.address_string(), format % args)
+
+        def do_OPTIONS(self) -> None:
+            self._send(204, None)
+
+        def do_GET(self) -> None:
+            self._dispatch()
+
+        do_HEAD = do_POST = do_PATCH = do_PUT = do_DELETE = do_GET
+
+        def _dispatch(self) -> None:
+            url = urlsplit(self.path)
+            self.params = parse_qsl(url.query, keep_blank_values=True)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                self.body = json.loads(raw) if raw else None
+                parts = [p for p in url.path.split("/") if p]
+                if parts[:2] == ["rest", "v1"] and len(parts) == 4 and parts[2] == "rpc":
+                    self._rpc(parts[3])
+                elif parts[:2] == ["rest", "v1"] and len(parts) == 3:
+                    self._rest(parts[2])
+                elif parts[:2] == ["auth", "v1"] and len(parts) == 3:
+                    self._auth(parts[2])
+                else:
+                    raise _Response(404, {"message": "no Route matched with those values"})
+            except _Response as response:
+                self._send(response.status, response.body, response.headers)
+            except PostgrestError as error:
+                self._send(error.status, error.body())
+            except AuthError as error:
+                self._send(error.status, error.body())
+            except json.JSONDecodeError as error:
+                self._send(400, PostgrestError(400, "PGRST102", f"Empty or invalid json: {error}").body())
+
+        # -- PostgREST ----------------------------------------------------
+
+        def _rest(self, table: str) -> None:
+            query = Query.from_params(self.params)
+            prefer = _prefer(self.headers.get("Prefer"))
+            with server.db.lock:
+                rows, total = self._execute(table, query, prefer)
+            headers = {}
+            offset = query.offsets.get((), 0)
+            if "count" in prefer or self.command in ("GET", "HEAD"):
+                headers["Content-Range"] = _content_range(offset, len(rows), total if "count" in prefer else None)
+            if self.headers.get("Accept", "").startswith(SINGLE_OBJECT):
+                if len(rows) != 1:
+                    raise PostgrestError(
+                        406,
+                        "PGRST116",
+                        "JSON object requested, multiple (or no) rows returned",
+                        f"The result contains {len(rows)} rows",
+                    )
+                self._send(200, rows[0], headers, content_type=SINGLE_OBJECT)
+                return
+            if self.command in ("GET", "HEAD"):
+                self._send(200, rows, headers)
+            elif prefer.get("return") == "representation":
+                self._send(201 if self.command == "POST" else 200, rows, headers)
+            else:
+                self._send(201 if self.command == "POST" else 204, None, headers)
+
+        def _execute(self, table: str, query: Query, prefer: dict[str, str]) -> tuple[list[dict], int]:
+            db = server.db
+            if self.command in ("GET", "HEAD"):
+                return db.select(table, query)
+            if self.command == "POST":
+                payload = self.body if isinstance(self.body, list) else [self.body or {}]
+                resolution = prefer.get("resolution")
+                written = db.insert(
+                    table,
+                    payload,
+                    on_conflict=query.on_conflict,
+                    merge_duplicates=resolution == "merge-duplicates",
+                    ignore_duplicates=resolution == "ignore-duplicates",
+                )
+            elif self.command == "PATCH":
+                written = db.update(table, query, self.body or {})
+            elif self.command == "DELETE":
+                written = db.delete(table, query)
+            else:
+                raise _Response(405, {"message": f"{self.command} not allowed"})
+            shaped = [db.project(table, row, query.select, query) for row in written]
+            shaped = [row for row in shaped if row is not None]
+            return shaped, len(shaped)
+
+        def _rpc(self, name: str) -> None:
+            fn = RPCS.get(name)
+            if fn is None:
+                raise PostgrestError(
+                    404,
+                    "PGRST202",
+                    f"Could not find the function public.{name} in the schema cache",
+                    hint="Register a stand-in with harness.supabase_local.server.rpc",
+                )
+            args = self.body if isinstance(self.body, dict) else dict(self.params)
+            with server.db.lock:
+                result = fn(server, args)
+            if result is None:
+                self._send(204, None)
+            else:
+                self._send(200, result)
+
+        # -- GoTrue -------------------------------------------------------
+
+        def _auth(self, endpoint: str) -> None:
+            auth, body = server.auth, self.body or {}
+            if endpoint == "token" and self.command == "POST":
+                grant = dict(self.params).get("grant_type")
+                if grant == "password":
+                    self._send(200, auth.password_grant(body.get("email", ""), body.get("password", "")))
+                elif grant == "refresh_token":
+                    self._send(200, auth.refresh_grant(body.get("refresh_token", "")))
+                else:
+                    raise AuthError(400, "unsupported_grant_type", f"unsupported grant_type: {grant}")
+            elif endpoint == "signup" and self.command == "POST":
+                with server.db.lock:
+                    user = auth.sign_up(body.get("email", ""), body.get("password", ""), body.get("data"))
+                # mailer_autoconfirm: sign-up returns a session right away.
+                self._send(200, auth.session(user))
+            elif endpoint == "user" and self.command == "GET":
+                self._send(200, auth.user_for(self.headers.get("Authorization")).to_json())
+            elif endpoint == "user" and self.command == "PUT":
+                user = auth.user_for(self.headers.get("Authorization"))
+                with server.db.lock:
+                    self._send(200, auth.update(user, body).to_json())
+            elif endpoint == "logout" and self.command == "POST":
+                try:
+                    auth.logout(auth.user_for(self.headers.get("Authorization")))
+                except AuthError:
+                    pass
+                self._send(204, None)
+            elif endpoint == "authorize":
+                raise AuthError(400, "validation_failed", "Unsupported provider: provider is not enabled")
+            elif endpoint == "settings":
+                self._send(200, {"external": {"email": True}, "disable_signup": False, "mailer_autoconfirm": True})
+            elif endpoint == "health":
+                self._send(200, {"name": "GoTrue", "description": "harness.supabase_local"})
+            else:
+                raise _Response(404, {"code": 404, "error_code": "not_found", "msg": f"/auth/v1/{endpoint} is not implemented"})
+
+        # -- response -----------------------------------------------------
+
+        def _send(self, status: int, body: Any, headers: dict[str, str] | None = None, content_type: str = "application/json") -> None:
+            payload = b"" if body is None else json.dumps(body, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+            self.send_header("Access-Control-Allow-Methods", "GET, HEAD, POST, PATCH, PUT, DELETE, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", self.headers.get("Access-Control-Request-Headers") or "*")
+            self.send_header("Access-Control-Expose-Headers", "Content-Range, X-Supabase-Api-Version")
+            self.send_header("Vary", "Origin")
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            if payload:
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(payload)
+
+    return Handler
@@ -0,0 +1,544 @@
+"""In-memory tables and the PostgREST query language on top of them.
+
+Covers what ``@supabase/supabase-js`` sends for the calls in ``store/``,
+``app/`` and ``components/``: column lists with aliases, casts and JSON paths,
+resource embedding (``user:users(name)``, ``users!created_by(name)``,
+``comments(count)``), horizontal filters including ``or=(...)`` and ``not.``,
+``order`` / ``limit`` / ``offset``, and upserts via ``on_conflict``.
+
+Tables that no migration creates (``posts``, ``broadcast_schedules``, ...)
+are schemaless: they start empty and accept whatever columns are written.
+"""
+
+import copy
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from .schema import Schema, Table, now_iso
+
+Row = dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ][\d:.]+(?:Z|[+-]\d{2}(?::?\d{2})?)?)?$")
+_JSON_PATH = re.compile(r"(->>?)")
+
+
+class PostgrestError(Exception):
+    """Rendered as PostgREST's ``{code, message, details, hint}`` error body."""
+
+    def __init__(self, status: int, code: str, message: str, details: str | None = None, hint: str | None = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+        self.hint = hint
+
+    def body(self) -> dict[str, Any]:
+        return {"code": self.code, "message": self.message, "details": self.details, "hint": self.hint}
+
+
+# --- select= ---------------------------------------------------------------
+
+
+@dataclass
+class Field:
+    name: str
+    alias: str | None = None
+    path: tuple[tuple[str, str], ...] = ()
+
+    @property
+    def key(self) -> str:
+        return self.alias or (self.path[-1][1] if self.path else self.name)
+
+
+@dataclass
+class Embed:
+    table: str
+    alias: str | None = None
+    hint: str | None = None
+    inner: bool = False
+    spread: bool = False
+    nodes: list["Field | Embed"] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return self.alias or self.table
+
+
+def _split(text: str, sep: str = ",") -> list[str]:
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _alias(item: str) -> tuple[str | None, str]:
+    match = re.match(r"^([^:()]+):(?!:)(.+)$", item)
+    return (match.group(1).strip(), match.group(2).strip()) if match else (None, item)
+
+
+def _column_path(expr: str) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """``data->a->>b`` -> ``("data", (("->", "a"), ("->>", "b")))``."""
+    parts = _JSON_PATH.split(expr)
+    steps = tuple((parts[i], parts[i + 1].strip("'\"")) for i in range(1, len(parts) - 1, 2))
+    return parts[0], steps
+
+
+def parse_select(text: str | None) -> list[Field | Embed]:
+    nodes: list[Field | Embed] = []
+    for item in _split(re.sub(r"\s+", "", text or "*")):
+        if item.endswith(")") and "(" in item:
+            head, inner = item[: item.index("(")], item[item.index("(") + 1 : -1]
+            spread = head.startswith("...")
+            alias, head = _alias(head.removeprefix("..."))
+            table, *hints = head.split("!")
+            inner_join = "inner" in hints
+            hint = next((h for h in hints if h not in ("inner", "left")), None)
+            nodes.append(Embed(table, alias, hint, inner_join, spread, parse_select(inner or "*")))
+        else:
+            alias, expr = _alias(item)
+            name, path = _column_path(expr.split("::")[0])
+            nodes.append(Field(name, alias, path))
+    return nodes
+
+
+def _json_get(value: Any, path: tuple[tuple[str, str], ...]) -> Any:
+    for op, key in path:
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.lstrip("-").isdigit():
+            index = int(key)
+            value = value[index] if -len(value) <= index < len(value) else None
+        else:
+            return None
+        if op == "->>" and value is not None and not isinstance(value, str):
+            value = json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else str(value).lower() if isinstance(value, bool) else str(value)
+    return value
+
+
+# --- filters -----------------------------------------------------------------
+
+
+def _datetime(text: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(text.replace(" ", "T").replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _comparable(value: Any, literal: str) -> tuple[Any, Any]:
+    """Coerce a filter literal to the stored value's type, like PostgreSQL would."""
+    if isinstance(value, bool):
+        return value, literal.lower() in ("true", "t", "1", "yes")
+    if isinstance(value, (int, float)):
+        try:
+            return value, float(literal)
+        except ValueError:
+            return str(value), literal
+    if isinstance(value, str):
+        if _ISO_DATE.match(value) and _ISO_DATE.match(literal):
+            if len(value) == 10:
+                # date column vs timestamp literal: compare the date part.
+                return value, literal[:10]
+            left, right = _datetime(value), _datetime(literal)
+            if left and right:
+                return left, right
+        return value, literal
+    return json.dumps(value, sort_keys=True), literal
+
+
+def _like(pattern: str, flags: int = 0) -> re.Pattern:
+    regex = "".join(".*" if ch in "%*" else "." if ch == "_" else re.escape(ch) for ch in pattern)
+    return re.compile(f"^{regex}$", flags | re.DOTALL)
+
+
+def _list_literal(text: str) -> list[str]:
+    inner = text.strip()
+    if inner[:1] in "({" and inner[-1:] in ")}":
+        inner = inner[1:-1]
+    return [item.strip('"') for item in _split(inner)] if inner else []
+
+
+def _container(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _list_literal(text)
+
+
+def _contains(outer: Any, inner: Any) -> bool:
+    if isinstance(outer, dict) and isinstance(inner, dict):
+        return all(k in outer and _contains(outer[k], v) for k, v in inner.items())
+    if isinstance(outer, list):
+        items = inner if isinstance(inner, list) else [inner]
+        return all(any(_contains(o, i) for o in outer) for i in items)
+    return outer == inner or (outer is not None and str(outer) == str(inner))
+
+
+def _operator(op: str, literal: str) -> Callable[[Any], bool]:
+    def compare(test: Callable[[Any, Any], bool]) -> Callable[[Any], bool]:
+        return lambda value: value is not None and test(*_comparable(value, literal))
+
+    if op == "eq":
+        return compare(lambda a, b: a == b)
+    if op == "neq":
+        return compare(lambda a, b: a != b)
+    if op == "gt":
+        return compare(lambda a, b: a > b)
+    if op == "gte":
+        return compare(lambda a, b: a >= b)
+    if op == "lt":
+        return compare(lambda a, b: a < b)
+    if op == "lte":
+        return compare(lambda a, b: a <= b)
+    if op in ("like", "ilike"):
+        pattern = _like(literal, re.IGNORECASE if op == "ilike" else 0)
+        return lambda value: value is not None and bool(pattern.match(str(value)))
+    if op in ("match", "imatch"):
+        pattern = re.compile(literal, re.IGNORECASE if op == "imatch" else 0)
+        return lambda value: value is not None and bool(pattern.search(str(value)))
+    if op == "is":
+        expected = {"null": None, "true": True, "false": False, "unknown": None}.get(literal.lower(), literal)
+        return lambda value: value is expected or value == expected
+    if op == "in":
+        options = _list_literal(literal)
+        return lambda value: value is not None and any(a == b for a, b in (_comparable(value, o) for o in options))
+    if op == "cs":
+        needle = _container(literal)
+        return lambda value: value is not None and _contains(value, needle)
+    if op == "cd":
+        haystack = _container(literal)
+        return lambda value: value is not None and _contains(haystack, value)
+    if op == "ov":
+        options = _container(literal)
+        return lambda value: isinstance(value, list) and any(_contains(value, o) for o in options)
+    raise PostgrestError(400, "PGRST100", f'"failed to parse filter ({op}.{literal})"')
+
+
+def parse_filter(column: str, expr: str) -> Predicate:
+    """``column=expr`` from the query string, e.g. ``status=not.in.(a,b)``."""
+    negate = expr.startswith("not.")
+    if negate:
+        expr = expr[4:]
+    if column in ("or", "and"):
+        return _logic(column, expr, negate)
+    op, _, literal = expr.partition(".")
+    test = _operator(op, literal)
+    name, path = _column_path(column)
+
+    def predicate(row: Row) -> bool:
+        return test(_json_get(row.get(name), path)) != negate
+
+    return predicate
+
+
+def _logic(kind: str, expr: str, negate: bool = False) -> Predicate:
+    """``(a.eq.1,b.is.null,and(c.gt.2,d.lt.3))``"""
+    predicates = []
+    for term in _split(expr.strip()[1:-1]):
+        nested = re.match(r"^(not\.)?(and|or)(\(.*\))$", term)
+        if nested:
+            predicates.append(_logic(nested.group(2), nested.group(3), bool(nested.group(1))))
+            continue
+        column, _, rest = term.partition(".")
+        predicates.append(parse_filter(column, rest))
+    combine = all if kind == "and" else any
+    return lambda row: combine(p(row) for p in predicates) != negate
+
+
+@dataclass
+class Order:
+    column: str
+    descending: bool = False
+    nulls_first: bool = False
+
+
+def parse_order(text: str) -> list[Order]:
+    orders = []
+    for item in _split(text):
+        column, *flags = item.split(".")
+        descending = "desc" in flags
+        nulls_first = "nullsfirst" in flags or (descending and "nullslast" not in flags)
+        orders.append(Order(column, descending, nulls_first))
+    return orders
+
+
+def _sort_key(value: Any) -> tuple[int, Any]:
+    if isinstance(value, bool):
+        return 0, int(value)
+    if isinstance(value, (int, float)):
+        return 0, value
+    if isinstance(value, str):
+        return 1, value
+    return 2, json.dumps(value, sort_keys=True)
+
+
+def apply_order(items: list[Any], orders: list[Order], row_of: Callable[[Any], Row] = lambda r: r) -> list[Any]:
+    # Stable sorts from the last key to the first; NULLs are partitioned out per key.
+    for order in reversed(orders):
+        name, path = _column_path(order.column)
+        value = lambda item: _json_get(row_of(item).get(name), path)
+        nulls = [item for item in items if value(item) is None]
+        values = sorted((item for item in items if value(item) is not None), key=lambda item: _sort_key(value(item)), reverse=order.descending)
+        items = nulls + values if order.nulls_first else values + nulls
+    return items
+
+
+# --- requests ------------------------------------------------------------------
+
+
+@dataclass
+class Query:
+    """The parts of a PostgREST query string, split by embedded resource.
+
+    ``scope`` is ``()`` for the top-level table and ``("author",)`` for
+    ``author.name=eq.x`` / ``author.order=...`` style parameters.
+    """
+
+    select: list[Field | Embed] = field(default_factory=lambda: [Field("*")])
+    filters: dict[tuple[str, ...], list[Predicate]] = field(default_factory=dict)
+    orders: dict[tuple[str, ...], list[Order]] = field(default_factory=dict)
+    limits: dict[tuple[str, ...], int] = field(default_factory=dict)
+    offsets: dict[tuple[str, ...], int] = field(default_factory=dict)
+    on_conflict: tuple[str, ...] = ()
+
+    @classmethod
+    def from_params(cls, params: list[tuple[str, str]]) -> "Query":
+        query = cls()
+        for key, value in params:
+            *scope, name = key.split(".") if not _JSON_PATH.search(key) else [key]
+            scope = tuple(scope)
+            if key == "select":
+                query.select = parse_select(value)
+            elif key == "on_conflict":
+                query.on_conflict = tuple(c.strip() for c in value.split(","))
+            elif key == "columns":
+                continue
+            elif name == "order":
+                query.orders[scope] = parse_order(value)
+            elif name == "limit":
+                query.limits[scope] = int(value)
+            elif name == "offset":
+                query.offsets[scope] = int(value)
+            else:
+                query.filters.setdefault(scope, []).append(parse_filter(name, value))
+        return query
+
+    def matches(self, row: Row, scope: tuple[str, ...] = ()) -> bool:
+        return all(p(row) for p in self.filters.get(scope, ()))
+
+    def page(self, items: list[Any], scope: tuple[str, ...] = ()) -> list[Any]:
+        start = self.offsets.get(scope, 0)
+        limit = self.limits.get(scope)
+        return items[start : None if limit is None else start + limit]
+
+
+def _singular(name: str) -> str:
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    return name[:-1] if name.endswith("s") else name
+
+
+class Database:
+    """Rows per table, guarded by one lock; every method returns deep copies."""
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.rows: dict[str, list[Row]] = {name: [] for name in schema.tables}
+        self.lock = threading.RLock()
+        for seed in schema.seeds:
+            self.insert(seed.table, seed.rows, ignore_duplicates=seed.on_conflict)
+
+    def meta(self, table: str) -> Table:
+        return self.schema.table(table)
+
+    def _rows(self, table: str) -> list[Row]:
+        return self.rows.setdefault(table, [])
+
+    def columns(self, table: str) -> set[str]:
+        names = set(self.meta(table).columns)
+        for row in self._rows(table):
+            names.update(row)
+        return names
+
+    # -- embedding --------------------------------------------------------
+
+    def relation(self, base: str, target: str, hint: str | None) -> tuple[str, str]:
+        """``("one", column on base)`` for many-to-one, ``("many", column on target)`` otherwise."""
+        base_columns, target_columns = self.columns(base), self.columns(target)
+        if hint:
+            for prefix, kind, columns in ((base, "one", base_columns), (target, "many", target_columns)):
+                # users!created_by(...) or users!posts_author_id_fkey(...)
+                constraint = hint[len(prefix) + 1 : -len("_fkey")] if hint.startswith(f"{prefix}_") and hint.endswith("_fkey") else None
+                for column in (hint, constraint):
+                    if column and column in columns:
+                        return kind, column
+        one = [c for c, ref in self.meta(base).foreign_keys.items() if ref == target]
+        one = one or [c for c in (f"{_singular(target)}_id",) if c in base_columns]
+        if one:
+            return "one", one[0]
+        many = [c for c, ref in self.meta(target).foreign_keys.items() if ref == base]
+        many = many or [c for c in (f"{_singular(base)}_id",) if c in target_columns]
+        if many:
+            return "many", many[0]
+        # Tables no migration creates have no declared columns until rows arrive;
+        # assume the conventional foreign key name rather than failing.
+        if not self.meta(target).columns:
+            return "many", f"{_singular(base)}_id"
+        if not self.meta(base).columns:
+            return "one", f"{_singular(target)}_id"
+        raise PostgrestError(
+            400,
+            "PGRST200",
+            f"Could not find a relationship between '{base}' and '{target}' in the schema cache",
+            hint=f"Looked for {base}.{_singular(target)}_id and {target}.{_singular(base)}_id",
+        )
+
+    def _embed(self, base: str, row: Row, node: Embed, query: Query, scope: tuple[str, ...]) -> tuple[Any, bool]:
+        """The embedded value and whether the parent row survives ``!inner``."""
+        kind, column = self.relation(base, node.table, node.hint)
+        pk = self.meta(node.table).primary_key[0]
+        if kind == "one":
+            key = row.get(column)
+            match = next((r for r in self._rows(node.table) if key is not None and r.get(pk) == key), None)
+            if match is None or not query.matches(match, scope):
+                return None, not node.inner
+            return self.project(node.table, match, node.nodes, query, scope), True
+        key = row.get(self.meta(base).primary_key[0])
+        children = [r for r in self._rows(node.table) if r.get(column) == key and query.matches(r, scope)]
+        if [n.name for n in node.nodes if isinstance(n, Field)] == ["count"] and "count" not in self.columns(node.table):
+            return [{"count": len(children)}], True
+        children = query.page(apply_order(children, query.orders.get(scope, [])), scope)
+        projected = [self.project(node.table, child, node.nodes, query, scope) for child in children]
+        return projected, bool(projected) or not node.inner
+
+    def project(self, table: str, row: Row, nodes: list[Field | Embed], query: Query, scope: tuple[str, ...] = ()) -> Row | None:
+        """Shape ``row`` per ``select=``; ``None`` if an ``!inner`` embed drops it."""
+        out: Row = {}
+        for node in nodes:
+            if isinstance(node, Embed):
+                value, keep = self._embed(table, row, node, query, scope + (node.key,))
+                if not keep:
+                    return None
+                if node.spread and isinstance(value, dict):
+                    out.update(value)
+                else:
+                    out[node.key] = value
+            elif node.name == "*":
+                out.update(copy.deepcopy(row))
+            else:
+                out[node.key] = copy.deepcopy(_json_get(row.get(node.name), node.path))
+        return out
+
+    # -- reads and writes -------------------------------------------------
+
+    def select(self, table: str, query: Query) -> tuple[list[Row], int]:
+        """Matching rows (after ``limit``/``offset``) and the total count before paging."""
+        with self.lock:
+            rows = [r for r in self._rows(table) if query.matches(r)]
+            pairs = [(r, self.project(table, r, query.select, query)) for r in rows]
+            pairs = [(r, p) for r, p in pairs if p is not None]
+            pairs = apply_order(pairs, query.orders.get((), []), row_of=lambda pair: pair[0])
+            return [p for _, p in query.page(pairs)], len(pairs)
+
+    def _unique_keys(self, table: str) -> list[tuple[str, ...]]:
+        meta = self.meta(table)
+        return [meta.primary_key, *meta.unique]
+
+    def _find(self, table: str, key: tuple[str, ...], row: Row) -> Row | None:
+        if any(row.get(c) is None for c in key):
+            return None
+        values = [row[c] for c in key]
+        return next((r for r in self._rows(table) if [r.get(c) for c in key] == values), None)
+
+    def insert(
+        self,
+        table: str,
+        rows: list[Row],
+        *,
+        on_conflict: tuple[str, ...] = (),
+        merge_duplicates: bool = False,
+        ignore_duplicates: bool = False,
+    ) -> list[Row]:
+        """Insert (or upsert) ``rows``; returns the stored rows that were written."""
+        with self.lock:
+            meta, written = self.meta(table), []
+            target = on_conflict or meta.primary_key
+            for payload in rows:
+                if merge_duplicates or ignore_duplicates:
+                    existing = self._find(table, target, payload)
+                    if existing is not None:
+                        if merge_duplicates:
+                            existing.update(copy.deepcopy(payload))
+                            self._touch(table, existing, payload)
+                            written.append(existing)
+                        continue
+                row = {name: column.default_value() for name, column in meta.columns.items()}
+                row.update(copy.deepcopy(payload))
+                conflict = next((k for k in self._unique_keys(table) if self._find(table, k, row)), None)
+                if conflict:
+                    if ignore_duplicates:
+                        continue
+                    raise PostgrestError(
+                        409,
+                        "23505",
+                        f'duplicate key value violates unique constraint "{table}_{"_".join(conflict)}_key"',
+                        f"Key ({', '.join(conflict)})=({', '.join(str(row[c]) for c in conflict)}) already exists.",
+                    )
+                self._rows(table).append(row)
+                written.append(row)
+            return copy.deepcopy(written)
+
+    def _touch(self, table: str, row: Row, patch: Row) -> None:
+        # The update_*_updated_at triggers from 01_create_tables.sql.
+        if "updated_at" in self.meta(table).columns and "updated_at" not in patch:
+            row["updated_at"] = now_iso()
+
+    def update(self, table: str, query: Query, patch: Row) -> list[Row]:
+        with self.lock:
+            matched = [r for r in self._rows(table) if query.matches(r)]
+            for row in matched:
+                row.update(copy.deepcopy(patch))
+                self._touch(table, row, patch)
+            return copy.deepcopy(matched)
+
+    def delete(self, table: str, query: Query) -> list[Row]:
+        with self.lock:
+            removed = [r for r in self._rows(table) if query.matches(r)]
+            self._remove(table, removed)
+            return copy.deepcopy(removed)
+
+    def _remove(self, table: str, removed: list[Row]) -> None:
+        if not removed:
+            return
+        ids = {id(r) for r in removed}
+        self.rows[table] = [r for r in self._rows(table) if id(r) not in ids]
+        keys = {r.get(self.meta(table).primary_key[0]) for r in removed}
+        # ON DELETE CASCADE / SET NULL from the migrations.
+        for other, meta in list(self.schema.tables.items()):
+            for column, ref in meta.foreign_keys.items():
+                if ref != table or column not in meta.on_delete:
+                    continue
+                dependents = [r for r in self._rows(other) if r.get(column) in keys]
+                if meta.on_delete[column] == "CASCADE":
+                    self._remove(other, dependents)
+                else:
+                    for row in dependents:
+                        row[column] = None
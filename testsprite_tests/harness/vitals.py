@@ -0,0 +1,144 @@
+"""Navigation timing and web vitals for every navigation a case makes.
+
+:class:`Recorder` is a context hook. Its init script keeps one record per
+navigation, both full loads (``page.goto``, reloads) and client-side route
+changes (sidebar links go through ``history.pushState``), and reports it to
+Python through an exposed binding whenever it changes:
+
+* ``ttfbMs``, ``domContentLoadedMs``, ``loadMs``: from the Navigation Timing
+  entry (full loads only);
+* ``renderMs``: until the DOM first stays quiet for 300ms after the
+  navigation starts, so a clock ticking once a second doesn't extend it;
+* ``lcpMs``: largest contentful paint (full loads only, as in the browser);
+* ``cls``, ``longTasks``, ``longTaskMs``: layout shifts and long tasks since
+  the navigation started;
+* ``heapMB``: ``performance.memory.usedJSHeapSize`` (Chromium);
+* ``ttiMs``: the later of ``renderMs``, ``domContentLoadedMs`` and the end of
+  the last long task before the DOM went quiet;
+* ``requests``, ``transferKB``, ``supabaseQueries``: resources fetched before
+  the DOM went quiet (Resource Timing, so cross-origin bytes only count when
+  the server sends ``Timing-Allow-Origin``).
+
+The runner stores the records in ``tmp/perf_metrics.json`` (see
+``results.write_metrics``). Set ``TESTSPRITE_NO_VITALS=1`` to turn this off.
+"""
+
+from typing import Any
+
+from playwright.async_api import BrowserContext
+
+BINDING = "__harnessReportVitals"
+QUIET_MS = 300
+
+VITALS_SCRIPT = """
+(() => {
+  if (window.__harnessVitals) return
+  const QUIET_MS = %(quiet)d
+  const ms = (v) => (v == null ? null : Math.round(v))
+  const state = (window.__harnessVitals = { seq: 0, current: null, timer: null, lastMutation: 0 })
+
+  const flush = () => {
+    clearTimeout(state.timer)
+    state.timer = null
+    const record = state.current
+    if (!record || typeof window.%(binding)s !== 'function') return
+    if (performance.memory) record.heapMB = Math.round(performance.memory.usedJSHeapSize / 1048576)
+    record.ttiMs = ms(Math.max(record.renderMs || 0, record.domContentLoadedMs || 0, record.lastLongTaskEnd - record.start))
+    const { start, settled, lastLongTaskEnd, ...report } = record
+    window.%(binding)s(report)
+  }
+  const changed = () => { if (!state.timer) state.timer = setTimeout(flush, 250) }
+  const url = () => location.pathname + location.search
+  // A navigation is settled once the DOM has been quiet for QUIET_MS after it rendered.
+  const settle = (record, at) => {
+    if (!record.settled && record.renderMs != null && at - state.lastMutation >= QUIET_MS) record.settled = true
+    return record.settled
+  }
+
+  const begin = (kind) => {
+    if (state.current) flush()
+    const nav = kind === 'load' ? performance.getEntriesByType('navigation')[0] : null
+    state.current = {
+      id: `${performance.timeOrigin}-${state.seq++}`, kind, url: url(),
+      start: kind === 'load' ? 0 : performance.now(), settled: false,
+      ttfbMs: ms(nav && nav.responseStart), domContentLoadedMs: null, loadMs: null, renderMs: null,
+      lcpMs: null, cls: 0, longTasks: 0, longTaskMs: 0, heapMB: null,
+      ttiMs: null, requests: 0, transferKB: 0, supabaseQueries: 0, lastLongTaskEnd: 0,
+    }
+    changed()
+  }
+
+  for (const method of ['pushState', 'replaceState']) {
+    const original = history[method]
+    history[method] = function (...args) {
+      const before = url()
+      const result = original.apply(this, args)
+      if (url() !== before) begin('soft')
+      return result
+    }
+  }
+  addEventListener('popstate', () => begin('soft'))
+  addEventListener('pagehide', flush)
+  addEventListener('load', () => setTimeout(() => {
+    const nav = performance.getEntriesByType('navigation')[0]
+    if (!nav || !state.current || state.current.kind !== 'load') return
+    state.current.domContentLoadedMs = ms(nav.domContentLoadedEventEnd)
+    state.current.loadMs = ms(nav.loadEventEnd)
+    changed()
+  }))
+
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver((list) => {
+        const record = state.current
+        if (!record) return
+        for (const entry of list.getEntries()) if (entry.startTime >= record.start) onEntry(record, entry)
+        changed()
+      }).observe({ type, buffered: true })
+    } catch (e) { /* entry type not supported */ }
+  }
+  observe('largest-contentful-paint', (r, e) => { if (r.kind === 'load') r.lcpMs = ms(e.startTime) })
+  observe('layout-shift', (r, e) => { if (!e.hadRecentInput) r.cls = Math.round((r.cls + e.value) * 1e4) / 1e4 })
+  observe('longtask', (r, e) => {
+    r.longTasks += 1
+    r.longTaskMs += ms(e.duration)
+    if (!settle(r, e.startTime)) r.lastLongTaskEnd = e.startTime + e.duration
+  })
+  observe('resource', (r, e) => {
+    if (settle(r, e.startTime)) return
+    r.requests += 1
+    r.transferKB = Math.round((r.transferKB * 1024 + (e.transferSize || 0)) / 102.4) / 10
+    if (e.name.includes('/rest/v1/')) r.supabaseQueries += 1
+  })
+
+  begin('load')
+  new MutationObserver(() => {
+    const now = performance.now()
+    const record = state.current
+    if (record && !settle(record, now)) {
+      record.renderMs = ms(now - record.start)
+      changed()
+    }
+    state.lastMutation = now
+  }).observe(document, { subtree: true, childList: true, attributes: true, characterData: true })
+})()
+""" % {"binding": BINDING, "quiet": QUIET_MS}
+
+
+class Recorder:
+    """Collects the navigation records of one case, in the order they started."""
+
+    def __init__(self) -> None:
+        self._records: dict[str, dict[str, Any]] = {}
+
+    async def install(self, context: BrowserContext) -> None:
+        await context.expose_binding(BINDING, self._report)
+        await context.add_init_script(VITALS_SCRIPT)
+
+    def _report(self, source: Any, record: dict[str, Any]) -> None:
+        # Later reports of the same navigation replace earlier ones.
+        self._records[record.pop("id")] = record
+
+    @property
+    def navigations(self) -> list[dict[str, Any]]:
+        return list(self._records.values())
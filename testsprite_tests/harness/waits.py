@@ -0,0 +1,183 @@
+"""Condition-based replacements for the scripts' fixed sleeps.
+
+Generated scripts prefix every action with ``await page.wait_for_timeout(3000)``
+and pause with ``asyncio.sleep(n)``. Locator actions (``click``, ``fill``)
+already wait for the element to be attached, visible, stable and enabled, so
+those sleeps cover three things: app timers that fire within the sleep (the
+worklog autosave debounce only sends its request after 3 s), Supabase requests
+still in flight, and the UI re-rendering after them. :func:`settle` waits for
+exactly that and returns as soon as all are done; the original duration becomes
+the upper bound, so a case never waits longer than before and never fails
+because of a wait.
+
+:func:`install` is a context hook (see ``browser.AsyncApiShim``). The context
+and pages the script receives are thin proxies whose ``wait_for_timeout`` is
+:func:`settle`; :class:`AsyncioShim` does the same for ``asyncio.sleep``.
+Set ``TESTSPRITE_FIXED_WAITS=1`` to run the scripts with their original sleeps.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any
+
+from playwright import async_api
+from playwright.async_api import BrowserContext, Page, Request
+
+SUPABASE_URL = re.compile(r"\.supabase\.co/|/(rest|auth|storage)/v1/")
+
+# How long the network and the DOM must stay quiet to count as settled.
+QUIET_MS = 150
+POLL_MS = 25
+
+DOM_ACTIVITY_SCRIPT = """
+(() => {
+  const mark = () => { window.__harnessDomActivity = performance.now() }
+  mark()
+  new MutationObserver(mark).observe(document, {
+    subtree: true, childList: true, attributes: true, characterData: true,
+  })
+
+  // Pending setTimeout callbacks by id -> epoch ms they are due; setInterval is left out
+  // since a poller is always pending.
+  const timers = window.__harnessTimers = new Map()
+  const { setTimeout: set, clearTimeout: clear } = window
+  window.setTimeout = function (callback, delay, ...args) {
+    if (typeof callback !== 'function') return set.call(window, callback, delay, ...args)
+    const id = set.call(window, (...a) => { timers.delete(id); callback(...a) }, delay, ...args)
+    timers.set(id, Date.now() + (Number(delay) || 0))
+    return id
+  }
+  window.clearTimeout = function (id) {
+    timers.delete(id)
+    return clear.call(window, id)
+  }
+})()
+"""
+
+# True once no timer due before `until` (epoch ms) is still pending: everything the
+# original fixed sleep would have let fire has fired.
+TIMERS_FIRED_PREDICATE = """
+until => {
+  for (const due of (window.__harnessTimers || new Map()).values()) if (due <= until) return false
+  return true
+}
+"""
+
+DOM_QUIET_PREDICATE = """
+quiet => document.readyState !== 'loading'
+  && performance.now() - (window.__harnessDomActivity || 0) >= quiet
+"""
+
+
+class SupabaseTracker:
+    """Counts Supabase requests in flight across all pages of a context."""
+
+    def __init__(self, context: BrowserContext) -> None:
+        self.inflight = 0
+        self.last_activity = time.monotonic()
+        context.on("request", self._on_start)
+        context.on("requestfinished", self._on_end)
+        context.on("requestfailed", self._on_end)
+
+    def _on_start(self, request: Request) -> None:
+        if SUPABASE_URL.search(request.url):
+            self.inflight += 1
+            self.last_activity = time.monotonic()
+
+    def _on_end(self, request: Request) -> None:
+        if SUPABASE_URL.search(request.url):
+            self.inflight = max(0, self.inflight - 1)
+            self.last_activity = time.monotonic()
+
+    async def wait_idle(self, deadline: float) -> bool:
+        quiet = QUIET_MS / 1000
+        while True:
+            quiet_for = time.monotonic() - self.last_activity
+            if self.inflight == 0 and quiet_for >= quiet:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(remaining, max(quiet - quiet_for, POLL_MS / 1000)))
+
+
+async def wait_for_dom(page: Page, predicate: str, timeout_ms: float, arg: Any = None) -> bool:
+    """Wait until the JS ``predicate`` is truthy; ``False`` on timeout or navigation."""
+    if timeout_ms <= 0:
+        return False
+    try:
+        await page.wait_for_function(predicate, arg=arg, timeout=timeout_ms, polling=POLL_MS)
+    except async_api.Error:
+        return False
+    return True
+
+
+async def settle(page: Page, tracker: SupabaseTracker, timeout_ms: float) -> None:
+    deadline = time.monotonic() + timeout_ms / 1000
+    await wait_for_dom(page, TIMERS_FIRED_PREDICATE, timeout_ms, time.time() * 1000 + timeout_ms)
+    await tracker.wait_idle(deadline)
+    await wait_for_dom(page, DOM_QUIET_PREDICATE, (deadline - time.monotonic()) * 1000, QUIET_MS)
+
+
+class SettlingPage:
+    def __init__(self, page: Page, tracker: SupabaseTracker) -> None:
+        self._page = page
+        self._tracker = tracker
+
+    async def wait_for_timeout(self, timeout: float) -> None:
+        await settle(self._page, self._tracker, timeout)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._page, name)
+
+
+class SettlingContext:
+    def __init__(self, context: BrowserContext) -> None:
+        self._context = context
+        self._tracker = SupabaseTracker(context)
+        self._pages: dict[Page, SettlingPage] = {}
+
+    def _wrap(self, page: Page) -> SettlingPage:
+        # One proxy per page, so later hooks can key caches on it.
+        if page not in self._pages:
+            self._pages[page] = SettlingPage(page, self._tracker)
+        return self._pages[page]
+
+    @property
+    def pages(self) -> list[SettlingPage]:
+        return [self._wrap(page) for page in self._context.pages]
+
+    async def new_page(self) -> SettlingPage:
+        return self._wrap(await self._context.new_page())
+
+    async def settle(self, timeout_ms: float) -> None:
+        if self._context.pages:
+            await settle(self._context.pages[-1], self._tracker, timeout_ms)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+
+async def install(context: BrowserContext) -> SettlingContext:
+    await context.add_init_script(DOM_ACTIVITY_SCRIPT)
+    return SettlingContext(context)
+
+
+class AsyncioShim:
+    """Drop-in for ``asyncio`` inside a case: ``sleep`` settles the latest page."""
+
+    def __init__(self, shim: Any) -> None:
+        self._shim = shim
+
+    async def sleep(self, delay: float, result: Any = None) -> Any:
+        # Later hooks may wrap the SettlingContext; their proxies forward settle().
+        handles = [h for h in self._shim.handles if callable(getattr(h, "settle", None))]
+        if handles:
+            await handles[-1].settle(delay * 1000)
+        else:
+            await asyncio.sleep(delay)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(asyncio, name)